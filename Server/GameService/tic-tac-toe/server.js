@@ -1,6 +1,7 @@
 import dotenv from 'dotenv';
 import express from 'express';
 import http from 'http';
+import { timingSafeEqual } from 'crypto';
 import { Server } from 'socket.io';
 import { createClient } from 'redis';
 
@@ -8,11 +9,18 @@ dotenv.config();
 
 const app = express();
 const server = http.createServer(app);
+// GAME_SOCKETIO_PARSER=msgpack exchanges binary msgpack frames with the gateway
+// (its GAME_BACKEND_SERIALIZER must match)
+const parser = process.env.GAME_SOCKETIO_PARSER === 'msgpack'
+  ? (await import('socket.io-msgpack-parser')).default
+  : undefined;
+
 const io = new Server(server, {
   cors: {
     origin: "*",
     methods: ["GET", "POST"],
-  }
+  },
+  ...(parser && { parser })
 });
 
 // Initialize Redis clients
@@ -21,6 +29,32 @@ const subClient = createClient();
 await pubClient.connect();
 await subClient.connect();
 
+// Gateway relay sockets authenticate with this shared secret (the gateway's
+// GAME_RELAY_SECRET); unset, too short or a placeholder, no socket may relay players
+const RELAY_SECRET_MIN_LENGTH = 16;
+let RELAY_SECRET = process.env.RELAY_SECRET || '';
+if (RELAY_SECRET.length < RELAY_SECRET_MIN_LENGTH || RELAY_SECRET.toLowerCase().startsWith('change-me')) {
+  if (RELAY_SECRET) console.warn('⚠️ RELAY_SECRET is too short or a placeholder: ignored');
+  console.warn('⚠️ RELAY_SECRET is not set: gateway relay sockets will be refused');
+  RELAY_SECRET = '';
+}
+
+function isRelaySecret(secret) {
+  if (!RELAY_SECRET || typeof secret !== 'string') return false;
+  const given = Buffer.from(secret);
+  const expected = Buffer.from(RELAY_SECRET);
+  return given.length === expected.length && timingSafeEqual(given, expected);
+}
+
+// Sockets offering a relay secret must present the right one
+io.use((socket, next) => {
+  const secret = socket.handshake.auth?.relay_secret;
+  if (secret === undefined) return next();
+  if (!isRelaySecret(secret)) return next(new Error('invalid relay secret'));
+  socket.data.relay = true;
+  next();
+});
+
 // Store all active games: { matchCode: gameData }
 const games = new Map();
 
@@ -40,63 +74,93 @@ function createGame(matchCode) {
   };
 }
 
+// Players currently in each match: { matchCode: Map<playerId, player> }
+const matchMembers = new Map();
+
+// A player is either a browser socket connected directly, or a gateway client
+// multiplexed over a shared gateway socket ('relay' envelopes tagged with clientSid).
+// Relayed player ids are scoped to their relay socket ('<socket id>:<clientSid>'),
+// so they can never equal a direct socket id or another relay's player.
+function directPlayer(socket) {
+  return {
+    id: socket.id,
+    emit: (event, data) => socket.emit(event, data),
+  };
+}
+
+function relayedPlayer(socket, clientSid) {
+  return {
+    id: `${socket.id}:${clientSid}`,
+    emit: (event, data) => socket.emit('relay', { clientSid, event, args: [data] }),
+  };
+}
+
+function joinMatchRoom(matchCode, player) {
+  if (!matchMembers.has(matchCode)) matchMembers.set(matchCode, new Map());
+  matchMembers.get(matchCode).set(player.id, player);
+}
+
+function emitToMatch(matchCode, event, data) {
+  const members = matchMembers.get(matchCode);
+  if (!members) return;
+  for (const player of members.values()) player.emit(event, data);
+}
+
 // Subscribe to Redis for cross-server game updates
 await subClient.subscribe('game-updates', (message) => {
   const { matchCode, gameState } = JSON.parse(message);
   games.set(matchCode, gameState);
-  io.to(matchCode).emit('gameState', gameState);
+  emitToMatch(matchCode, 'gameState', gameState);
 });
 
-io.on('connection', (socket) => {
-  console.log('Client connected:', socket.id);
-
+const gameHandlers = {
   // Create a new match
-  socket.on('createMatch', () => {
+  createMatch(player) {
     const matchCode = generateMatchCode();
     const game = createGame(matchCode);
-    game.players.X = socket.id;
+    game.players.X = player.id;
     games.set(matchCode, game);
-    
-    socket.join(matchCode);
-    socket.emit('matchCreated', { matchCode, role: 'X' });
-    socket.emit('gameState', game);
-  });
+
+    joinMatchRoom(matchCode, player);
+    player.emit('matchCreated', { matchCode, role: 'X' });
+    player.emit('gameState', game);
+  },
 
   // Join an existing match
-  socket.on('joinMatch', (matchCode) => {
+  joinMatch(player, matchCode) {
     const game = games.get(matchCode);
-    
+
     if (!game) {
-      socket.emit('error', 'Match not found');
+      player.emit('error', 'Match not found');
       return;
     }
 
-    socket.join(matchCode);
+    joinMatchRoom(matchCode, player);
     let role = 'spectator';
 
     // Assign player roles
     if (!game.players.X) {
-      game.players.X = socket.id;
+      game.players.X = player.id;
       role = 'X';
     } else if (!game.players.O) {
-      game.players.O = socket.id;
+      game.players.O = player.id;
       role = 'O';
     } else {
-      game.spectators.push(socket.id);
+      game.spectators.push(player.id);
     }
 
-    socket.emit('matchJoined', { matchCode, role });
-    io.to(matchCode).emit('gameState', game);
-  });
+    player.emit('matchJoined', { matchCode, role });
+    emitToMatch(matchCode, 'gameState', game);
+  },
 
   // Handle player moves
-  socket.on('makeMove', ({ matchCode, index }) => {
+  makeMove(player, { matchCode, index }) {
     const game = games.get(matchCode);
     if (!game) return;
 
     // Check if it's this player's turn
     const currentPlayer = game.xIsNext ? 'X' : 'O';
-    if (game.players[currentPlayer] !== socket.id) return;
+    if (game.players[currentPlayer] !== player.id) return;
 
     // Check if move is valid
     if (game.board[index] || game.winner) return;
@@ -108,35 +172,82 @@ io.on('connection', (socket) => {
 
     // Publish to Redis and emit to all clients in the room
     pubClient.publish('game-updates', JSON.stringify({ matchCode, gameState: game }));
-    io.to(matchCode).emit('gameState', game);
-  });
+    emitToMatch(matchCode, 'gameState', game);
+  },
 
   // Restart game
-  socket.on('restartGame', (matchCode) => {
+  restartGame(player, matchCode) {
     const game = games.get(matchCode);
     if (!game) return;
 
     // Only players can restart
-    if (game.players.X !== socket.id && game.players.O !== socket.id) return;
+    if (game.players.X !== player.id && game.players.O !== player.id) return;
 
     game.board = Array(9).fill(null);
     game.xIsNext = true;
     game.winner = null;
 
-    io.to(matchCode).emit('gameState', game);
+    emitToMatch(matchCode, 'gameState', game);
+  },
+
+  // Remove player from all games
+  disconnect(player) {
+    for (const [matchCode, game] of games.entries()) {
+      if (game.players.X === player.id) game.players.X = null;
+      if (game.players.O === player.id) game.players.O = null;
+      game.spectators = game.spectators.filter(id => id !== player.id);
+
+      const members = matchMembers.get(matchCode);
+      if (members) {
+        members.delete(player.id);
+        if (members.size === 0) matchMembers.delete(matchCode);
+      }
+
+      emitToMatch(matchCode, 'gameState', game);
+    }
+  },
+};
+
+const GAME_EVENTS = ['createMatch', 'joinMatch', 'makeMove', 'restartGame'];
+
+io.on('connection', (socket) => {
+  console.log('Client connected:', socket.id);
+
+  const player = directPlayer(socket);
+  for (const event of GAME_EVENTS) {
+    socket.on(event, (...args) => gameHandlers[event](player, ...args));
+  }
+
+  // Gateway sessions multiplexed over this socket: { clientSid: player }
+  const relayed = new Map();
+
+  socket.on('relay', ({ clientSid, event, args = [] } = {}) => {
+    // Only authenticated gateway sockets may speak for other clients
+    if (!socket.data.relay || typeof clientSid !== 'string' || !clientSid) return;
+    if (!Array.isArray(args)) return;
+
+    if (event === 'connect') {
+      if (!relayed.has(clientSid)) relayed.set(clientSid, relayedPlayer(socket, clientSid));
+      return;
+    }
+
+    const relayedClient = relayed.get(clientSid);
+    if (!relayedClient) return;
+
+    if (event === 'disconnect') {
+      gameHandlers.disconnect(relayedClient);
+      relayed.delete(clientSid);
+    } else if (GAME_EVENTS.includes(event)) {
+      gameHandlers[event](relayedClient, ...args);
+    }
   });
 
   socket.on('disconnect', () => {
     console.log('Client disconnected:', socket.id);
-    
-    // Remove player from all games
-    for (const [matchCode, game] of games.entries()) {
-      if (game.players.X === socket.id) game.players.X = null;
-      if (game.players.O === socket.id) game.players.O = null;
-      game.spectators = game.spectators.filter(id => id !== socket.id);
-      
-      io.to(matchCode).emit('gameState', game);
-    }
+
+    gameHandlers.disconnect(player);
+    for (const relayedClient of relayed.values()) gameHandlers.disconnect(relayedClient);
+    relayed.clear();
   });
 });
 
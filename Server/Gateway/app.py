@@ -1,8 +1,11 @@
-from flask import Flask, jsonify, render_template, session, send_from_directory, request, redirect
+from flask import Flask, jsonify, render_template, session, send_from_directory, request, redirect, Response, stream_with_context
 from dotenv import load_dotenv
 import os
-from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
+from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity, get_jwt
 import requests
+import httpClient
+from ttlCache import TTLCache
+from cacheBus import CacheInvalidationBus
 import json
 import secrets
 import string
@@ -14,18 +17,25 @@ from namespace.GameNamespace import GameNamespace
 from namespace.MeetingNamespace import MeetingNamespace
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, Namespace
-import socketio
 
 load_dotenv()
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Single SocketIO instance with multiple namespaces
-socketio_app = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
-
-# Separate connection dictionaries for each namespace
-client_connections_game = {} 
-client_connections_meeting = {}
+# Single SocketIO instance with multiple namespaces. When several gateway workers run
+# (workers.py, or pods), GATEWAY_SOCKETIO_MESSAGE_QUEUE (e.g. redis://redis:6379/1) carries
+# emits to whichever worker holds the client's socket, and GATEWAY_SOCKETIO_TRANSPORTS=websocket
+# keeps every client on one connection, hence on one worker. GATEWAY_SOCKETIO_SERIALIZER=msgpack
+# switches client frames to binary msgpack; browsers then need socket.io-msgpack-parser.
+socketio_app = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode='threading',
+    message_queue=os.getenv('GATEWAY_SOCKETIO_MESSAGE_QUEUE') or None,
+    channel=os.getenv('GATEWAY_SOCKETIO_CHANNEL', 'gateway'),
+    transports=[t.strip() for t in os.getenv('GATEWAY_SOCKETIO_TRANSPORTS', 'polling,websocket').split(',') if t.strip()],
+    serializer=os.getenv('GATEWAY_SOCKETIO_SERIALIZER', 'default')
+)
 
 # Server configurations
 AUTH_server = os.getenv('AUTH_SERVER')
@@ -34,16 +44,39 @@ UserServices = os.getenv('UserServices_server')
 Game_server = os.getenv('Game_server')
 Meet_server = os.getenv('Meet_server')
 
-app.secret_key = 'your-super-secret-jwt-token-with-at-least-32-characters-long'
+# Must match JWT_SECRET_KEY of the auth service, which signs the tokens
+app.secret_key = os.getenv('JWT_SECRET_KEY', 'your-super-secret-jwt-token-with-at-least-32-characters-long')
 
 jwt = JWTManager(app)
 
+# Responses of GET /meetings* keyed on route, query params and caller. Entries are
+# tagged 'meetings' (lists) or 'meeting:<id>' and dropped by the gateway's own writes.
+meetings_cache = TTLCache(
+    maxsize=os.getenv('GATEWAY_MEETINGS_CACHE_SIZE', 1024),
+    ttl_seconds=os.getenv('GATEWAY_MEETINGS_CACHE_TTL', 10),
+    name='gateway_meetings'
+)
+# With several workers, invalidations reach every worker's meetings_cache through Redis
+meetings_cache_bus = CacheInvalidationBus(meetings_cache)
+
+# JWT identity (user id) -> email. The mapping never changes for a user id, so entries live
+# as long as an access token; ids the auth service doesn't know are remembered briefly.
+_token_lifetime = app.config['JWT_ACCESS_TOKEN_EXPIRES']
+identity_cache = TTLCache(
+    maxsize=os.getenv('GATEWAY_IDENTITY_CACHE_SIZE', 10000),
+    ttl_seconds=os.getenv('GATEWAY_IDENTITY_CACHE_TTL', _token_lifetime.total_seconds() if _token_lifetime else 3600),
+    name='gateway_identity'
+)
+IDENTITY_NEGATIVE_TTL = float(os.getenv('GATEWAY_IDENTITY_NEGATIVE_TTL', 30))
+UNKNOWN_IDENTITY = ''
+
 # =================== HELPER FUNCTIONS ===================
 
 def get_user_email_from_jwt_identity(user_id):
     """
     Get user email from auth service using the JWT identity (user ID).
     This function is used whenever we need to resolve the user email from the JWT token.
+    Results are kept in identity_cache, so only the first request of a user goes to the auth service.
     
     Args:
         user_id: The user ID extracted from JWT token using get_jwt_identity()
@@ -51,14 +84,26 @@ def get_user_email_from_jwt_identity(user_id):
     Returns:
         str: User email if found, None otherwise
     """
+    cached = identity_cache.get(user_id)
+    if cached is not None:
+        return cached or None
+
     try:
-        response = requests.get(
+        response = httpClient.get(
             f'http://{AUTH_server}/user/{user_id}/email',
             timeout=10
         )
         if response.status_code == 200:
             data = response.json()
-            return data.get("email")
+            email = data.get("email")
+            if email:
+                identity_cache.set(user_id, email)
+            return email
+        elif response.status_code == 404:
+            # Unknown id: don't ask again on every request
+            identity_cache.set(user_id, UNKNOWN_IDENTITY, ttl_seconds=IDENTITY_NEGATIVE_TTL)
+            print(f"Failed to get user email: {response.status_code}")
+            return None
         else:
             print(f"Failed to get user email: {response.status_code}")
             return None
@@ -69,106 +114,84 @@ def get_user_email_from_jwt_identity(user_id):
         print(f"Unexpected error getting user email: {e}")
         return None
 
-def create_GameServer_connection(client_sid, namespace_instance):
-    """Create a dedicated backend connection for a game client"""
-    backend = socketio.Client(logger=False, engineio_logger=False)
-    
-    @backend.on('matchCreated')
-    def on_match_created(data):
-        print(f"Backend -> Client {client_sid}: matchCreated {data}")
-        socketio_app.emit('matchCreated', data, to=client_sid, namespace='/game')
-    
-    @backend.on('matchJoined')
-    def on_match_joined(data):
-        print(f"Backend -> Client {client_sid}: matchJoined {data}")
-        socketio_app.emit('matchJoined', data, to=client_sid, namespace='/game')
-    
-    @backend.on('gameState')
-    def on_game_state(data):
-        print(f"Backend -> Client {client_sid}: gameState")
-        socketio_app.emit('gameState', data, to=client_sid, namespace='/game')
-    
-    @backend.on('error')
-    def on_error(data):
-        print(f"Backend -> Client {client_sid}: error {data}")
-        socketio_app.emit('error', data, to=client_sid, namespace='/game')
-    
+def meetings_cache_key():
+    """Cache key of the current GET /meetings* request: route, query params and JWT identity"""
+    return (request.path, tuple(sorted(request.args.items(multi=True))), get_jwt_identity())
+
+
+def cached_meetings_get(url, tags, params=None):
+    """
+    Serve a GET /meetings* request from meetings_cache, forwarding to the meeting service on a miss.
+
+    Args:
+        url: Meeting service URL to forward to
+        tags: Cache tags of the response, used for invalidation
+        params: Query params for the forward
+
+    Returns:
+        Flask response tuple
+    """
+    key = meetings_cache_key()
+    cached = meetings_cache.get(key)
+    if cached is not None:
+        return jsonify(cached), 200, {'X-Cache': 'HIT'}
+
+    response = httpClient.get(url, params=params, verify=False)
+    data = response.json()
+    if response.status_code == 200:
+        meetings_cache.set(key, data, tags=tags)
+    return jsonify(data), response.status_code, {'X-Cache': 'MISS'}
+
+
+def invalidate_meetings_cache(meeting_id=None):
+    """Drop cached meeting lists, and everything cached for meeting_id if given"""
+    tags = ['meetings']
+    if meeting_id:
+        tags.append(f'meeting:{meeting_id}')
+    meetings_cache_bus.invalidate(*tags)
+
+
+# Headers of a meeting log download passed on to the client
+LOG_DOWNLOAD_HEADERS = ('Content-Type', 'Content-Length', 'Content-Disposition', 'Last-Modified', 'ETag')
+
+
+def relay_body(response):
+    """Yield a streamed upstream body chunk by chunk and close it afterwards"""
     try:
-        backend.connect(Game_server)
-        print(f"✅ Created backend connection for game client {client_sid}")
-        return backend
-    except Exception as e:
-        print(f"❌ Failed to connect to game backend for client {client_sid}: {e}")
-        return None
+        for chunk in response.iter_content(httpClient.STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        response.close()
 
+# Issuer of the tokens minted by authService, which carry 'email' and 'role' claims
+TOKEN_ISSUER = 'authService'
 
-def create_MeetServer_connection(client_sid, namespace_instance, user_email=None):
-    """Create a dedicated backend connection for a meeting client"""
-    connection_url = Meet_server
-    if user_email:
-        connection_url = f"{Meet_server}?user_email={user_email}"
-    
-    backend = socketio.Client(
-        logger=False, 
-        engineio_logger=False,
-        ssl_verify=False,
-        # Fix: Remove invalid parameters and use correct ones
-        reconnection=True,
-        reconnection_attempts=5,
-        reconnection_delay=1,
-        reconnection_delay_max=5,
-        # Remove these invalid parameters:
-        # ping_timeout=60000,
-        # ping_interval=25000
-    )
-    
-    @backend.on('room-joined')
-    def on_room_joined(data):
-        print(f"Backend -> Client {client_sid}: room-joined")
-        socketio_app.emit('room-joined', data, to=client_sid, namespace='/meeting')
-    
-    @backend.on('new-peer')
-    def on_new_peer(data):
-        print(f"Backend -> Client {client_sid}: new-peer {data.get('peerId')}")
-        socketio_app.emit('new-peer', data, to=client_sid, namespace='/meeting')
-    
-    @backend.on('peer-disconnected')
-    def on_peer_disconnected(data):
-        print(f"Backend -> Client {client_sid}: peer-disconnected {data.get('peerId')}")
-        socketio_app.emit('peer-disconnected', data, to=client_sid, namespace='/meeting')
-    
-    @backend.on('offer')
-    def on_offer(data):
-        print(f"Backend -> Client {client_sid}: offer from {data.get('peerId')}")
-        socketio_app.emit('offer', data, to=client_sid, namespace='/meeting')
-    
-    @backend.on('answer')
-    def on_answer(data):
-        print(f"Backend -> Client {client_sid}: answer from {data.get('peerId')}")
-        socketio_app.emit('answer', data, to=client_sid, namespace='/meeting')
-    
-    @backend.on('ice-candidate')
-    def on_ice_candidate(data):
-        print(f"Backend -> Client {client_sid}: ice-candidate from {data.get('peerId')}")
-        socketio_app.emit('ice-candidate', data, to=client_sid, namespace='/meeting')
-    
-    @backend.on('error')
-    def on_error(data):
-        print(f"Backend -> Client {client_sid}: error {data}")
-        socketio_app.emit('error', data, to=client_sid, namespace='/meeting')
+
+def get_current_user_email():
+    """
+    Email of the caller of a @jwt_required route.
+    Read from the token's 'email' claim; tokens without one fall back to an identity lookup.
     
-    @backend.on('room-full')
-    def on_room_full(data):
-        print(f"Backend -> Client {client_sid}: room-full")
-        socketio_app.emit('room-full', data, to=client_sid, namespace='/meeting')
+    Returns:
+        str: User email if known, None otherwise
+    """
+    email = get_jwt().get('email')
+    if email:
+        return email
+    return get_user_email_from_jwt_identity(get_jwt_identity())
+
+
+def get_current_user_role():
+    """
+    Role of the caller of a @jwt_required route, from an authService-issued token.
     
-    try:
-        backend.connect(connection_url)
-        print(f"✅ Created backend connection for meeting client {client_sid}")
-        return backend
-    except Exception as e:
-        print(f"❌ Failed to connect to meeting backend for client {client_sid}: {e}")
+    Returns:
+        str: User role, or None if the token doesn't carry one
+    """
+    claims = get_jwt()
+    if claims.get('iss') != TOKEN_ISSUER:
         return None
+    return claims.get('role')
 
 # Register namespaces
 socketio_app.on_namespace(GameNamespace('/game', socketio_app, Game_server))
@@ -204,7 +227,7 @@ def health():
         
         for service_name, service_url in downstream_services.items():
             try:
-                response = requests.get(f"{service_url}/health", timeout=2)
+                response = httpClient.get(f"{service_url}/health", timeout=2)
                 services_status[service_name] = {
                     'status': 'healthy' if response.status_code == 200 else 'unhealthy',
                     'response_time': response.elapsed.total_seconds()
@@ -240,9 +263,36 @@ def live():
 @app.route('/metrics', methods=['GET'])
 def metrics():
     """Prometheus metrics endpoint"""
-    return """# HELP gateway_requests_total Total requests
+    cache_stats = meetings_cache.stats()
+    bus_stats = meetings_cache_bus.stats()
+    identity_stats = identity_cache.stats()
+    return f"""# HELP gateway_requests_total Total requests
 # TYPE gateway_requests_total counter
 gateway_requests_total 0
+# HELP gateway_meetings_cache_hits_total GET /meetings* responses served from cache
+# TYPE gateway_meetings_cache_hits_total counter
+gateway_meetings_cache_hits_total {cache_stats['hits']}
+# HELP gateway_meetings_cache_misses_total GET /meetings* responses forwarded to the meeting service
+# TYPE gateway_meetings_cache_misses_total counter
+gateway_meetings_cache_misses_total {cache_stats['misses']}
+# HELP gateway_meetings_cache_evictions_total Cached responses evicted by the size bound
+# TYPE gateway_meetings_cache_evictions_total counter
+gateway_meetings_cache_evictions_total {cache_stats['evictions']}
+# HELP gateway_meetings_cache_entries Cached GET /meetings* responses
+# TYPE gateway_meetings_cache_entries gauge
+gateway_meetings_cache_entries {cache_stats['size']}
+# HELP gateway_meetings_cache_invalidations_published_total Invalidations sent to the other workers
+# TYPE gateway_meetings_cache_invalidations_published_total counter
+gateway_meetings_cache_invalidations_published_total {bus_stats['published']}
+# HELP gateway_meetings_cache_invalidations_received_total Invalidations applied from the other workers
+# TYPE gateway_meetings_cache_invalidations_received_total counter
+gateway_meetings_cache_invalidations_received_total {bus_stats['received']}
+# HELP gateway_identity_cache_hits_total JWT identities resolved without calling the auth service
+# TYPE gateway_identity_cache_hits_total counter
+gateway_identity_cache_hits_total {identity_stats['hits']}
+# HELP gateway_identity_cache_misses_total JWT identities resolved through the auth service
+# TYPE gateway_identity_cache_misses_total counter
+gateway_identity_cache_misses_total {identity_stats['misses']}
 """, 200, {'Content-Type': 'text/plain'}
 
 
@@ -257,7 +307,18 @@ def login():
     if (email is None) or (password is None):
         return jsonify({"Text": "missing content"}), 401
     else:
-        return requests.post(f'http://{AUTH_server}/login', json=data).json(), 200
+        return httpClient.post(f'http://{AUTH_server}/login', json=data).json(), 200
+
+
+@app.route('/token/refresh', methods=['POST'])
+@jwt_required()
+def refresh_token():
+    """Trade a still valid token for a new one with a fresh expiry and the current role"""
+    response = httpClient.post(
+        f'http://{AUTH_server}/token/refresh',
+        headers={'Authorization': request.headers.get('Authorization', '')}
+    )
+    return response.json(), response.status_code
 
 
 @app.route('/signup', methods=['POST'])
@@ -275,7 +336,7 @@ def signUp():
     if not all([email, firstName, lastName, Password, DateOfBirth, address]):
         return jsonify({"Text": "Missing required fields"}), 400
     
-    response_from_auth_service = requests.post(f'http://{AUTH_server}/signup', json={
+    response_from_auth_service = httpClient.post(f'http://{AUTH_server}/signup', json={
         "email": email,
         "Password": Password,
         "FirstName": firstName,
@@ -307,12 +368,12 @@ def getCode():
     try:
         #current_user_email = get_jwt_identity()#hadi twali ta5edhha ml authservice
         
-        manager_email = get_user_email_from_jwt_identity(get_jwt_identity())
+        manager_email = get_current_user_email()
         print(manager_email)
         if not manager_email:
             return jsonify({"Text": "Manager email is required"}), 400
         print ("lhan labes")
-        response = requests.post(
+        response = httpClient.post(
             f'http://{UserServices}/getCodeForManager',
             json={
     #            "current_user_email": current_user_email,
@@ -343,7 +404,7 @@ def get_teammates():
     """
     try:
         # Get current user's email from JWT
-        current_user_email = get_user_email_from_jwt_identity(get_jwt_identity())
+        current_user_email = get_current_user_email()
         
         if not current_user_email:
             return jsonify({"success": False, "error": "Could not determine user email from token"}), 401
@@ -353,7 +414,7 @@ def get_teammates():
         include_manager = request.args.get('include_manager', 'true')
         
         # Forward request to UserServices
-        response = requests.get(
+        response = httpClient.get(
             f'http://{UserServices}/users/{current_user_email}/teammates',
             params={
                 'include_details': include_details,
@@ -381,13 +442,13 @@ def get_full_team():
     """
     try:
         # Get current user's email from JWT
-        current_user_email = get_user_email_from_jwt_identity(get_jwt_identity())
+        current_user_email = get_current_user_email()
         
         if not current_user_email:
             return jsonify({"success": False, "error": "Could not determine user email from token"}), 401
         
         # Forward request to UserServices
-        response = requests.get(
+        response = httpClient.get(
             f'http://{UserServices}/users/{current_user_email}/team',
             timeout=10
         )
@@ -409,11 +470,12 @@ def create_meet():
     try:
         print(get_jwt_identity())
         print("Forwarding create-meet request to backend")
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/create-meet",
             json=request.json,
             verify=False
         )
+        invalidate_meetings_cache()
         return jsonify(response.json()), response.status_code
     except Exception as e:
         print(f"Error forwarding create-meet: {e}")
@@ -425,13 +487,15 @@ def join_meet():
     """Forward join-meet request to backend"""
     try:
         print("Forwarding join-meet request to backend")
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/join-meet",
             json=request.json,
             verify=False
         )
         
         if response.status_code == 200:
+            # Joining adds the user to the meeting's participants
+            invalidate_meetings_cache((request.json or {}).get('meet_id'))
             data = response.json()
             if 'redirectUrl' in data:
                 original_url = data['redirectUrl']
@@ -450,7 +514,7 @@ def room(meet_id, user_email):
     """Forward room page request to backend"""
     try:
         print(f"Forwarding room request for {meet_id}/{user_email}")
-        response = requests.get(
+        response = httpClient.get(
             f"{Meet_server}/room/{meet_id}/{user_email}",
             verify=False
         )
@@ -473,26 +537,34 @@ def room(meet_id, user_email):
 @app.route('/becamemanager', methods=['POST'])
 @jwt_required()
 def becameManager():
-    user_id = get_jwt_identity()
-    userMail = get_user_email_from_jwt_identity(user_id)
+    userMail = get_current_user_email()
     
     if userMail is None:
         return jsonify({"error": "Could not resolve user identity"}), 401
     
     print("user to became manager : ", userMail)
     code = (request.get_json()).get("code")
-    response = requests.post(
+    response = httpClient.post(
         f"http://{UserServices}/becameManger",
         json={"code": code, "userMail": userMail}
     )
     print("el response : ", response.json())
-    return response.json(), response.status_code
+    result = response.json()
+    if response.status_code == 200 and isinstance(result, dict):
+        # The token still says the old role: hand out one minted with the new role
+        refreshed = httpClient.post(
+            f'http://{AUTH_server}/token/refresh',
+            headers={'Authorization': request.headers.get('Authorization', '')}
+        )
+        if refreshed.status_code == 200:
+            result['Token'] = refreshed.json().get('Token')
+    return result, response.status_code
     
 @app.route('/generateBecameManagerCode', methods=['GET'])
 def generate_became_manager_code():
     try:
         data = request.get_json()
-        response = requests.get(
+        response = httpClient.get(
             f'http://{UserServices}/generateBecameManagerCode',
             json=data,
             timeout=10
@@ -511,14 +583,15 @@ def get_user_identity():
     """
     try:
         user_id = get_jwt_identity()
-        user_email = get_user_email_from_jwt_identity(user_id)
+        user_email = get_current_user_email()
         
         if user_email is None:
             return jsonify({"error": "Could not resolve user identity"}), 404
         
         return jsonify({
             "user_id": user_id,
-            "email": user_email
+            "email": user_email,
+            "role": get_current_user_role()
         }), 200
     except Exception as e:
         print(f"Error getting user identity: {e}")
@@ -541,13 +614,12 @@ def get_all_meetings():
             params['user_email'] = user_email
         if is_active:
             params['is_active'] = is_active
+        # Paging, sort order and projection are carried through to the meeting service
+        for name in ('limit', 'cursor', 'sort', 'fields'):
+            if request.args.get(name):
+                params[name] = request.args.get(name)
         
-        response = requests.get(
-            f"{Meet_server}/meetings",
-            params=params,
-            verify=False
-        )
-        return jsonify(response.json()), response.status_code
+        return cached_meetings_get(f"{Meet_server}/meetings", ('meetings',), params=params)
     except Exception as e:
         print(f"Error forwarding get meetings: {e}")
         return jsonify({"error": "Gateway error"}), 500
@@ -558,11 +630,7 @@ def get_all_meetings():
 def get_meeting(meeting_id):
     """Forward get meeting by ID request to backend"""
     try:
-        response = requests.get(
-            f"{Meet_server}/meetings/{meeting_id}",
-            verify=False
-        )
-        return jsonify(response.json()), response.status_code
+        return cached_meetings_get(f"{Meet_server}/meetings/{meeting_id}", (f'meeting:{meeting_id}',))
     except Exception as e:
         print(f"Error forwarding get meeting: {e}")
         return jsonify({"error": "Gateway error"}), 500
@@ -573,11 +641,12 @@ def get_meeting(meeting_id):
 def update_meeting(meeting_id):
     """Forward update meeting request to backend"""
     try:
-        response = requests.put(
+        response = httpClient.put(
             f"{Meet_server}/meetings/{meeting_id}",
             json=request.json,
             verify=False
         )
+        invalidate_meetings_cache(meeting_id)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         print(f"Error forwarding update meeting: {e}")
@@ -589,10 +658,11 @@ def update_meeting(meeting_id):
 def delete_meeting(meeting_id):
     """Forward delete meeting request to backend"""
     try:
-        response = requests.delete(
+        response = httpClient.delete(
             f"{Meet_server}/meetings/{meeting_id}",
             verify=False
         )
+        invalidate_meetings_cache(meeting_id)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         print(f"Error forwarding delete meeting: {e}")
@@ -604,10 +674,11 @@ def delete_meeting(meeting_id):
 def start_meeting(meeting_id):
     """Forward start meeting request to backend"""
     try:
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/meetings/{meeting_id}/start",
             verify=False
         )
+        invalidate_meetings_cache(meeting_id)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         print(f"Error forwarding start meeting: {e}")
@@ -619,10 +690,11 @@ def start_meeting(meeting_id):
 def end_meeting(meeting_id):
     """Forward end meeting request to backend"""
     try:
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/meetings/{meeting_id}/end",
             verify=False
         )
+        invalidate_meetings_cache(meeting_id)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         print(f"Error forwarding end meeting: {e}")
@@ -634,11 +706,12 @@ def end_meeting(meeting_id):
 def add_meeting_log(meeting_id):
     """Forward add log entry request to backend"""
     try:
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/meetings/{meeting_id}/log",
             json=request.json,
             verify=False
         )
+        invalidate_meetings_cache(meeting_id)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         print(f"Error forwarding add log entry: {e}")
@@ -648,24 +721,38 @@ def add_meeting_log(meeting_id):
 @app.route('/meetings/<meeting_id>/log', methods=['GET'])
 @jwt_required()
 def get_meeting_log(meeting_id):
-    """Forward get meeting log request to backend"""
+    """
+    Forward get meeting log request to backend
+    - offset / max_bytes: incremental read of what was written after offset (not cached)
+    - download: streams the log file through without buffering it
+    """
     try:
         download = request.args.get('download')
-        params = {}
-        if download:
-            params['download'] = download
+        if not download:
+            if 'offset' not in request.args:
+                return cached_meetings_get(f"{Meet_server}/meetings/{meeting_id}/log", (f'meeting:{meeting_id}',))
+            
+            # Tail reads must see new entries at once, so they bypass the response cache
+            params = {name: request.args[name] for name in ('offset', 'max_bytes') if name in request.args}
+            response = httpClient.get(f"{Meet_server}/meetings/{meeting_id}/log", params=params, verify=False)
+            return jsonify(response.json()), response.status_code
         
-        response = requests.get(
+        response = httpClient.get(
             f"{Meet_server}/meetings/{meeting_id}/log",
-            params=params,
-            verify=False
+            params={'download': download},
+            verify=False,
+            stream=True
         )
         
-        if download and response.status_code == 200:
-            # Forward the file download response
-            return response.content, response.status_code, response.headers.items()
+        if response.status_code == 200:
+            # Forward the file download response chunk by chunk
+            relayed = {name: response.headers[name] for name in LOG_DOWNLOAD_HEADERS if name in response.headers}
+            return Response(stream_with_context(relay_body(response)), status=200, headers=relayed)
         else:
-            return jsonify(response.json()), response.status_code
+            try:
+                return jsonify(response.json()), response.status_code
+            finally:
+                response.close()
     except Exception as e:
         print(f"Error forwarding get meeting log: {e}")
         return jsonify({"error": "Gateway error"}), 500
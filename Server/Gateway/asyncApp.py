@@ -0,0 +1,711 @@
+"""
+Async (ASGI) gateway mode.
+
+Serves the same HTTP routes and /game, /meeting Socket.IO namespaces as app.py,
+but on asyncio: Quart for HTTP, python-socketio's AsyncServer for websockets
+and pooled httpx.AsyncClient (asyncHttpClient.py) for upstream calls, so an
+in-flight forward costs a coroutine instead of a blocked thread.
+
+Run with:
+    uvicorn asyncApp:asgi_app --host 0.0.0.0 --port 7050
+or:
+    python asyncApp.py
+"""
+import asyncio
+from functools import wraps
+from datetime import datetime
+import os
+
+import httpx
+import jwt as pyjwt
+import socketio
+from dotenv import load_dotenv
+from quart import Quart, jsonify, request, g
+
+import asyncHttpClient
+from ttlCache import TTLCache
+from cacheBus import CacheInvalidationBus
+from namespace.AsyncGameNamespace import AsyncGameNamespace
+from namespace.AsyncMeetingNamespace import AsyncMeetingNamespace
+
+load_dotenv()
+app = Quart(__name__)
+
+# Server configurations
+AUTH_server = os.getenv('AUTH_SERVER')
+SAVING_server = os.getenv('SAVING_server')
+UserServices = os.getenv('UserServices_server')
+Game_server = os.getenv('Game_server')
+Meet_server = os.getenv('Meet_server')
+
+# Must match JWT_SECRET_KEY of the auth service, which signs the tokens
+app.secret_key = os.getenv('JWT_SECRET_KEY', 'your-super-secret-jwt-token-with-at-least-32-characters-long')
+
+# Responses of GET /meetings*, as in app.py: keyed on route, query params and caller,
+# tagged 'meetings' (lists) or 'meeting:<id>' and dropped by the gateway's own writes
+meetings_cache = TTLCache(
+    maxsize=os.getenv('GATEWAY_MEETINGS_CACHE_SIZE', 1024),
+    ttl_seconds=os.getenv('GATEWAY_MEETINGS_CACHE_TTL', 10),
+    name='gateway_meetings'
+)
+meetings_cache_bus = CacheInvalidationBus(meetings_cache)
+
+# JWT identity -> email, as in app.py (default TTL: flask-jwt-extended's 15 minute access token)
+identity_cache = TTLCache(
+    maxsize=os.getenv('GATEWAY_IDENTITY_CACHE_SIZE', 10000),
+    ttl_seconds=os.getenv('GATEWAY_IDENTITY_CACHE_TTL', 900),
+    name='gateway_identity'
+)
+IDENTITY_NEGATIVE_TTL = float(os.getenv('GATEWAY_IDENTITY_NEGATIVE_TTL', 30))
+UNKNOWN_IDENTITY = ''
+
+# Single AsyncServer instance with multiple namespaces. With several workers
+# (GATEWAY_WORKERS) the Redis manager routes emits to the worker holding the socket;
+# see app.py for GATEWAY_SOCKETIO_MESSAGE_QUEUE / GATEWAY_SOCKETIO_TRANSPORTS / GATEWAY_SOCKETIO_SERIALIZER.
+_message_queue = os.getenv('GATEWAY_SOCKETIO_MESSAGE_QUEUE')
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins="*",
+    client_manager=socketio.AsyncRedisManager(
+        _message_queue, channel=os.getenv('GATEWAY_SOCKETIO_CHANNEL', 'gateway')) if _message_queue else None,
+    transports=[t.strip() for t in os.getenv('GATEWAY_SOCKETIO_TRANSPORTS', 'polling,websocket').split(',') if t.strip()],
+    serializer=os.getenv('GATEWAY_SOCKETIO_SERIALIZER', 'default')
+)
+sio.register_namespace(AsyncGameNamespace('/game', sio, Game_server))
+sio.register_namespace(AsyncMeetingNamespace('/meeting', sio, Meet_server))
+
+# Socket.IO traffic goes to sio, everything else to the Quart app
+asgi_app = socketio.ASGIApp(sio, other_asgi_app=app)
+
+
+@app.after_request
+async def add_cors_headers(response):
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Access-Control-Allow-Headers'] = 'Authorization, Content-Type'
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+    return response
+
+
+@app.after_serving
+async def close_upstream_clients():
+    await asyncHttpClient.close_all()
+    for namespace in sio.namespace_handlers.values():
+        backend = getattr(namespace, 'backend', None)
+        if backend is not None:
+            await backend.close()
+
+
+# =================== JWT ===================
+
+def jwt_required():
+    """Async equivalent of flask_jwt_extended.jwt_required (same secret, HS256)"""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            auth_header = request.headers.get('Authorization', '')
+            if not auth_header.startswith('Bearer '):
+                return jsonify({"msg": "Missing Authorization Header"}), 401
+            try:
+                g.jwt_claims = pyjwt.decode(
+                    auth_header[len('Bearer '):],
+                    app.secret_key,
+                    algorithms=['HS256'],
+                    options={"verify_aud": False}
+                )
+            except pyjwt.ExpiredSignatureError:
+                return jsonify({"msg": "Token has expired"}), 401
+            except pyjwt.InvalidTokenError as e:
+                return jsonify({"msg": str(e)}), 422
+            return await view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_jwt_identity():
+    return g.jwt_claims.get('sub')
+
+
+# Issuer of the tokens minted by authService, which carry 'email' and 'role' claims
+TOKEN_ISSUER = 'authService'
+
+
+async def get_current_user_email():
+    """Email of the caller from the token's 'email' claim, falling back to an identity lookup"""
+    email = g.jwt_claims.get('email')
+    if email:
+        return email
+    return await get_user_email_from_jwt_identity(get_jwt_identity())
+
+
+def get_current_user_role():
+    """Role of the caller from an authService-issued token, None otherwise"""
+    if g.jwt_claims.get('iss') != TOKEN_ISSUER:
+        return None
+    return g.jwt_claims.get('role')
+
+
+# =================== HELPER FUNCTIONS ===================
+
+async def get_user_email_from_jwt_identity(user_id):
+    """
+    Get user email from auth service using the JWT identity (user ID).
+
+    Returns:
+        str: User email if found, None otherwise
+    """
+    cached = identity_cache.get(user_id)
+    if cached is not None:
+        return cached or None
+
+    try:
+        response = await asyncHttpClient.get(f'http://{AUTH_server}/user/{user_id}/email')
+        if response.status_code == 200:
+            email = response.json().get("email")
+            if email:
+                identity_cache.set(user_id, email)
+            return email
+        if response.status_code == 404:
+            identity_cache.set(user_id, UNKNOWN_IDENTITY, ttl_seconds=IDENTITY_NEGATIVE_TTL)
+        print(f"Failed to get user email: {response.status_code}")
+        return None
+    except httpx.HTTPError as e:
+        print(f"Error getting user email from auth service: {e}")
+        return None
+    except Exception as e:
+        print(f"Unexpected error getting user email: {e}")
+        return None
+
+
+# =================== HTTP ENDPOINTS ===================
+
+@app.route('/health', methods=['GET'])
+async def health():
+    """Kubernetes health check endpoint"""
+    health_status = {
+        "status": "healthy",
+        "service": "gateway",
+        "mode": "async",
+        "version": "1.0.0",
+        "timestamp": datetime.utcnow().isoformat(),
+        "pod_name": os.getenv('POD_NAME', 'unknown'),
+        "pod_ip": os.getenv('POD_IP', 'unknown'),
+    }
+
+    if request.headers.get('X-Health-Check', 'general') == 'readiness':
+        downstream_services = {
+            'auth-service': AUTH_server,
+            'user-service': UserServices,
+            'saving-service': SAVING_server
+        }
+
+        services_status = {}
+        all_healthy = True
+
+        for service_name, service_url in downstream_services.items():
+            try:
+                response = await asyncHttpClient.get(f"{service_url}/health", timeout=2)
+                services_status[service_name] = {
+                    'status': 'healthy' if response.status_code == 200 else 'unhealthy',
+                    'response_time': response.elapsed.total_seconds()
+                }
+            except Exception as e:
+                services_status[service_name] = {
+                    'status': 'unreachable',
+                    'error': str(e)
+                }
+                all_healthy = False
+
+        health_status['downstream_services'] = services_status
+        health_status['status'] = 'healthy' if all_healthy else 'degraded'
+
+        if not all_healthy:
+            return jsonify(health_status), 503
+
+    return jsonify(health_status), 200
+
+
+@app.route('/ready', methods=['GET'])
+async def ready():
+    """Simple readiness check"""
+    return jsonify({"status": "ready"}), 200
+
+
+@app.route('/live', methods=['GET'])
+async def live():
+    """Simple liveness check"""
+    return jsonify({"status": "alive"}), 200
+
+
+@app.route('/metrics', methods=['GET'])
+async def metrics():
+    """Prometheus metrics endpoint"""
+    cache_stats = meetings_cache.stats()
+    bus_stats = meetings_cache_bus.stats()
+    identity_stats = identity_cache.stats()
+    return f"""# HELP gateway_requests_total Total requests
+# TYPE gateway_requests_total counter
+gateway_requests_total 0
+# HELP gateway_meetings_cache_hits_total GET /meetings* responses served from cache
+# TYPE gateway_meetings_cache_hits_total counter
+gateway_meetings_cache_hits_total {cache_stats['hits']}
+# HELP gateway_meetings_cache_misses_total GET /meetings* responses forwarded to the meeting service
+# TYPE gateway_meetings_cache_misses_total counter
+gateway_meetings_cache_misses_total {cache_stats['misses']}
+# HELP gateway_meetings_cache_evictions_total Cached responses evicted by the size bound
+# TYPE gateway_meetings_cache_evictions_total counter
+gateway_meetings_cache_evictions_total {cache_stats['evictions']}
+# HELP gateway_meetings_cache_entries Cached GET /meetings* responses
+# TYPE gateway_meetings_cache_entries gauge
+gateway_meetings_cache_entries {cache_stats['size']}
+# HELP gateway_meetings_cache_invalidations_published_total Invalidations sent to the other workers
+# TYPE gateway_meetings_cache_invalidations_published_total counter
+gateway_meetings_cache_invalidations_published_total {bus_stats['published']}
+# HELP gateway_meetings_cache_invalidations_received_total Invalidations applied from the other workers
+# TYPE gateway_meetings_cache_invalidations_received_total counter
+gateway_meetings_cache_invalidations_received_total {bus_stats['received']}
+# HELP gateway_identity_cache_hits_total JWT identities resolved without calling the auth service
+# TYPE gateway_identity_cache_hits_total counter
+gateway_identity_cache_hits_total {identity_stats['hits']}
+# HELP gateway_identity_cache_misses_total JWT identities resolved through the auth service
+# TYPE gateway_identity_cache_misses_total counter
+gateway_identity_cache_misses_total {identity_stats['misses']}
+""", 200, {'Content-Type': 'text/plain'}
+
+
+# Authentication endpoints
+@app.route('/login', methods=['POST'])
+async def login():
+    data = await request.get_json()
+    email = data.get('email')
+    password = data.get('password')
+
+    if (email is None) or (password is None):
+        return jsonify({"Text": "missing content"}), 401
+
+    response = await asyncHttpClient.post(f'http://{AUTH_server}/login', json=data)
+    return response.json(), 200
+
+
+@app.route('/token/refresh', methods=['POST'])
+@jwt_required()
+async def refresh_token():
+    """Trade a still valid token for a new one with a fresh expiry and the current role"""
+    response = await asyncHttpClient.post(
+        f'http://{AUTH_server}/token/refresh',
+        headers={'Authorization': request.headers.get('Authorization', '')}
+    )
+    return response.json(), response.status_code
+
+
+@app.route('/signup', methods=['POST'])
+async def signUp():
+    data = await request.get_json()
+
+    email = data.get('email')
+    firstName = data.get('FirstName')
+    lastName = data.get('LastName')
+    Password = data.get('Password')
+    DateOfBirth = data.get('DateOfBirth')
+    address = data.get('Address')
+    ManagerCode = data.get('managercode')
+
+    if not all([email, firstName, lastName, Password, DateOfBirth, address]):
+        return jsonify({"Text": "Missing required fields"}), 400
+
+    response_from_auth_service = await asyncHttpClient.post(f'http://{AUTH_server}/signup', json={
+        "email": email,
+        "Password": Password,
+        "FirstName": firstName,
+        "LastName": lastName,
+        "DateOfBirth": DateOfBirth,
+        "Address": address,
+        "managercode": ManagerCode
+    })
+
+    if response_from_auth_service.status_code == 200:
+        auth_data = response_from_auth_service.json()
+        return jsonify({
+            "AuthToken": auth_data.get("Token"),
+            "id": auth_data.get("id"),
+            "firstname": firstName,
+            "lastname": lastName,
+            "role": "employee"
+        }), 200
+    return jsonify({"error": "we get an error from auth service"}), 500
+
+
+@app.route('/getCodeForManager', methods=['GET'])
+@jwt_required()
+async def getCode():
+    """Gateway endpoint - forwards request to UserServices"""
+    try:
+        manager_email = await get_current_user_email()
+        if not manager_email:
+            return jsonify({"Text": "Manager email is required"}), 400
+
+        response = await asyncHttpClient.post(
+            f'http://{UserServices}/getCodeForManager',
+            json={"manager_email": manager_email}
+        )
+        return response.json(), response.status_code
+
+    except httpx.HTTPError as e:
+        return jsonify({"Text": f"Service communication error: {str(e)}"}), 503
+    except Exception as e:
+        return jsonify({"Text": f"Internal error: {str(e)}"}), 500
+
+
+# Teammates endpoints
+@app.route('/teammates', methods=['GET'])
+@jwt_required()
+async def get_teammates():
+    """Gateway endpoint - Get teammates for the currently logged-in user."""
+    try:
+        current_user_email = await get_current_user_email()
+
+        if not current_user_email:
+            return jsonify({"success": False, "error": "Could not determine user email from token"}), 401
+
+        response = await asyncHttpClient.get(
+            f'http://{UserServices}/users/{current_user_email}/teammates',
+            params={
+                'include_details': request.args.get('include_details', 'true'),
+                'include_manager': request.args.get('include_manager', 'true')
+            }
+        )
+        return jsonify(response.json()), response.status_code
+
+    except httpx.HTTPError as e:
+        return jsonify({"success": False, "error": f"Service communication error: {str(e)}"}), 503
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Internal error: {str(e)}"}), 500
+
+
+@app.route('/team', methods=['GET'])
+@jwt_required()
+async def get_full_team():
+    """Gateway endpoint - Get full team information for the currently logged-in user."""
+    try:
+        current_user_email = await get_current_user_email()
+
+        if not current_user_email:
+            return jsonify({"success": False, "error": "Could not determine user email from token"}), 401
+
+        response = await asyncHttpClient.get(f'http://{UserServices}/users/{current_user_email}/team')
+        return jsonify(response.json()), response.status_code
+
+    except httpx.HTTPError as e:
+        return jsonify({"success": False, "error": f"Service communication error: {str(e)}"}), 503
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Internal error: {str(e)}"}), 500
+
+
+# Meeting endpoints
+@app.route('/create-meet', methods=['POST'])
+@jwt_required()
+async def create_meet():
+    """Forward create-meet request to backend"""
+    try:
+        response = await asyncHttpClient.post(
+            f"{Meet_server}/create-meet",
+            json=await request.get_json(),
+            verify=False
+        )
+        await invalidate_meetings_cache()
+        return jsonify(response.json()), response.status_code
+    except Exception as e:
+        print(f"Error forwarding create-meet: {e}")
+        return jsonify({"error": "Gateway error"}), 500
+
+
+@app.route('/join-meet', methods=['POST'])
+async def join_meet():
+    """Forward join-meet request to backend"""
+    try:
+        payload = await request.get_json()
+        response = await asyncHttpClient.post(
+            f"{Meet_server}/join-meet",
+            json=payload,
+            verify=False
+        )
+
+        data = response.json()
+        if response.status_code == 200:
+            # Joining adds the user to the meeting's participants
+            await invalidate_meetings_cache((payload or {}).get('meet_id'))
+        if response.status_code == 200 and 'redirectUrl' in data:
+            original_url = data['redirectUrl']
+            path = original_url.split('/', 3)[-1] if '/' in original_url else ''
+            data['redirectUrl'] = f"https://localhost:7050/{path}"
+        return jsonify(data), response.status_code
+    except Exception as e:
+        print(f"Error forwarding join-meet: {e}")
+        return jsonify({"error": "Gateway error"}), 500
+
+
+@app.route('/room/<meet_id>/<user_email>')
+async def room(meet_id, user_email):
+    """Forward room page request to backend"""
+    try:
+        response = await asyncHttpClient.get(
+            f"{Meet_server}/room/{meet_id}/{user_email}",
+            verify=False
+        )
+
+        if response.status_code == 200:
+            html_content = response.text.replace(
+                'server="https://{Meet_server}:7053"',
+                'server="https://localhost:7050"'
+            )
+            return html_content, 200
+        return response.text, response.status_code
+
+    except Exception as e:
+        print(f"Error forwarding room request: {e}")
+        return "Gateway error", 500
+
+
+# user service
+@app.route('/becamemanager', methods=['POST'])
+@jwt_required()
+async def becameManager():
+    userMail = await get_current_user_email()
+
+    if userMail is None:
+        return jsonify({"error": "Could not resolve user identity"}), 401
+
+    code = (await request.get_json()).get("code")
+    response = await asyncHttpClient.post(
+        f"http://{UserServices}/becameManger",
+        json={"code": code, "userMail": userMail}
+    )
+    result = response.json()
+    if response.status_code == 200 and isinstance(result, dict):
+        # The token still says the old role: hand out one minted with the new role
+        refreshed = await asyncHttpClient.post(
+            f'http://{AUTH_server}/token/refresh',
+            headers={'Authorization': request.headers.get('Authorization', '')}
+        )
+        if refreshed.status_code == 200:
+            result['Token'] = refreshed.json().get('Token')
+    return result, response.status_code
+
+
+@app.route('/generateBecameManagerCode', methods=['GET'])
+async def generate_became_manager_code():
+    try:
+        data = await request.get_json()
+        response = await asyncHttpClient.request(
+            'GET',
+            f'http://{UserServices}/generateBecameManagerCode',
+            json=data
+        )
+        return response.json(), response.status_code
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/user/identity', methods=['GET'])
+@jwt_required()
+async def get_user_identity():
+    """Get the current user's identity (email) from JWT token."""
+    try:
+        user_id = get_jwt_identity()
+        user_email = await get_current_user_email()
+
+        if user_email is None:
+            return jsonify({"error": "Could not resolve user identity"}), 404
+
+        return jsonify({
+            "user_id": user_id,
+            "email": user_email,
+            "role": get_current_user_role()
+        }), 200
+    except Exception as e:
+        print(f"Error getting user identity: {e}")
+        return jsonify({"error": "Error retrieving user identity"}), 500
+
+
+# =================== MEETING CRUD ENDPOINTS ===================
+
+async def forward_to_meet_server(method, path, **kwargs):
+    """Forward a meeting CRUD call and relay the JSON response"""
+    try:
+        response = await asyncHttpClient.request(method, f"{Meet_server}{path}", verify=False, **kwargs)
+        return jsonify(response.json()), response.status_code
+    except Exception as e:
+        print(f"Error forwarding {method} {path}: {e}")
+        return jsonify({"error": "Gateway error"}), 500
+
+
+def meetings_cache_key():
+    """Cache key of the current GET /meetings* request: route, query params and JWT identity"""
+    return (request.path, tuple(sorted(request.args.items(multi=True))), get_jwt_identity())
+
+
+async def cached_meetings_get(path, tags, params=None):
+    """
+    Serve a GET /meetings* request from meetings_cache, forwarding to the meeting service on a miss.
+
+    Args:
+        path: Meeting service path to forward to
+        tags: Cache tags of the response, used for invalidation
+        params: Query params for the forward
+
+    Returns:
+        Quart response tuple
+    """
+    key = meetings_cache_key()
+    cached = meetings_cache.get(key)
+    if cached is not None:
+        return jsonify(cached), 200, {'X-Cache': 'HIT'}
+
+    try:
+        response = await asyncHttpClient.get(f"{Meet_server}{path}", params=params, verify=False)
+        data = response.json()
+    except Exception as e:
+        print(f"Error forwarding GET {path}: {e}")
+        return jsonify({"error": "Gateway error"}), 500
+    if response.status_code == 200:
+        meetings_cache.set(key, data, tags=tags)
+    return jsonify(data), response.status_code, {'X-Cache': 'MISS'}
+
+
+async def invalidate_meetings_cache(meeting_id=None):
+    """Drop cached meeting lists, and everything cached for meeting_id if given"""
+    tags = ['meetings']
+    if meeting_id:
+        tags.append(f'meeting:{meeting_id}')
+    # Publishing to the other workers is a blocking Redis call
+    await asyncio.to_thread(meetings_cache_bus.invalidate, *tags)
+
+
+async def forward_meeting_write(meeting_id, method, path, **kwargs):
+    """Forward a write to a meeting and drop what the gateway cached for it"""
+    try:
+        return await forward_to_meet_server(method, path, **kwargs)
+    finally:
+        await invalidate_meetings_cache(meeting_id)
+
+
+@app.route('/meetings', methods=['GET'])
+@jwt_required()
+async def get_all_meetings():
+    """Forward get all meetings request to backend"""
+    params = {}
+    if request.args.get('user_email'):
+        params['user_email'] = request.args.get('user_email')
+    if request.args.get('is_active'):
+        params['is_active'] = request.args.get('is_active')
+    # Paging, sort order and projection are carried through to the meeting service
+    for name in ('limit', 'cursor', 'sort', 'fields'):
+        if request.args.get(name):
+            params[name] = request.args.get(name)
+    return await cached_meetings_get('/meetings', ('meetings',), params=params)
+
+
+@app.route('/meetings/<meeting_id>', methods=['GET'])
+@jwt_required()
+async def get_meeting(meeting_id):
+    """Forward get meeting by ID request to backend"""
+    return await cached_meetings_get(f'/meetings/{meeting_id}', (f'meeting:{meeting_id}',))
+
+
+@app.route('/meetings/<meeting_id>', methods=['PUT'])
+@jwt_required()
+async def update_meeting(meeting_id):
+    """Forward update meeting request to backend"""
+    return await forward_meeting_write(meeting_id, 'PUT', f'/meetings/{meeting_id}', json=await request.get_json())
+
+
+@app.route('/meetings/<meeting_id>', methods=['DELETE'])
+@jwt_required()
+async def delete_meeting(meeting_id):
+    """Forward delete meeting request to backend"""
+    return await forward_meeting_write(meeting_id, 'DELETE', f'/meetings/{meeting_id}')
+
+
+@app.route('/meetings/<meeting_id>/start', methods=['POST'])
+@jwt_required()
+async def start_meeting(meeting_id):
+    """Forward start meeting request to backend"""
+    return await forward_meeting_write(meeting_id, 'POST', f'/meetings/{meeting_id}/start')
+
+
+@app.route('/meetings/<meeting_id>/end', methods=['POST'])
+@jwt_required()
+async def end_meeting(meeting_id):
+    """Forward end meeting request to backend"""
+    return await forward_meeting_write(meeting_id, 'POST', f'/meetings/{meeting_id}/end')
+
+
+@app.route('/meetings/<meeting_id>/log', methods=['POST'])
+@jwt_required()
+async def add_meeting_log(meeting_id):
+    """Forward add log entry request to backend"""
+    return await forward_meeting_write(meeting_id, 'POST', f'/meetings/{meeting_id}/log', json=await request.get_json())
+
+
+@app.route('/meetings/<meeting_id>/log', methods=['GET'])
+@jwt_required()
+async def get_meeting_log(meeting_id):
+    """
+    Forward get meeting log request to backend
+    - offset / max_bytes: incremental read of what was written after offset (not cached)
+    - download: streams the log file through without buffering it
+    """
+    download = request.args.get('download')
+    if not download:
+        if 'offset' not in request.args:
+            return await cached_meetings_get(f'/meetings/{meeting_id}/log', (f'meeting:{meeting_id}',))
+
+        # Tail reads must see new entries at once, so they bypass the response cache
+        params = {name: request.args[name] for name in ('offset', 'max_bytes') if name in request.args}
+        return await forward_to_meet_server('GET', f'/meetings/{meeting_id}/log', params=params)
+
+    try:
+        response = await asyncHttpClient.stream(
+            'GET',
+            f"{Meet_server}/meetings/{meeting_id}/log",
+            params={'download': download},
+            verify=False
+        )
+        if response.status_code == 200:
+            async def relay():
+                try:
+                    async for chunk in response.aiter_raw():
+                        yield chunk
+                finally:
+                    await response.aclose()
+
+            headers = {k: v for k, v in response.headers.items()
+                       if k.lower() in ('content-type', 'content-length', 'content-encoding', 'content-disposition',
+                                        'last-modified', 'etag')}
+            return relay(), 200, headers
+        try:
+            await response.aread()
+            return jsonify(response.json()), response.status_code
+        finally:
+            await response.aclose()
+    except Exception as e:
+        print(f"Error forwarding get meeting log: {e}")
+        return jsonify({"error": "Gateway error"}), 500
+
+
+if __name__ == '__main__':
+    import uvicorn
+    workers = int(os.getenv('GATEWAY_WORKERS', 1))
+    if workers > 1 and not _message_queue:
+        print("⚠️ GATEWAY_SOCKETIO_MESSAGE_QUEUE is not set: emits only reach clients of the emitting worker, "
+              "and the meetings response cache is disabled")
+        # Read by the worker processes when they re-import the app
+        os.environ['GATEWAY_MEETINGS_CACHE_TTL'] = '0'
+    uvicorn.run(
+        # Worker processes re-import the app, so uvicorn needs its import path
+        'asyncApp:asgi_app' if workers > 1 else asgi_app,
+        host='0.0.0.0',
+        port=7050,
+        workers=workers,
+        ssl_certfile=os.getenv('GATEWAY_SSL_CERT'),
+        ssl_keyfile=os.getenv('GATEWAY_SSL_KEY')
+    )
@@ -0,0 +1,78 @@
+"""
+Pooled keep-alive HTTP client for the async gateway (asyncApp.py).
+
+asyncio counterpart of httpClient.py: one httpx.AsyncClient per upstream
+(scheme://host:port) so forwards reuse connections and never block the event
+loop. Pool sizes and the default timeout use the same environment variables.
+"""
+import asyncio
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from httpClient import DEFAULT_TIMEOUT, POOL_CONNECTIONS, POOL_MAXSIZE
+
+_clients: Dict[Tuple[str, bool], httpx.AsyncClient] = {}
+_clients_lock = asyncio.Lock()
+
+
+def _upstream_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+async def get_client(url: str, verify: bool = True) -> httpx.AsyncClient:
+    """Return the shared async client for the upstream serving this URL"""
+    # TLS verification is fixed per httpx client, so it is part of the key
+    key = (_upstream_key(url), verify)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    async with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                verify=verify,
+                timeout=DEFAULT_TIMEOUT,
+                limits=httpx.Limits(max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                                    max_keepalive_connections=POOL_MAXSIZE),
+            )
+            _clients[key] = client
+        return client
+
+
+async def request(method: str, url: str, verify: bool = True, **kwargs) -> httpx.Response:
+    client = await get_client(url, verify)
+    return await client.request(method, url, **kwargs)
+
+
+async def stream(method: str, url: str, verify: bool = True, **kwargs) -> httpx.Response:
+    """Send a request without reading the body; iterate response.aiter_raw() and aclose() it"""
+    client = await get_client(url, verify)
+    return await client.send(client.build_request(method, url, **kwargs), stream=True)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request('GET', url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    return await request('POST', url, **kwargs)
+
+
+async def put(url: str, **kwargs) -> httpx.Response:
+    return await request('PUT', url, **kwargs)
+
+
+async def delete(url: str, **kwargs) -> httpx.Response:
+    return await request('DELETE', url, **kwargs)
+
+
+async def close_all() -> None:
+    """Close every pooled connection (used on shutdown)"""
+    async with _clients_lock:
+        for client in _clients.values():
+            await client.aclose()
+        _clients.clear()
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+
+class CacheInvalidationBus:
+    """
+    Carries response cache invalidations to every gateway worker.
+
+    invalidate() drops the tags from the local cache right away and, when a Redis
+    URL is configured (GATEWAY_SOCKETIO_MESSAGE_QUEUE, the Redis the workers already
+    share), publishes them on channel. A listener thread applies the tags published
+    by the other workers. After losing the Redis connection the listener clears the
+    whole cache, since invalidations may have been missed meanwhile.
+    """
+
+    def __init__(self, cache, url=None, channel=None):
+        """
+        Args:
+            cache: TTLCache whose tags are invalidated
+            url: Redis URL; unset, invalidations stay local (single worker)
+            channel: Pub/sub channel (GATEWAY_CACHE_CHANNEL, default 'gateway-cache')
+        """
+        self.cache = cache
+        self.url = url if url is not None else os.getenv('GATEWAY_SOCKETIO_MESSAGE_QUEUE') or ''
+        self.channel = channel or os.getenv('GATEWAY_CACHE_CHANNEL', 'gateway-cache')
+        self.origin = uuid.uuid4().hex
+        self.published = 0
+        self.received = 0
+        self._redis = None
+
+        if self.url:
+            import redis
+
+            self._redis = redis.Redis.from_url(self.url)
+            threading.Thread(target=self._listen, name='cache-invalidation', daemon=True).start()
+
+    def invalidate(self, *tags):
+        """Drop tags from this worker's cache and from every other worker's"""
+        self.cache.invalidate_tag(*tags)
+        if self._redis is None:
+            return
+        try:
+            self._redis.publish(self.channel, json.dumps({'origin': self.origin, 'tags': list(tags)}))
+            self.published += 1
+        except Exception as e:
+            print(f"⚠️ Failed to publish cache invalidation {tags}: {e}")
+
+    def _listen(self):
+        delay = 1
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                delay = 1
+                for message in pubsub.listen():
+                    self._apply(message.get('data'))
+            except Exception as e:
+                print(f"⚠️ Cache invalidation channel lost ({e}), retrying in {delay}s")
+            # Invalidations published while disconnected are lost: start over
+            self.cache.clear()
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _apply(self, data):
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get('origin') == self.origin:
+            return
+        self.cache.invalidate_tag(*message.get('tags', []))
+        self.received += 1
+
+    def stats(self):
+        return {
+            'shared': self._redis is not None,
+            'published': self.published,
+            'received': self.received
+        }
@@ -1,10 +1,10 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
 from dotenv import load_dotenv
 import os
 import requests
-from io import BytesIO
+import httpClient
 
 load_dotenv()
 
@@ -26,6 +26,19 @@ DATA_SERVICE_URL = f"http://{DATA_SERVICE}"
 # Internal API key for service-to-service communication
 INTERNAL_API_KEY = "INTERNAL_API_KEY"
 
+# Download response headers relayed from dataService to the client
+RELAYED_FILE_HEADERS = ('Content-Type', 'Content-Length', 'Content-Range', 'Content-Disposition',
+                        'Accept-Ranges', 'ETag', 'Last-Modified')
+
+
+def relay_body(response):
+    """Yield a streamed upstream body chunk by chunk and close it afterwards"""
+    try:
+        for chunk in response.iter_content(httpClient.STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        response.close()
+
 
 @app.route('/upload', methods=['POST'])
 #@jwt_required()
@@ -45,43 +58,28 @@ def upload_file():
         
         print(f"👤 User: {user_email}")
         
-        # Check if file is in request
-        if 'file' not in request.files:
+        # The multipart body is relayed as-is instead of being parsed into request.files,
+        # so the upload streams through with constant memory whatever its size
+        if not request.mimetype.startswith('multipart/form-data'):
             print("❌ No file in request")
             return jsonify({"error": "No file provided"}), 400
         
-        file = request.files['file']
-        print(f"📄 File received: {file.filename}")
-        
-        if file.filename == '':
-            print("❌ Empty filename")
-            return jsonify({"error": "No file selected"}), 400
-        
         # Prepare headers with user email and internal API key
         headers = {
             'X-User-Email': user_email,
-            'X-Internal-Key': INTERNAL_API_KEY
+            'X-Internal-Key': INTERNAL_API_KEY,
+            'Content-Type': request.content_type
         }
+        print(f"📦 Upload size: {request.content_length if request.content_length is not None else 'chunked'} bytes")
         
-        # FIX: Read file content first, then create a new BytesIO object
-        file_content = file.read()
-        print(f"📦 File size: {len(file_content)} bytes")
-        
-        # Create a new file-like object for requests
-        file_obj = BytesIO(file_content)
-        file_obj.name = file.filename
-        
-        # Prepare file for forwarding
-        files = {
-            'file': (file.filename, file_obj, file.content_type or 'application/octet-stream')
-        }
+        body = httpClient.StreamBody(request.stream, length=request.content_length)
         
         print(f"🔄 Forwarding to: {DATA_SERVICE_URL}/upload")
         
         # Forward request to data service
-        response = requests.post(
+        response = httpClient.post(
             f"{DATA_SERVICE_URL}/upload",
-            files=files,
+            data=body,
             headers=headers,
             timeout=30
         )
@@ -123,7 +121,7 @@ def get_all_files():
     """
     Gateway endpoint to get all files
     - Requires JWT authentication
-    - Forwards to dataService
+    - Forwards to dataService with the paging / filter query parameters
     """
     try:
         print("📋 Get all files request received")
@@ -139,9 +137,10 @@ def get_all_files():
         }
         
         # Forward request to data service
-        response = requests.get(
+        response = httpClient.get(
             f"{DATA_SERVICE_URL}/getAllfiles",
             headers=headers,
+            params=request.args,
             timeout=10
         )
         
@@ -160,7 +159,8 @@ def get_file(filename):
     """
     Gateway endpoint to get a specific file
     - Requires JWT authentication
-    - Forwards to dataService
+    - Forwards to dataService (Range / If-Range included)
+    - Streams the file back without buffering it
     """
     try:
         print(f"📥 Get file request: {filename}")
@@ -172,28 +172,34 @@ def get_file(filename):
         # Prepare headers with internal API key
         headers = {
             'X-User-Email': user_email,
-            'X-Internal-Key': INTERNAL_API_KEY
+            'X-Internal-Key': INTERNAL_API_KEY,
+            'Accept-Encoding': 'identity'
         }
+        for name in ('Range', 'If-Range'):
+            if name in request.headers:
+                headers[name] = request.headers[name]
         
         # Forward request to data service
-        response = requests.get(
+        response = httpClient.get(
             f"{DATA_SERVICE_URL}/file/get/{filename}",
             headers=headers,
-            timeout=30
+            timeout=30,
+            stream=True
         )
         
-        if response.status_code == 200:
-            print(f"✅ File retrieved: {filename}")
-            # Return the file
-            return send_file(
-                BytesIO(response.content),
-                mimetype=response.headers.get('Content-Type', 'application/octet-stream'),
-                as_attachment=True,
-                download_name=filename
-            )
+        if response.status_code in (200, 206):
+            print(f"✅ File retrieved: {filename} ({response.status_code})")
+            # Relay the file as it arrives
+            relayed = {name: response.headers[name] for name in RELAYED_FILE_HEADERS if name in response.headers}
+            return Response(stream_with_context(relay_body(response)), status=response.status_code, headers=relayed)
         else:
             print(f"❌ File not found: {filename}")
-            return jsonify(response.json()), response.status_code
+            try:
+                # e.g. 416 carries the file size in Content-Range
+                relayed = {'Content-Range': response.headers['Content-Range']} if 'Content-Range' in response.headers else {}
+                return jsonify(response.json()), response.status_code, relayed
+            finally:
+                response.close()
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -2,7 +2,7 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import socketio
-import requests
+import httpClient
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -76,7 +76,7 @@ def create_meet():
     """Forward create-meet request to backend"""
     try:
         print("Forwarding create-meet request to backend")
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/create-meet",
             json=request.json,
             verify=False  # For self-signed certificates
@@ -92,7 +92,7 @@ def join_meet():
     """Forward join-meet request to backend"""
     try:
         print("Forwarding join-meet request to backend")
-        response = requests.post(
+        response = httpClient.post(
             f"{Meet_server}/join-meet",
             json=request.json,
             verify=False  # For self-signed certificates
@@ -120,7 +120,7 @@ def room(meet_id, user_email):
     """Forward room page request to backend"""
     try:
         print(f"Forwarding room request for {meet_id}/{user_email}")
-        response = requests.get(
+        response = httpClient.get(
             f"{Meet_server}/room/{meet_id}/{user_email}",
             verify=False  # For self-signed certificates
         )
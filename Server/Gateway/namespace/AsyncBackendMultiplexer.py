@@ -0,0 +1,230 @@
+import itertools
+import os
+from collections import deque
+
+import socketio
+
+
+class AsyncBackendMultiplexer:
+    """
+    asyncio version of BackendMultiplexer for the async gateway (asyncApp.py).
+
+    A small pool of socketio.AsyncClient connections carries every gateway client.
+    Client events travel upstream wrapped in the same 'relay' envelope:
+
+        {'clientSid': <gateway sid>, 'event': <name>, 'args': [...]}
+
+    and the backend's answers are routed back to that client's sid. The pseudo
+    events 'connect' and 'disconnect' open and close a session on the backend.
+    Backends only accept envelopes from sockets that connected with the relay
+    secret (auth).
+
+    Upstream connections are opened in a background task, never on the client's
+    connect path. Until its connection is up, a session buffers its events in a
+    bounded queue (BACKEND_PENDING_LIMIT) that is flushed, in order, once the
+    backend is reachable.
+
+    Everything runs on the event loop, so no locks are needed around the sessions.
+    """
+
+    RELAY_EVENT = 'relay'
+    PENDING_LIMIT = int(os.getenv('BACKEND_PENDING_LIMIT', 64))
+
+    def __init__(self, sio, namespace, server_url, pool_size=2, client_kwargs=None, name='backend',
+                 deliver=None, relay_secret=None):
+        """
+        Args:
+            deliver: Optional coroutine function (client_sid, event, args) replacing the
+                     plain emit of backend events to the client
+            relay_secret: Shared secret the backend requires from relay sockets
+        """
+        self.auth = {'relay_secret': relay_secret} if relay_secret else None
+        if not relay_secret:
+            print(f"⚠️ No relay secret for {name}: it will refuse the relay connections")
+        self.sio = sio
+        self.deliver = deliver
+        self.namespace = namespace
+        self.server_url = server_url
+        self.pool_size = max(1, int(pool_size))
+        self.client_kwargs = client_kwargs or {}
+        self.name = name
+        self._closing = False
+
+        self.sessions = {}  # client_sid -> {'slot': int, 'meta': dict, 'announced': bool, 'pending': deque}
+        self.connections = [self._create_client(slot) for slot in range(self.pool_size)]
+        self._ready = [False] * self.pool_size
+        self._connecting = [False] * self.pool_size
+        self._reconnecting = [False] * self.pool_size
+        self._round_robin = itertools.count()
+
+    def _create_client(self, slot):
+        backend = socketio.AsyncClient(logger=False, engineio_logger=False, **self.client_kwargs)
+
+        @backend.on(AsyncBackendMultiplexer.RELAY_EVENT)
+        async def on_relay(envelope):
+            await self._route(envelope)
+
+        @backend.on('connect')
+        async def on_connect():
+            # (Re-)open the sessions carried by this slot; the backend forgets them when the socket drops
+            self._ready[slot] = True
+            self._reconnecting[slot] = False
+            await self._flush(slot)
+
+        @backend.on('disconnect')
+        async def on_disconnect(*args):
+            if self._closing:
+                return
+            print(f"⚠️ {self.name} connection {slot} lost")
+            self._ready[slot] = False
+            # The client retries on its own; don't race it with another connect()
+            self._reconnecting[slot] = backend.reconnection
+            lost = self._sessions_on(slot)
+            for _, session in lost:
+                session['announced'] = False
+            for client_sid, _ in lost:
+                await self.sio.emit('error', f'Lost connection to {self.name}',
+                                    to=client_sid, namespace=self.namespace)
+
+        @backend.on('__disconnect_final')
+        async def on_reconnect_failed():
+            # Automatic reconnection gave up; the next event for this slot connects afresh
+            self._reconnecting[slot] = False
+
+        return backend
+
+    def _sessions_on(self, slot):
+        return [(sid, session) for sid, session in self.sessions.items() if session['slot'] == slot]
+
+    async def _announce(self, backend, client_sid, session):
+        """Open the session on the backend once per underlying connection"""
+        if session['announced']:
+            return
+        session['announced'] = True
+        await backend.emit(AsyncBackendMultiplexer.RELAY_EVENT,
+                           {'clientSid': client_sid, 'event': 'connect', 'args': [session['meta']]})
+
+    async def _flush(self, slot):
+        """Announce the sessions on a ready slot and send the events they buffered meanwhile"""
+        backend = self.connections[slot]
+        for client_sid, session in self._sessions_on(slot):
+            await self._announce(backend, client_sid, session)
+            while session['pending']:
+                event, args = session['pending'].popleft()
+                await backend.emit(AsyncBackendMultiplexer.RELAY_EVENT,
+                                   {'clientSid': client_sid, 'event': event, 'args': args})
+
+    def _pick_slot(self):
+        """Least-loaded connection, ties broken round-robin"""
+        load = [0] * self.pool_size
+        for session in self.sessions.values():
+            load[session['slot']] += 1
+        start = next(self._round_robin) % self.pool_size
+        return min(range(self.pool_size), key=lambda i: (load[i], (i - start) % self.pool_size))
+
+    def _start_connect(self, slot):
+        """Open a slot's connection in the background unless it is up or already being opened"""
+        if self._ready[slot] or self._connecting[slot] or self._reconnecting[slot]:
+            return
+        self._connecting[slot] = True
+        self.sio.start_background_task(self._connect, slot)
+
+    async def _connect(self, slot):
+        backend = self.connections[slot]
+        try:
+            # The connect handler flushes the sessions that queued up meanwhile
+            await backend.connect(self.server_url, auth=self.auth)
+            print(f"✅ {self.name} connection {slot} established")
+        except Exception as e:
+            print(f"❌ Failed to connect {self.name} connection {slot}: {e}")
+            failed = [sid for sid, _ in self._sessions_on(slot)]
+            for client_sid in failed:
+                self.sessions.pop(client_sid, None)
+            for client_sid in failed:
+                await self.sio.emit('error', f'Failed to connect to {self.name}',
+                                    to=client_sid, namespace=self.namespace)
+        finally:
+            self._connecting[slot] = False
+
+    async def attach(self, client_sid, **meta):
+        """Open a backend session for a gateway client. Does not wait for the backend."""
+        slot = self._pick_slot()
+        session = {'slot': slot, 'meta': meta, 'announced': False, 'pending': deque()}
+        self.sessions[client_sid] = session
+        if self._ready[slot]:
+            await self._announce(self.connections[slot], client_sid, session)
+            return
+
+        self._start_connect(slot)
+
+    async def detach(self, client_sid):
+        """Close a client's backend session"""
+        session = self.sessions.pop(client_sid, None)
+        if session is None:
+            return
+
+        backend = self.connections[session['slot']]
+        if self._ready[session['slot']] and session['announced']:
+            try:
+                await backend.emit(AsyncBackendMultiplexer.RELAY_EVENT,
+                                   {'clientSid': client_sid, 'event': 'disconnect', 'args': []})
+            except Exception as e:
+                print(f"Error closing {self.name} session for {client_sid}: {e}")
+
+    async def forward(self, client_sid, event, *args):
+        """
+        Send a client event upstream, or buffer it until the session's connection is up.
+
+        Returns:
+            False if the client has no backend session or its buffer is full
+        """
+        session = self.sessions.get(client_sid)
+        if session is None:
+            return False
+
+        if self._ready[session['slot']] and session['announced'] and not session['pending']:
+            backend = self.connections[session['slot']]
+            await backend.emit(AsyncBackendMultiplexer.RELAY_EVENT,
+                               {'clientSid': client_sid, 'event': event, 'args': list(args)})
+            return True
+
+        if len(session['pending']) >= AsyncBackendMultiplexer.PENDING_LIMIT:
+            return False
+        session['pending'].append((event, list(args)))
+        self._start_connect(session['slot'])
+        return True
+
+    async def _route(self, envelope):
+        """Deliver a backend envelope to the gateway client it belongs to"""
+        client_sid = envelope.get('clientSid')
+        event = envelope.get('event')
+        if not client_sid or not event:
+            return
+        print(f"Backend -> Client {client_sid}: {event}")
+        if self.deliver is not None:
+            await self.deliver(client_sid, event, envelope.get('args', []))
+            return
+        await self.sio.emit(event, self.payload(envelope.get('args', [])), to=client_sid, namespace=self.namespace)
+
+    @staticmethod
+    def payload(args):
+        """AsyncServer.emit() takes one data argument: a tuple carries several"""
+        if not args:
+            return None
+        return args[0] if len(args) == 1 else tuple(args)
+
+    def stats(self):
+        return {
+            'sessions': len(self.sessions),
+            'connections': self.pool_size,
+            'connected': sum(self._ready),
+            'pending': sum(len(session['pending']) for session in self.sessions.values())
+        }
+
+    async def close(self):
+        self._closing = True
+        for backend in self.connections:
+            try:
+                await backend.disconnect()
+            except Exception:
+                pass
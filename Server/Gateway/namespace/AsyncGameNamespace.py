@@ -0,0 +1,56 @@
+import os
+
+import socketio
+
+from namespace.AsyncBackendMultiplexer import AsyncBackendMultiplexer
+
+
+class AsyncGameNamespace(socketio.AsyncNamespace):
+    """asyncio version of GameNamespace for the async gateway (asyncApp.py)"""
+
+    def __init__(self, namespace, sio, game_server_url, pool_size=None):
+        super().__init__(namespace)
+        self.game_server_url = game_server_url
+        # A few shared upstream sockets carry every game client (see AsyncBackendMultiplexer).
+        # GAME_BACKEND_SERIALIZER must match the game server's GAME_SOCKETIO_PARSER.
+        self.backend = AsyncBackendMultiplexer(
+            sio,
+            namespace,
+            game_server_url,
+            pool_size=pool_size or os.getenv('GAME_BACKEND_POOL_SIZE', 2),
+            client_kwargs={'serializer': os.getenv('GAME_BACKEND_SERIALIZER', 'default')},
+            name='game server',
+            relay_secret=os.getenv('GAME_RELAY_SECRET')
+        )
+
+    async def on_connect(self, sid, environ, auth=None):
+        """Client connected to game namespace"""
+        print(f"✅ Game Client connected: {sid}")
+
+        # Returns immediately; the multiplexer reports 'Failed to connect to game server' itself
+        await self.backend.attach(sid)
+
+    async def on_disconnect(self, sid, reason=None):
+        """Client disconnected from game namespace"""
+        print(f"❌ Game Client disconnected: {sid}")
+
+        await self.backend.detach(sid)
+
+    async def forward(self, sid, event, *args):
+        """Forward a client event to the game backend"""
+        print(f"Client {sid} -> Backend: {event}")
+
+        if not await self.backend.forward(sid, event, *args):
+            await self.emit('error', 'Backend connection not available', to=sid)
+
+    async def on_createMatch(self, sid):
+        await self.forward(sid, 'createMatch')
+
+    async def on_joinMatch(self, sid, match_code):
+        await self.forward(sid, 'joinMatch', match_code)
+
+    async def on_makeMove(self, sid, data):
+        await self.forward(sid, 'makeMove', data)
+
+    async def on_restartGame(self, sid, match_code):
+        await self.forward(sid, 'restartGame', match_code)
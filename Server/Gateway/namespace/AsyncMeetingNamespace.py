@@ -0,0 +1,92 @@
+import os
+from urllib.parse import parse_qs
+
+import socketio
+
+from namespace.AsyncBackendMultiplexer import AsyncBackendMultiplexer
+
+
+class AsyncMeetingNamespace(socketio.AsyncNamespace):
+    """asyncio version of MeetingNamespace for the async gateway (asyncApp.py)"""
+
+    def __init__(self, namespace, sio, meet_server_url, pool_size=None):
+        super().__init__(namespace)
+        self.meet_server_url = meet_server_url
+        # Shared TLS signaling channel(s) to the meeting server, tagged with the client sid.
+        # MEET_BACKEND_SERIALIZER must match the meeting server's SOCKETIO_SERIALIZER.
+        self.backend = AsyncBackendMultiplexer(
+            sio,
+            namespace,
+            meet_server_url,
+            pool_size=pool_size or os.getenv('MEET_BACKEND_POOL_SIZE', 2),
+            client_kwargs={
+                'ssl_verify': False,
+                'reconnection': True,
+                'reconnection_attempts': 5,
+                'reconnection_delay': 1,
+                'reconnection_delay_max': 5,
+                'serializer': os.getenv('MEET_BACKEND_SERIALIZER', 'default'),
+            },
+            name='meeting server',
+            deliver=self.deliver,
+            relay_secret=os.getenv('MEET_RELAY_SECRET')
+        )
+        # Clients that joined with ice_batch and take 'ice-candidates' batches
+        self.ice_batch_clients = set()
+
+    async def trigger_event(self, event, *args):
+        # Clients emit dashed event names ('ice-candidate'); map them to on_ice_candidate
+        return await super().trigger_event(event.replace('-', '_'), *args)
+
+    async def on_connect(self, sid, environ, auth=None):
+        """Client connected to meeting namespace"""
+        query = parse_qs(environ.get('QUERY_STRING', ''))
+        user_email = query.get('user_email', [None])[0]
+        print(f"✅ Meeting Client connected: {sid} (email: {user_email})")
+
+        # Returns immediately; the multiplexer reports 'Failed to connect to meeting server' itself
+        await self.backend.attach(sid, user_email=user_email)
+
+    async def on_disconnect(self, sid, reason=None):
+        """Client disconnected from meeting namespace"""
+        print(f"❌ Meeting Client disconnected: {sid}")
+
+        self.ice_batch_clients.discard(sid)
+        await self.backend.detach(sid)
+
+    async def forward(self, sid, event, data):
+        """Forward a signaling event to the meeting backend"""
+        print(f"Client {sid} -> Backend: {event}")
+
+        if not await self.backend.forward(sid, event, data):
+            await self.emit('error', 'Backend connection not available', to=sid)
+
+    async def deliver(self, sid, event, args):
+        """Route a backend event to the client, splitting candidate batches for clients that did not opt in"""
+        if event == 'ice-candidates' and sid not in self.ice_batch_clients:
+            batch = args[0] if args else {}
+            for candidate in batch.get('candidates', []):
+                await self.emit('ice-candidate', {'peerId': batch.get('peerId'), 'candidate': candidate}, to=sid)
+            return
+        await self.emit(event, AsyncBackendMultiplexer.payload(args), to=sid)
+
+    async def on_join(self, sid, data):
+        if data.get('ice_batch'):
+            self.ice_batch_clients.add(sid)
+        await self.forward(sid, 'join', data)
+
+    async def on_leave(self, sid, data):
+        await self.forward(sid, 'leave', data)
+
+    async def on_offer(self, sid, data):
+        await self.forward(sid, 'offer', data)
+
+    async def on_answer(self, sid, data):
+        await self.forward(sid, 'answer', data)
+
+    async def on_ice_candidate(self, sid, data):
+        await self.forward(sid, 'ice-candidate', data)
+
+    async def on_ice_candidates(self, sid, data):
+        # Batches pass straight through; the meeting server coalesces per-candidate events itself
+        await self.forward(sid, 'ice-candidates', data)
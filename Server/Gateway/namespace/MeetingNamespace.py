@@ -1,154 +1,112 @@
 from flask_socketio import Namespace
 from flask import request
-import socketio
+import os
+
+from namespace.BackendMultiplexer import BackendMultiplexer
+from iceBatcher import IceBatcher
 
 
 class MeetingNamespace(Namespace):
     """Namespace for meeting/video conference WebSocket events"""
-    
-    def __init__(self, namespace, socketio_app, meet_server_url):
+
+    def __init__(self, namespace, socketio_app, meet_server_url, pool_size=None):
         super().__init__(namespace)
         self.socketio_app = socketio_app
         self.meet_server_url = meet_server_url
-        self.client_connections = {}
-    
-    def create_backend_connection(self, client_sid, user_email=None):
-        """Create a dedicated backend connection for a meeting client"""
-        connection_url = self.meet_server_url
-        if user_email:
-            connection_url = f"{self.meet_server_url}?user_email={user_email}"
-        
-        backend = socketio.Client(
-            logger=False, 
-            engineio_logger=False,
-            ssl_verify=False,
-            reconnection=True,
-            reconnection_attempts=5,
-            reconnection_delay=1,
-            reconnection_delay_max=5,
+        # Shared TLS signaling channel(s) to the meeting server, tagged with the client sid.
+        # MEET_BACKEND_SERIALIZER must match the meeting server's SOCKETIO_SERIALIZER.
+        self.backend = BackendMultiplexer(
+            socketio_app,
+            namespace,
+            meet_server_url,
+            pool_size=pool_size or os.getenv('MEET_BACKEND_POOL_SIZE', 2),
+            client_kwargs={
+                'ssl_verify': False,
+                'reconnection': True,
+                'reconnection_attempts': 5,
+                'reconnection_delay': 1,
+                'reconnection_delay_max': 5,
+                'serializer': os.getenv('MEET_BACKEND_SERIALIZER', 'default'),
+            },
+            name='meeting server',
+            deliver=self.deliver,
+            relay_secret=os.getenv('MEET_RELAY_SECRET')
         )
-        
-        @backend.on('room-joined')
-        def on_room_joined(data):
-            print(f"Backend -> Client {client_sid}: room-joined")
-            self.socketio_app.emit('room-joined', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('new-peer')
-        def on_new_peer(data):
-            print(f"Backend -> Client {client_sid}: new-peer {data.get('peerId')}")
-            self.socketio_app.emit('new-peer', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('peer-disconnected')
-        def on_peer_disconnected(data):
-            print(f"Backend -> Client {client_sid}: peer-disconnected {data.get('peerId')}")
-            self.socketio_app.emit('peer-disconnected', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('offer')
-        def on_offer(data):
-            print(f"Backend -> Client {client_sid}: offer from {data.get('peerId')}")
-            self.socketio_app.emit('offer', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('answer')
-        def on_answer(data):
-            print(f"Backend -> Client {client_sid}: answer from {data.get('peerId')}")
-            self.socketio_app.emit('answer', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('ice-candidate')
-        def on_ice_candidate(data):
-            print(f"Backend -> Client {client_sid}: ice-candidate from {data.get('peerId')}")
-            self.socketio_app.emit('ice-candidate', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('error')
-        def on_error(data):
-            print(f"Backend -> Client {client_sid}: error {data}")
-            self.socketio_app.emit('error', data, to=client_sid, namespace='/meeting')
-        
-        @backend.on('room-full')
-        def on_room_full(data):
-            print(f"Backend -> Client {client_sid}: room-full")
-            self.socketio_app.emit('room-full', data, to=client_sid, namespace='/meeting')
-        
-        try:
-            backend.connect(connection_url)
-            print(f"✅ Created backend connection for meeting client {client_sid}")
-            return backend
-        except Exception as e:
-            print(f"❌ Failed to connect to meeting backend for client {client_sid}: {e}")
-            return None
-    
+        # Trickled ICE candidates travel upstream in per-(sender, target) batches
+        self.ice_batcher = IceBatcher(self.send_ice_candidates, socketio_app.start_background_task, socketio_app.sleep)
+        # Clients that joined with ice_batch and take 'ice-candidates' batches
+        self.ice_batch_clients = set()
+
+    def trigger_event(self, event, *args):
+        # Clients emit dashed event names ('ice-candidate'); map them to on_ice_candidate
+        return super().trigger_event(event.replace('-', '_'), *args)
+
     def on_connect(self, auth=None):
         """Client connected to meeting namespace"""
         client_sid = request.sid
         user_email = request.args.get('user_email')
         print(f"✅ Meeting Client connected: {client_sid} (email: {user_email})")
-        
-        backend = self.create_backend_connection(client_sid, user_email)
-        if backend:
-            self.client_connections[client_sid] = {
-                'backend': backend,
-                'user_email': user_email
-            }
-        else:
-            self.emit('error', 'Failed to connect to meeting server', to=client_sid)
-    
+
+        # Returns immediately; the multiplexer reports 'Failed to connect to meeting server' itself
+        self.backend.attach(client_sid, user_email=user_email)
+
     def on_disconnect(self):
         """Client disconnected from meeting namespace"""
         client_sid = request.sid
         print(f"❌ Meeting Client disconnected: {client_sid}")
-        
-        if client_sid in self.client_connections:
-            try:
-                self.client_connections[client_sid]['backend'].disconnect()
-            except Exception as e:
-                print(f"Error disconnecting meeting backend: {e}")
-            del self.client_connections[client_sid]
-    
+
+        self.ice_batcher.discard_sender(client_sid)
+        self.ice_batch_clients.discard(client_sid)
+        self.backend.detach(client_sid)
+
+    def forward(self, event, data):
+        """Forward a signaling event to the meeting backend"""
+        client_sid = request.sid
+        print(f"Client {client_sid} -> Backend: {event} ({data.get('room') or data.get('targetId')})")
+
+        # Candidates still being coalesced go first, keeping the client's event order
+        self.ice_batcher.flush_sender(client_sid)
+        if not self.backend.forward(client_sid, event, data):
+            self.emit('error', 'Backend connection not available', to=client_sid)
+
+    def send_ice_candidates(self, client_sid, target_id, room, candidates):
+        """Forward one batch of a client's candidates for a target peer"""
+        batch = {'room': room, 'targetId': target_id, 'candidates': candidates}
+        if not self.backend.forward(client_sid, 'ice-candidates', batch):
+            self.socketio_app.emit('error', 'Backend connection not available', to=client_sid, namespace=self.namespace)
+
+    def deliver(self, client_sid, event, args):
+        """Route a backend event to the client, splitting candidate batches for clients that did not opt in"""
+        if event == 'ice-candidates' and client_sid not in self.ice_batch_clients:
+            batch = args[0] if args else {}
+            for candidate in batch.get('candidates', []):
+                self.socketio_app.emit('ice-candidate', {'peerId': batch.get('peerId'), 'candidate': candidate},
+                                       to=client_sid, namespace=self.namespace)
+            return
+        self.socketio_app.emit(event, *args, to=client_sid, namespace=self.namespace)
+
     def on_join(self, data):
         """Forward join event to backend"""
-        client_sid = request.sid
-        print(f"Client {client_sid} -> Backend: join room {data.get('room')}")
-        
-        if client_sid in self.client_connections:
-            self.client_connections[client_sid]['backend'].emit('join', data)
-        else:
-            self.emit('error', 'Backend connection not found', to=client_sid)
-    
+        if data.get('ice_batch'):
+            self.ice_batch_clients.add(request.sid)
+        self.forward('join', data)
+
     def on_leave(self, data):
         """Forward leave event to backend"""
-        client_sid = request.sid
-        print(f"Client {client_sid} -> Backend: leave room {data.get('room')}")
-        
-        if client_sid in self.client_connections:
-            self.client_connections[client_sid]['backend'].emit('leave', data)
-        else:
-            self.emit('error', 'Backend connection not found', to=client_sid)
-    
+        self.forward('leave', data)
+
     def on_offer(self, data):
         """Forward WebRTC offer to backend"""
-        client_sid = request.sid
-        print(f"Client {client_sid} -> Backend: offer to {data.get('targetId')}")
-        
-        if client_sid in self.client_connections:
-            self.client_connections[client_sid]['backend'].emit('offer', data)
-        else:
-            self.emit('error', 'Backend connection not found', to=client_sid)
-    
+        self.forward('offer', data)
+
     def on_answer(self, data):
         """Forward WebRTC answer to backend"""
-        client_sid = request.sid
-        print(f"Client {client_sid} -> Backend: answer to {data.get('targetId')}")
-        
-        if client_sid in self.client_connections:
-            self.client_connections[client_sid]['backend'].emit('answer', data)
-        else:
-            self.emit('error', 'Backend connection not found', to=client_sid)
-    
+        self.forward('answer', data)
+
     def on_ice_candidate(self, data):
-        """Forward ICE candidate to backend"""
-        client_sid = request.sid
-        print(f"Client {client_sid} -> Backend: ice-candidate to {data.get('targetId')}")
-        
-        if client_sid in self.client_connections:
-            self.client_connections[client_sid]['backend'].emit('ice-candidate', data)
-        else:
-            self.emit('error', 'Backend connection not found', to=client_sid)
\ No newline at end of file
+        """Forward ICE candidate to backend, coalesced with the client's other candidates for that peer"""
+        self.ice_batcher.add(request.sid, data['targetId'], data.get('room'), [data['candidate']])
+
+    def on_ice_candidates(self, data):
+        """Forward a batch of ICE candidates to backend"""
+        self.ice_batcher.add(request.sid, data['targetId'], data.get('room'), data.get('candidates') or [])
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with a per-entry time to live.
+
+    Entries can carry tags (e.g. 'meeting:<id>') so that every entry derived
+    from one resource can be dropped at once with invalidate_tag().
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=None, ttl_seconds=None, name='cache'):
+        """
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl_seconds: Default lifetime of an entry
+            name: Label used in stats()
+        """
+        self.maxsize = max(1, int(maxsize if maxsize is not None else os.getenv('CACHE_MAXSIZE', 1024)))
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv('CACHE_TTL', 30))
+        self.name = name
+
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, tags)
+        self._tags = {}  # tag -> set of keys
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        """
+        Return a live entry and mark it as recently used.
+
+        Returns:
+            The cached value, or default if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key, TTLCache._MISSING)
+            if entry is TTLCache._MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds=None, tags=()):
+        """
+        Store a value, evicting the least recently used entries beyond maxsize.
+
+        Args:
+            ttl_seconds: Lifetime of this entry (defaults to the cache's ttl_seconds)
+            tags: Labels under which the entry can later be invalidated
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove one entry. Returns True if it was present."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            self.invalidations += 1
+            return True
+
+    def invalidate_tag(self, *tags):
+        """
+        Remove every entry carrying any of the given tags.
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _drop(self, key):
+        """Remove an entry and its tag references (caller holds the lock)"""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
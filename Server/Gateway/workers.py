@@ -0,0 +1,117 @@
+"""
+Multi-worker launcher for the (threaded) gateway.
+
+Starts GATEWAY_WORKERS processes (default: one per core) that all listen on the
+same port with SO_REUSEPORT, so the kernel spreads incoming connections over
+them. Each worker is a full gateway: its own HTTP handling, caches and backend
+socket pool.
+
+Socket.IO sessions must stay on the worker that accepted them, which the
+kernel does not guarantee for long-polling (one new connection per request).
+Workers therefore only accept the websocket transport unless
+GATEWAY_SOCKETIO_TRANSPORTS says otherwise, and GATEWAY_SOCKETIO_MESSAGE_QUEUE
+should point to Redis so that emits reach a client from any worker, and so
+that meeting cache invalidations reach every worker's cache (cacheBus.py).
+Without it the per-worker meetings cache is turned off.
+
+    GATEWAY_WORKERS=4 GATEWAY_SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379/1 python workers.py
+
+Crashed workers are restarted, after a growing delay while they keep failing
+shortly after starting; SIGINT/SIGTERM stops them all.
+"""
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+
+HOST = os.getenv('GATEWAY_HOST', '0.0.0.0')
+PORT = int(os.getenv('GATEWAY_PORT', 7050))
+
+# A worker that exits within STABLE_SECONDS of starting is restarted after a delay
+# doubling from 1s up to MAX_RESTART_DELAY
+STABLE_SECONDS = 30
+MAX_RESTART_DELAY = float(os.getenv('GATEWAY_MAX_RESTART_DELAY', 60))
+
+
+def serve(worker_id):
+    """Worker process: bind the shared port and serve the gateway app on it"""
+    os.environ.setdefault('GATEWAY_SOCKETIO_TRANSPORTS', 'websocket')
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    listener.bind((HOST, PORT))
+    listener.listen(1024)
+
+    # Imported here so that every worker builds its own app, socket pools and threads
+    from werkzeug.serving import make_server
+    from app import app
+
+    cert, key = os.getenv('GATEWAY_SSL_CERT'), os.getenv('GATEWAY_SSL_KEY')
+    server = make_server(HOST, PORT, app, threaded=True,
+                         ssl_context=(cert, key) if cert and key else None,
+                         fd=listener.fileno())
+    print(f"✅ Gateway worker {worker_id} (pid {os.getpid()}) serving on {HOST}:{PORT}")
+    server.serve_forever()
+
+
+def main():
+    count = int(os.getenv('GATEWAY_WORKERS', os.cpu_count() or 1))
+    if count > 1 and not os.getenv('GATEWAY_SOCKETIO_MESSAGE_QUEUE'):
+        print("⚠️ GATEWAY_SOCKETIO_MESSAGE_QUEUE is not set: emits only reach clients of the emitting worker, "
+              "and the meetings response cache is disabled")
+        # A write handled by one worker could not invalidate the others' caches
+        os.environ['GATEWAY_MEETINGS_CACHE_TTL'] = '0'
+
+    # Workers start from a fresh interpreter instead of forking this one
+    context = multiprocessing.get_context('spawn')
+    workers = {}
+    started_at = {}
+    delays = {}
+    restart_at = {}
+    stopping = False
+
+    def start(worker_id):
+        process = context.Process(target=serve, args=(worker_id,), name=f'gateway-worker-{worker_id}')
+        process.start()
+        workers[worker_id] = process
+        started_at[worker_id] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for worker_id in range(count):
+        start(worker_id)
+
+    while not stopping:
+        time.sleep(1)
+        now = time.monotonic()
+        for worker_id, process in list(workers.items()):
+            if stopping or process.is_alive():
+                continue
+            if worker_id not in restart_at:
+                if now - started_at[worker_id] < STABLE_SECONDS:
+                    delays[worker_id] = min(delays.get(worker_id, 0.5) * 2, MAX_RESTART_DELAY)
+                else:
+                    delays[worker_id] = 1
+                restart_at[worker_id] = now + delays[worker_id]
+                print(f"⚠️ Gateway worker {worker_id} exited ({process.exitcode}), "
+                      f"restarting in {delays[worker_id]:.0f}s")
+            elif now >= restart_at[worker_id]:
+                del restart_at[worker_id]
+                start(worker_id)
+
+    for process in workers.values():
+        process.terminate()
+    for process in workers.values():
+        process.join(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from supaBase.supaBase import dataBaseAuth
 import json
 import os
-import requests
+import httpClient
 
 from dotenv import load_dotenv
 
@@ -47,7 +47,7 @@ class authHelper :
                 print(session)
                 
                 # FIX: Get the response and parse it as JSON
-                userFromServiceResponse = requests.get(f'http://{self.userService}/users/by-email/{Email}')
+                userFromServiceResponse = httpClient.get(f'http://{self.userService}/users/by-email/{Email}')
                 
                 # Check if request was successful
                 if userFromServiceResponse.status_code == 200:
@@ -81,6 +81,18 @@ class authHelper :
         except Exception as e :
             print(f"matna7ach user :{userId} ")
     
+    def getUserRole(self, Email):
+        """Current role of a user from userServices, None if it cannot be read"""
+        try:
+            response = httpClient.get(f'http://{self.userService}/users/by-email/{Email}')
+            if response.status_code == 200:
+                return response.json().get("Role")
+            print(f"Failed to get user from service: {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"Error getting role of {Email}: {e}")
+            return None
+
     def getUserEmailById(self, userId):
         """Get user email by user ID"""
         try:
@@ -2,13 +2,16 @@ from flask import Flask, jsonify, render_template, session, send_from_directory,
 from dotenv import load_dotenv
 import os
 import json
-import requests
+import httpClient
 from Helper import authHelper
+from tokenHelper import tokenHelper
 from supaBase.supaBase import dataBaseAuth
 
 load_dotenv()
 
 app = Flask(__name__)
+# Refuse to start rather than sign tokens with a guessable secret
+tokenHelper.secret()
 authenter = dataBaseAuth(os.getenv("SUPABASE_URL"),os.getenv("SUPABASE_KEY"))
 auth_helper = authHelper(authenter)
 SAVING_server = os.getenv('SAVING_server')
@@ -60,7 +63,7 @@ def signUp():
 
     try:
         # Send user data to UserService instead of directly to Saving Server
-        response_from_user_service = requests.post(
+        response_from_user_service = httpClient.post(
             f'http://{USER_SERVICE}/register-user', 
             json=user_data,
             timeout=15
@@ -73,7 +76,7 @@ def signUp():
         print("from app : user registered successfully via userService")
     
         return jsonify({
-            "Token": result.get("Token"),
+            "Token": tokenHelper.issueToken(id, email, "employee"),
             "id": result.get("id")
         }), 200
     else:
@@ -103,7 +106,7 @@ def login():
     try:
         result = json.loads(login_result)
         return jsonify({
-            "Token": result.get("Token"),
+            "Token": tokenHelper.issueToken(result.get("id"), email, result.get("role")),
             "firstname": result.get("firstname"),
             "lastname": result.get("lastname"),
             "role": result.get("role")
@@ -113,6 +116,27 @@ def login():
         return jsonify({"error": "Error processing login response"}), 500
 
 
+@app.route("/token/refresh", methods=['POST'])
+def refresh_token():
+    """Re-mint a still valid token with a fresh expiry and the user's current role"""
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return jsonify({"error": "Missing Authorization Header"}), 401
+    token = auth_header[len('Bearer '):]
+
+    claims = tokenHelper.verifyToken(token)
+    if claims is None:
+        return jsonify({"error": "Invalid or expired token"}), 401
+
+    role = auth_helper.getUserRole(claims.get("email"))
+    if role is None:
+        return jsonify({"error": "Could not read the user's role"}), 502
+    return jsonify({
+        "Token": tokenHelper.refreshToken(token, role),
+        "role": tokenHelper.normalizeRole(role)
+    }), 200
+
+
 @app.route("/user/<user_id>/email", methods=['GET'])
 def get_user_email(user_id):
     """Get user email by user ID - used by Gateway for JWT identity resolution"""
@@ -0,0 +1,108 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+
+class tokenHelper:
+    """
+    Mints the access tokens the Gateway verifies with flask-jwt-extended (HS256, shared secret).
+
+    Besides the subject (user id) the token carries the user's verified email and role,
+    so the Gateway can read them from the token instead of asking the auth/user services.
+    The role is only as fresh as the token: refreshToken() re-mints it with the current one.
+    """
+
+    ISSUER = "authService"
+    # Same lifetime as the Supabase session tokens handed out before (JWT_ACCESS_TOKEN_EXPIRES)
+    DEFAULT_EXPIRES = 3600
+    # userServices speaks 'employee' to the database and 'EMPLOYER' in its ROLE enum
+    ROLE_ALIASES = {"employer": "employee"}
+
+    @staticmethod
+    def secret():
+        """
+        Signing secret shared with the Gateway
+
+        Raises:
+            RuntimeError: If JWT_SECRET_KEY is not set; tokens are never signed with a default
+        """
+        secret = os.getenv("JWT_SECRET_KEY")
+        if not secret:
+            raise RuntimeError("JWT_SECRET_KEY is not set")
+        return secret
+
+    @staticmethod
+    def normalizeRole(role):
+        """
+        Role claim of a token: lower case, in the database's vocabulary
+
+        Returns:
+            str: e.g. 'employee', 'manager', 'hr'; None if the role is unknown
+        """
+        if not role:
+            return None
+        role = str(getattr(role, "value", role)).strip().lower()
+        return tokenHelper.ROLE_ALIASES.get(role, role)
+
+    @staticmethod
+    def issueToken(user_id, email, role):
+        """
+        Create a signed access token
+
+        Args:
+            user_id: Auth provider user id, used as the token subject
+            email: Verified email of the user
+            role: Application role of the user (from userServices), normalized here
+
+        Returns:
+            str: Encoded JWT
+        """
+        now = datetime.now(timezone.utc)
+        expires_in = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES", tokenHelper.DEFAULT_EXPIRES))
+        claims = {
+            "sub": str(user_id),
+            "email": email,
+            "role": tokenHelper.normalizeRole(role),
+            "iss": tokenHelper.ISSUER,
+            # flask-jwt-extended bookkeeping claims
+            "type": "access",
+            "fresh": False,
+            "jti": str(uuid.uuid4()),
+            "iat": now,
+            "nbf": now,
+            "exp": now + timedelta(seconds=expires_in)
+        }
+        return jwt.encode(claims, tokenHelper.secret(), algorithm="HS256")
+
+    @staticmethod
+    def verifyToken(token):
+        """
+        Decode a token issued by this service
+
+        Returns:
+            dict: Claims of the token, None if it is invalid, expired or not ours
+        """
+        try:
+            return jwt.decode(token, tokenHelper.secret(), algorithms=["HS256"], issuer=tokenHelper.ISSUER,
+                              options={"verify_aud": False})
+        except jwt.InvalidTokenError:
+            return None
+
+    @staticmethod
+    def refreshToken(token, role):
+        """
+        Re-mint a still valid token with a new expiry and the user's current role
+
+        Args:
+            token: Encoded JWT issued by this service
+            role: Current role of the user (from userServices)
+
+        Returns:
+            str: Encoded JWT, None if token is invalid or expired
+        """
+        claims = tokenHelper.verifyToken(token)
+        if claims is None:
+            return None
+        return tokenHelper.issueToken(claims["sub"], claims.get("email"), role)
@@ -1,15 +1,29 @@
-import requests
+import httpClient
 import os
+import json
+import base64
+import bisect
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from werkzeug.http import parse_options_header
+from ttlCache import TTLCache
 
 load_dotenv()
 
 class FileHelper:
     HEADERS = {"X-Internal-Key": "nexus-internal-secret-key-123"}
+    LIST_DEFAULT_LIMIT = 50
+    LIST_MAX_LIMIT = 200
 
     def __init__(self):
         self.saving_server = os.getenv('SAVING_SERVER')
         self.base_url = f"http://{self.saving_server}"
+        # Sorted file listings per uploader, reused by the following pages for a few seconds
+        self._listings = TTLCache(
+            maxsize=256,
+            ttl_seconds=os.getenv('FILE_LIST_CACHE_TTL', 15),
+            name='file_listings'
+        )
     
     def upload_file(self, file, user_email):
         """
@@ -26,12 +40,67 @@ class FileHelper:
             files = {'file': (file.filename, file.stream, file.content_type)}
             data = {'user_email': user_email}
             
-            response = requests.post(
+            response = httpClient.post(
                 f"{self.base_url}/file/upload",
                 files=files,
                 headers=FileHelper.HEADERS,
                 data=data
             )
+            if response.status_code == 200:
+                self._listings.clear()
+            
+            return {
+                'success': response.status_code == 200,
+                'status_code': response.status_code,
+                'data': response.json() if response.status_code == 200 else response.text
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'status_code': 500,
+                'error': str(e)
+            }
+    
+    def upload_stream(self, stream, content_type, content_length, user_email):
+        """
+        Relay a multipart upload to the saving server without buffering it
+        
+        The user_email form field is sent as an extra part in front of the client's
+        own parts, so the body is forwarded chunk by chunk as it arrives.
+        
+        Args:
+            stream: Raw request body (multipart/form-data with a 'file' part)
+            content_type: Content-Type of the body, including its boundary
+            content_length: Size of the body, None if sent chunked
+            user_email: Email of the user uploading the file
+            
+        Returns:
+            dict: Response from the saving server
+        """
+        try:
+            _, options = parse_options_header(content_type)
+            boundary = options.get('boundary')
+            if not boundary:
+                return {
+                    'success': False,
+                    'status_code': 400,
+                    'error': 'Missing multipart boundary'
+                }
+            
+            user_field = (
+                f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="user_email"\r\n\r\n'
+                f'{user_email}\r\n'
+            ).encode('utf-8')
+            body = httpClient.StreamBody(stream, length=content_length, prefix=user_field)
+            
+            response = httpClient.post(
+                f"{self.base_url}/file/upload",
+                data=body,
+                headers={**FileHelper.HEADERS, 'Content-Type': content_type}
+            )
+            if response.status_code == 200:
+                self._listings.clear()
             
             return {
                 'success': response.status_code == 200,
@@ -56,7 +125,7 @@ class FileHelper:
             dict: Response containing file data or error
         """
         try:
-            response = requests.get(
+            response = httpClient.get(
                 f"{self.base_url}/file/get/{filename}",
                                 headers=FileHelper.HEADERS
             )
@@ -82,6 +151,90 @@ class FileHelper:
                 'error': str(e)
             }
     
+    def stream_file(self, filename, range_header=None, if_range=None, conditional=None):
+        """
+        Open a file on the saving server without reading its body
+        
+        Args:
+            filename: Name of the file to retrieve
+            range_header: Client's Range header, forwarded so the saving server can answer 206 itself
+            if_range: Client's If-Range header, forwarded along with the Range header
+            conditional: If-None-Match / If-Modified-Since headers revalidating a cached copy
+            
+        Returns:
+            dict: On success 'response' is the open upstream response; iterate it with
+                  iter_body(), which closes it. A 304 answer to a conditional request
+                  also counts as success.
+        """
+        headers = {**FileHelper.HEADERS, 'Accept-Encoding': 'identity'}
+        if range_header:
+            headers['Range'] = range_header
+            if if_range:
+                headers['If-Range'] = if_range
+        if conditional:
+            headers.update(conditional)
+        try:
+            response = httpClient.get(
+                f"{self.base_url}/file/get/{filename}",
+                headers=headers,
+                stream=True
+            )
+            
+            if response.status_code == 304:
+                response.close()
+                return {
+                    'success': True,
+                    'status_code': 304,
+                    'filename': filename
+                }
+            elif response.status_code in (200, 206):
+                return {
+                    'success': True,
+                    'status_code': response.status_code,
+                    'response': response,
+                    'content_type': response.headers.get('Content-Type', 'application/octet-stream'),
+                    'filename': filename
+                }
+            else:
+                error = response.text
+                response.close()
+                return {
+                    'success': False,
+                    'status_code': response.status_code,
+                    'error': error,
+                    'content_range': response.headers.get('Content-Range')
+                }
+        except Exception as e:
+            return {
+                'success': False,
+                'status_code': 500,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def iter_body(response, start=0, stop=None):
+        """
+        Yield an upstream body chunk by chunk, optionally only bytes [start, stop)
+        
+        Args:
+            response: Response opened with stream=True; closed once exhausted
+            start: First byte to yield
+            stop: Byte after the last one to yield, None for the end of the body
+        """
+        try:
+            position = 0
+            for chunk in response.iter_content(httpClient.STREAM_CHUNK_SIZE):
+                end = position + len(chunk)
+                if end > start:
+                    chunk = chunk[max(0, start - position):None if stop is None else stop - position]
+                    if chunk:
+                        yield chunk
+                position = end
+                if stop is not None and position >= stop:
+                    break
+        finally:
+            response.close()
+    
     def get_all_files(self):
         """
         Get all file names from the saving server
@@ -90,7 +243,7 @@ class FileHelper:
             dict: Response containing list of files or error
         """
         try:
-            response = requests.get(
+            response = httpClient.get(
                 f"{self.base_url}/file/getAll",
                                 headers=FileHelper.HEADERS,
 
@@ -107,3 +260,135 @@ class FileHelper:
                 'status_code': 500,
                 'error': str(e)
             }
+    
+    def list_files(self, uploaded_by=None, prefix=None, since=None, until=None,
+                   limit=None, cursor=None, fields=None):
+        """
+        Get one page of files, newest first
+        
+        The uploader filter is applied by the saving server; the sorted result is kept
+        for a few seconds so the following pages are cut from it without another fetch.
+        Without limit and cursor every matching file is returned in one page, as before paging.
+        
+        Args:
+            uploaded_by: Only files uploaded by this email
+            prefix: Only files whose name starts with this prefix
+            since: Only files uploaded at or after this ISO 8601 date/time
+            until: Only files uploaded before this ISO 8601 date/time
+            limit: Page size (at most LIST_MAX_LIMIT; LIST_DEFAULT_LIMIT when only a cursor is given)
+            cursor: next_cursor of the previous page
+            fields: File attributes to return, all if None
+            
+        Returns:
+            dict: 'data' holds 'files', 'count' and 'next_cursor' (None on the last page)
+        """
+        try:
+            if limit is not None or cursor is not None:
+                limit = min(max(int(limit or FileHelper.LIST_DEFAULT_LIMIT), 1), FileHelper.LIST_MAX_LIMIT)
+            since_ts = FileHelper._parse_time(since) if since else None
+            until_ts = FileHelper._parse_time(until) if until else None
+            after = FileHelper._decode_cursor(cursor) if cursor else None
+        except (TypeError, ValueError) as e:
+            return {
+                'success': False,
+                'status_code': 400,
+                'error': f"Invalid listing parameters: {e}"
+            }
+        
+        listing = self._listings.get(uploaded_by or '')
+        if listing is None:
+            result = self._fetch_listing(uploaded_by)
+            if not result['success']:
+                return result
+            listing = result['data']
+            self._listings.set(uploaded_by or '', listing)
+        files, keys = listing
+        
+        page = []
+        next_cursor = None
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        for index in range(start, len(files)):
+            file = files[index]
+            timestamp = -keys[index][0]
+            if prefix and not str(file.get('filename', '')).startswith(prefix):
+                continue
+            if since_ts is not None and timestamp < since_ts:
+                # Newest first: everything after this is older still
+                break
+            if until_ts is not None and timestamp >= until_ts:
+                continue
+            if limit is not None and len(page) == limit:
+                next_cursor = FileHelper._encode_cursor(keys[page_last])
+                break
+            page.append(file if not fields else {name: file.get(name) for name in fields})
+            page_last = index
+        
+        return {
+            'success': True,
+            'status_code': 200,
+            'data': {
+                'files': page,
+                'count': len(page),
+                'next_cursor': next_cursor
+            }
+        }
+    
+    def _fetch_listing(self, uploaded_by):
+        """Fetch the files of an uploader (all if None) sorted newest first, with their sort keys"""
+        try:
+            params = {'user_email': uploaded_by} if uploaded_by else None
+            response = httpClient.get(
+                f"{self.base_url}/file/getAll",
+                headers=FileHelper.HEADERS,
+                params=params
+            )
+            if response.status_code != 200:
+                return {
+                    'success': False,
+                    'status_code': response.status_code,
+                    'data': response.text
+                }
+            
+            payload = response.json()
+            files = payload.get('data', []) if isinstance(payload, dict) else payload
+            files = sorted(files, key=FileHelper._sort_key)
+            return {
+                'success': True,
+                'status_code': 200,
+                'data': (files, [FileHelper._sort_key(file) for file in files])
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'status_code': 500,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _parse_time(value):
+        """ISO 8601 date/time (naive values are UTC) -> POSIX timestamp"""
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    
+    @staticmethod
+    def _sort_key(file):
+        """Ascending order of this key lists files newest first; the id breaks ties"""
+        try:
+            timestamp = FileHelper._parse_time(file.get('uploaded_at'))
+        except (TypeError, ValueError):
+            timestamp = 0.0
+        return (-timestamp, str(file.get('file_id', file.get('id', ''))))
+    
+    @staticmethod
+    def _encode_cursor(key):
+        return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            timestamp, file_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return (float(timestamp), str(file_id))
+        except Exception:
+            raise ValueError("malformed cursor")
@@ -1,9 +1,11 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, Response, send_file, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
+from urllib.parse import quote
+from werkzeug.http import parse_range_header, parse_date, quote_etag
 import os
 from Helper import FileHelper
-from io import BytesIO
+from fileCache import FileCache
 
 load_dotenv()
 
@@ -13,6 +15,9 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 # Initialize the file helper
 file_helper = FileHelper()
 
+# Local copies of downloaded files, served without asking the saving server while fresh
+file_cache = FileCache()
+
 # Internal API key for gateway authentication
 INTERNAL_API_KEY = "INTERNAL_API_KEY"
 
@@ -23,12 +28,48 @@ def verify_internal_request():
     return api_key == INTERNAL_API_KEY
 
 
+def send_cached_file(entry, filename):
+    """
+    Serve a file from the local cache, with Range and conditional request handling
+    
+    Hits carry the upstream ETag, the one a miss relays, so If-Range and If-None-Match
+    from clients that got the file either way keep matching.
+    
+    Returns:
+        Flask response, or None if the blob was evicted in the meantime
+    """
+    try:
+        response = send_file(
+            entry['path'],
+            mimetype=entry['content_type'],
+            as_attachment=True,
+            download_name=filename,
+            conditional=False,
+            etag=False,
+            last_modified=parse_date(entry['last_modified']) if entry['last_modified'] else None
+        )
+    except FileNotFoundError:
+        return None
+    response.headers['ETag'] = entry['etag'] or quote_etag(entry['digest'])
+    response.make_conditional(request, accept_ranges=True, complete_length=entry['size'])
+    response.headers['X-Cache'] = 'HIT'
+    return response
+
+
+def uploaded_filename(data):
+    """Name of the stored file in a saving server upload response, None if absent"""
+    if not isinstance(data, dict):
+        return None
+    nested = data.get('data')
+    return data.get('filename') or (nested.get('filename') if isinstance(nested, dict) else None)
+
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """
     Upload a file to the saving server
     Expects:
-        - file in the request files
+        - multipart/form-data body with a 'file' part
         - user_email in the request headers (sent by gateway)
     """
     # Verify internal request
@@ -44,15 +85,22 @@ def upload_file():
     #if 'file' not in request.files:
     #    return jsonify({"error": "No file provided"}), 400
     user_email="manager@mas3oud.tcom"
-    file = request.files['file']
     
-    if file.filename == '':
-        return jsonify({"error": "No file selected"}), 400
+    # Relay the multipart body as it arrives instead of spooling it through request.files
+    if not request.mimetype.startswith('multipart/form-data'):
+        return jsonify({"error": "No file provided"}), 400
     
     # Upload file using helper
-    result = file_helper.upload_file(file, user_email)
+    result = file_helper.upload_stream(request.stream, request.content_type, request.content_length, user_email)
     
     if result['success']:
+        # A cached copy under the same name is outdated now; if the name is not in the
+        # response, drop them all rather than serve a replaced file
+        filename = uploaded_filename(result['data'])
+        if filename:
+            file_cache.discard(filename)
+        else:
+            file_cache.clear()
         return jsonify({
             "message": "File uploaded successfully",
             "data": result['data']
@@ -67,19 +115,37 @@ def upload_file():
 @app.route('/getAllfiles', methods=['GET'])
 def get_all_files():
     """
-    Get all file names from the saving server
+    Get one page of files from the saving server, newest first
+    
+    Without limit and cursor all matching files are returned (next_cursor is None).
+    
+    Query parameters:
+        uploaded_by: Only files uploaded by this email
+        prefix: Only files whose name starts with this prefix
+        since / until: Upload date range (ISO 8601, since inclusive, until exclusive)
+        limit: Page size (max 200; 50 when only a cursor is given)
+        cursor: next_cursor of the previous page
+        fields: Comma separated file attributes to return (e.g. filename,size)
     """
     # Verify internal request
     #if not verify_internal_request():
     #    return jsonify({"error": "Unauthorized"}), 401
     
-    # Get all files using helper
-    result = file_helper.get_all_files()
+    fields = request.args.get('fields')
+    result = file_helper.list_files(
+        uploaded_by=request.args.get('uploaded_by'),
+        prefix=request.args.get('prefix'),
+        since=request.args.get('since'),
+        until=request.args.get('until'),
+        limit=request.args.get('limit'),
+        cursor=request.args.get('cursor'),
+        fields=[name.strip() for name in fields.split(',') if name.strip()] if fields else None
+    )
     
     if result['success']:
         return jsonify({
             "message": "Files retrieved successfully",
-            "files": result['data']
+            **result['data']
         }), 200
     else:
         return jsonify({
@@ -92,27 +158,93 @@ def get_all_files():
 def get_file(filename):
     """
     Get a specific file from the saving server
+    Streams the body through and answers Range requests with 206 Partial Content
     """
     # Verify internal request
     if not verify_internal_request():
         return jsonify({"error": "Unauthorized"}), 401
     
-    # Get file using helper
-    result = file_helper.get_file(filename)
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
     
-    if result['success']:
-        # Return the file
-        return send_file(
-            BytesIO(result['data']),
-            mimetype=result['content_type'],
-            as_attachment=True,
-            download_name=filename
-        )
-    else:
+    # Only single byte ranges are served partially; anything else gets the whole file (RFC 9110)
+    byte_range = parse_range_header(range_header)
+    if byte_range is None or byte_range.units != 'bytes' or len(byte_range.ranges) != 1:
+        range_header = None
+    
+    # Serve from the local cache while fresh, revalidate it with a conditional request once stale
+    entry = file_cache.lookup(filename)
+    if entry is not None and entry['fresh']:
+        cached = send_cached_file(entry, filename)
+        if cached is not None:
+            return cached
+        entry = None
+    
+    # Open the file on the saving server; the body is relayed as it arrives. With a cached
+    # copy the whole file is requested, so it can replace the copy if it changed.
+    conditional = FileCache.validators(entry) if entry is not None else None
+    result = file_helper.stream_file(filename, None if entry else range_header, if_range, conditional)
+    
+    if result['success'] and result['status_code'] == 304:
+        file_cache.revalidated(filename)
+        cached = send_cached_file(entry, filename)
+        if cached is not None:
+            return cached
+        # Evicted while revalidating: fetch it again
+        result = file_helper.stream_file(filename, range_header, if_range)
+    
+    if not result['success']:
+        # A 416 from the saving server carries the file size in Content-Range
+        error_headers = {'Content-Range': result['content_range']} if result.get('content_range') else {}
         return jsonify({
             "error": "Failed to retrieve file",
             "details": result.get('error', result.get('data'))
-        }), result['status_code']
+        }), result['status_code'], error_headers
+    
+    upstream = result['response']
+    status = upstream.status_code
+    headers = {
+        'Content-Type': result['content_type'],
+        'Content-Disposition': f"attachment; filename*=UTF-8''{quote(filename)}",
+        'Accept-Ranges': 'bytes'
+    }
+    for name in ('Content-Length', 'Content-Range', 'ETag', 'Last-Modified'):
+        if name in upstream.headers:
+            headers[name] = upstream.headers[name]
+    
+    start, stop = 0, None
+    # If-Range: only serve a part of the representation the client already has
+    if_range_matches = not if_range or if_range in (upstream.headers.get('ETag'), upstream.headers.get('Last-Modified'))
+    
+    if range_header and status == 200 and if_range_matches:
+        # The saving server ignored the Range header: cut the range out of the full body
+        total = upstream.headers.get('Content-Length')
+        if total is not None:
+            span = byte_range.range_for_length(int(total))
+            if span is None:
+                upstream.close()
+                return jsonify({"error": "Requested range not satisfiable"}), 416, {'Content-Range': f'bytes */{total}'}
+            start, stop = span
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{stop - 1}/{total}'
+            headers['Content-Length'] = str(stop - start)
+    
+    body = FileHelper.iter_body(upstream, start, stop)
+    if status == 200:
+        # Whole file: keep a copy while relaying it
+        body = file_cache.tee(filename, body, upstream.headers)
+    
+    return Response(
+        stream_with_context(body),
+        status=status,
+        headers=headers
+    )
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Counters and size of the local file cache"""
+    return jsonify(file_cache.stats()), 200
 
 
 @app.route('/health', methods=['GET'])
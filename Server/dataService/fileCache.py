@@ -0,0 +1,232 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+_BLOB_NAME = re.compile(r'^(?:[0-9a-f]{64}|\.partial-.*)$')
+_WORKER_DIR = re.compile(r'^worker-(\d+)$')
+
+
+class FileCache:
+    """
+    On-disk, content-addressed cache of files fetched from the saving server.
+
+    Blobs are stored under their sha256 digest, so files with identical content
+    share one copy on disk. An in-memory index maps file names to blobs together
+    with the upstream validators (ETag / Last-Modified). Entries younger than
+    ttl_seconds are served without contacting the saving server; older ones are
+    revalidated with a conditional request. The index is LRU ordered and the
+    least recently used entries are evicted once the blobs exceed max_bytes.
+
+    The index lives in memory, so blobs left over from a previous run are
+    removed when the cache starts. Without an explicit directory, each process
+    keeps its blobs in its own worker-<pid> subdirectory of FILE_CACHE_DIR, so
+    workers sharing that directory never remove each other's files; the
+    subdirectories of workers that are gone are removed as well.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, max_entry_bytes=None, ttl_seconds=None):
+        """
+        Args:
+            directory: Where blobs are stored (owned by this cache alone)
+            max_bytes: Total size of the cached blobs before LRU eviction
+            max_entry_bytes: Files larger than this are never cached
+            ttl_seconds: How long an entry is served without revalidation
+        """
+        if directory is None:
+            shared = os.getenv('FILE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'dataService-file-cache'))
+            FileCache._remove_dead_workers(shared)
+            directory = os.path.join(shared, f'worker-{os.getpid()}')
+        self.directory = directory
+        self.max_bytes = int(max_bytes if max_bytes is not None else os.getenv('FILE_CACHE_MAX_BYTES', 1024 ** 3))
+        self.max_entry_bytes = int(max_entry_bytes if max_entry_bytes is not None
+                                   else os.getenv('FILE_CACHE_MAX_ENTRY_BYTES', 100 * 1024 ** 2))
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv('FILE_CACHE_TTL', 60))
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # filename -> entry dict
+        self._blobs = {}  # digest -> {'size': int, 'refs': int}
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if _BLOB_NAME.match(name):
+                os.remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove_dead_workers(shared):
+        """Delete the subdirectories of worker processes that no longer run"""
+        if not os.path.isdir(shared):
+            return
+        for name in os.listdir(shared):
+            match = _WORKER_DIR.match(name)
+            if match is None or int(match.group(1)) == os.getpid():
+                continue
+            try:
+                os.kill(int(match.group(1)), 0)
+                continue
+            except ProcessLookupError:
+                pass
+            except PermissionError:
+                # Alive, owned by another user
+                continue
+            shutil.rmtree(os.path.join(shared, name), ignore_errors=True)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def lookup(self, filename):
+        """
+        Find the cached copy of a file
+
+        Returns:
+            dict: Entry with 'path', 'content_type', 'etag', 'last_modified', 'digest'
+                  and 'fresh' (False once it needs revalidation), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(filename)
+            fresh = time.monotonic() - entry['validated_at'] < self.ttl_seconds
+            if fresh:
+                self.hits += 1
+            return {**entry, 'path': self._blob_path(entry['digest']), 'fresh': fresh}
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers that revalidate a cached entry upstream"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, filename):
+        """The saving server confirmed the cached copy (304): serve it for another ttl"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None:
+                entry['validated_at'] = time.monotonic()
+                self.revalidations += 1
+
+    def discard(self, filename):
+        with self._lock:
+            self._remove(filename)
+
+    def clear(self):
+        with self._lock:
+            for filename in list(self._entries):
+                self._remove(filename)
+
+    def tee(self, filename, chunks, headers):
+        """
+        Pass a download through while writing it into the cache
+
+        The entry is only stored once the body was received completely; an aborted
+        or oversized transfer leaves the cache untouched.
+
+        Args:
+            filename: Name the file is cached under
+            chunks: Iterable of body chunks (closed when the generator is closed)
+            headers: Upstream response headers (Content-Type, ETag, Last-Modified, Content-Length)
+        """
+        expected = headers.get('Content-Length')
+        if expected is not None and int(expected) > self.max_entry_bytes:
+            yield from chunks
+            return
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.partial-')
+        temp = os.fdopen(fd, 'wb')
+        try:
+            for chunk in chunks:
+                if temp is not None:
+                    size += len(chunk)
+                    if size > self.max_entry_bytes:
+                        temp.close()
+                        temp = None
+                    else:
+                        digest.update(chunk)
+                        temp.write(chunk)
+                yield chunk
+
+            if temp is not None and (expected is None or int(expected) == size):
+                temp.close()
+                temp = None
+                self._commit(filename, temp_path, digest.hexdigest(), size, headers)
+                temp_path = None
+        finally:
+            if temp is not None:
+                temp.close()
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _commit(self, filename, temp_path, digest, size, headers):
+        with self._lock:
+            self._remove(filename)
+
+            blob = self._blobs.get(digest)
+            if blob is None:
+                os.replace(temp_path, self._blob_path(digest))
+                blob = self._blobs[digest] = {'size': size, 'refs': 0}
+                self._total_bytes += size
+            else:
+                # Same content is already cached under another name
+                os.remove(temp_path)
+            blob['refs'] += 1
+
+            self._entries[filename] = {
+                'digest': digest,
+                'size': size,
+                'content_type': headers.get('Content-Type', 'application/octet-stream'),
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'validated_at': time.monotonic()
+            }
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, filename):
+        """Drop an index entry and its blob once unreferenced (caller holds the lock)"""
+        entry = self._entries.pop(filename, None)
+        if entry is None:
+            return
+        blob = self._blobs[entry['digest']]
+        blob['refs'] -= 1
+        if blob['refs'] == 0:
+            del self._blobs[entry['digest']]
+            self._total_bytes -= blob['size']
+            try:
+                os.remove(self._blob_path(entry['digest']))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'blobs': len(self._blobs),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions
+            }
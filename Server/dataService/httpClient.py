@@ -0,0 +1,124 @@
+"""
+Pooled keep-alive HTTP client for service-to-service calls.
+
+Module-level requests.get/post open a new TCP (and TLS) connection per call.
+This module keeps one requests.Session per upstream (scheme://host:port), each
+with its own urllib3 connection pool, so consecutive calls to the same service
+reuse connections. Every call gets a default timeout unless one is passed.
+
+Each service ships its own copy of this file (services are built from their
+own directory); keep the copies identical.
+
+Environment:
+    HTTP_CLIENT_TIMEOUT      default timeout in seconds (10)
+    HTTP_POOL_CONNECTIONS    number of host pools per session (10)
+    HTTP_POOL_MAXSIZE        keep-alive connections kept per upstream (20)
+    HTTP_STREAM_CHUNK_SIZE   bytes moved per read when streaming bodies (65536)
+"""
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_CLIENT_TIMEOUT', 10))
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 20))
+STREAM_CHUNK_SIZE = int(os.getenv('HTTP_STREAM_CHUNK_SIZE', 64 * 1024))
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _upstream_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the shared keep-alive session for the upstream serving this URL"""
+    key = _upstream_key(url)
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+        return session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Same signature as requests.request, routed through the upstream's pooled session"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request('PUT', url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request('DELETE', url, **kwargs)
+
+
+def close_all() -> None:
+    """Close every pooled connection (used on shutdown)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+class StreamBody:
+    """
+    Request body that relays a readable stream (e.g. Flask's request.stream) upstream.
+
+    The stream is read one chunk at a time as the upstream socket accepts data, so a
+    transfer holds a single chunk in memory and a slow upstream slows the reader down.
+    With a known length the body is sent with Content-Length, otherwise chunked.
+
+    Args:
+        stream: Object with read(size)
+        length: Number of bytes the stream will yield, None if unknown
+        prefix: Bytes sent before the stream (e.g. an extra multipart field)
+    """
+
+    def __init__(self, stream, length: Optional[int] = None, prefix: bytes = b'',
+                 chunk_size: int = STREAM_CHUNK_SIZE):
+        self._stream = stream
+        self._prefix = prefix
+        self.chunk_size = chunk_size
+        # requests looks for .len to choose between Content-Length and chunked
+        self.len = None if length is None else len(prefix) + int(length)
+
+    def read(self, size: int = -1) -> bytes:
+        # Never read the whole stream at once, whatever the caller asks for
+        if size is None or size < 0:
+            size = self.chunk_size
+        if self._prefix:
+            chunk, self._prefix = self._prefix[:size], self._prefix[size:]
+            return chunk
+        return self._stream.read(size)
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -1,7 +1,13 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Tuple
 from meeting import Meeting
-import requests
+from ttlCache import TTLCache
+from logWriter import LogWriter
+import httpClient
 import os
+import json
+import base64
+import bisect
+import atexit
 from dotenv import load_dotenv
 import logging
 
@@ -19,8 +25,66 @@ class MeetHelper:
     SAVING_SERVER = os.getenv("SAVING_SERVER")
     BASE_URL = f"{SAVING_SERVER}"
     
-    # Keep local cache of meetings for quick access (optional)
-    __meetings_cache: Dict[str, Meeting] = {}
+    # Local cache of meetings for the hot /join-meet and /room paths: bounded LRU with
+    # a per-entry TTL, refreshed from the SAVING_SERVER response on every mutation
+    __meetings_cache = TTLCache(
+        maxsize=os.getenv("MEETING_CACHE_SIZE", 512),
+        ttl_seconds=os.getenv("MEETING_CACHE_TTL", 60),
+        name="meetings"
+    )
+    
+    # Sorted /meetings listings per filter, so the following pages are cut without
+    # refetching the whole history; dropped on every mutation
+    __listings_cache = TTLCache(
+        maxsize=256,
+        ttl_seconds=os.getenv("MEETING_LIST_CACHE_TTL", 15),
+        name="meeting_listings"
+    )
+    
+    # Join/leave/start/end entries are written in the background, batched per meeting
+    __log_writer = LogWriter(lambda meeting_id, log_entry: MeetHelper._writeLogEntry(meeting_id, log_entry))
+    atexit.register(__log_writer.close)
+    
+    # Upper bound of one incremental log read
+    LOG_READ_MAX_BYTES = int(os.getenv("MEETING_LOG_READ_MAX_BYTES", 1024 * 1024))
+    
+    LIST_DEFAULT_LIMIT = 50
+    LIST_MAX_LIMIT = 200
+    LIST_SORT_FIELDS = ('created_at', 'started_at', 'ended_at', 'title')
+    # Attributes of a meeting in list responses
+    LIST_FIELDS = ('id', 'meeting_id', 'title', 'invitation_link', 'created_by',
+                   'created_at', 'is_active', 'has_password')
+    # Cursor prefixes: paged by SAVING_SERVER (its opaque cursor follows) or locally
+    UPSTREAM_CURSOR = 'u.'
+    LOCAL_CURSOR = 'l.'
+    
+    @staticmethod
+    def _cacheFromResponse(meeting_id: str, response) -> None:
+        """
+        Write a mutation's result through to the cache
+        
+        Args:
+            meeting_id: UUID of the mutated meeting
+            response: SAVING_SERVER response carrying the updated meeting
+        """
+        try:
+            data = response.json()
+            if isinstance(data, dict) and isinstance(data.get('data'), dict):
+                data = data['data']
+            if isinstance(data, dict) and data.get('meeting_id') == meeting_id:
+                MeetHelper.__meetings_cache.set(meeting_id, Meeting.from_api_response(data))
+                MeetHelper.__listings_cache.clear()
+                return
+        except ValueError:
+            pass
+        # No meeting in the response: drop the entry so the next read refetches it
+        MeetHelper.__meetings_cache.delete(meeting_id)
+        MeetHelper.__listings_cache.clear()
+    
+    @staticmethod
+    def getCacheStats() -> dict:
+        """Hit/miss/eviction counters of the meetings cache"""
+        return MeetHelper.__meetings_cache.stats()
     
     @staticmethod
     def createMeeting(meeting: Meeting) -> Optional[Meeting]:
@@ -38,7 +102,7 @@ class MeetHelper:
             data = meeting.to_dict()
             
             # POST to SAVING_SERVER
-            response = requests.post(
+            response = httpClient.post(
                 f"{MeetHelper.BASE_URL}/meetings/",
                 json=data,
                 headers=MeetHelper.HEADERS
@@ -50,7 +114,8 @@ class MeetHelper:
                 meeting = Meeting.from_api_response(response_data)
                 
                 # Cache the meeting
-                MeetHelper.__meetings_cache[meeting.getID()] = meeting
+                MeetHelper.__meetings_cache.set(meeting.getID(), meeting)
+                MeetHelper.__listings_cache.clear()
                 
                 logger.info(f"Meeting created successfully: {meeting.getID()}")
                 return meeting
@@ -74,18 +139,19 @@ class MeetHelper:
             Meeting object if found, None otherwise
         """
         # Check cache first
-        if meeting_id in MeetHelper.__meetings_cache:
-            return MeetHelper.__meetings_cache[meeting_id]
+        meeting = MeetHelper.__meetings_cache.get(meeting_id)
+        if meeting is not None:
+            return meeting
         
         try:
-            response = requests.get(
+            response = httpClient.get(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}",
                 headers=MeetHelper.HEADERS
             )
             print("response from saving : ",response.json())
             if response.status_code == 200:
                 meeting = Meeting.from_api_response(response.json())
-                MeetHelper.__meetings_cache[meeting_id] = meeting
+                MeetHelper.__meetings_cache.set(meeting_id, meeting)
                 return meeting
             else:
                 logger.error(f"Meeting not found: {meeting_id}")
@@ -114,7 +180,7 @@ class MeetHelper:
             if is_active is not None:
                 params['is_active'] = str(is_active).lower()
             
-            response = requests.get(
+            response = httpClient.get(
                 f"{MeetHelper.BASE_URL}/meetings/",
                 headers=MeetHelper.HEADERS,
                 params=params
@@ -126,7 +192,7 @@ class MeetHelper:
                 
                 # Update cache
                 for meeting in meetings:
-                    MeetHelper.__meetings_cache[meeting.getID()] = meeting
+                    MeetHelper.__meetings_cache.set(meeting.getID(), meeting)
                 
                 return meetings
             else:
@@ -137,6 +203,152 @@ class MeetHelper:
             logger.error(f"Error getting meetings: {str(e)}")
             return []
     
+    @staticmethod
+    def listMeetings(user_email: Optional[str] = None, is_active: Optional[bool] = None,
+                     limit: Optional[int] = None, cursor: Optional[str] = None,
+                     sort: str = '-created_at', fields: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        Get one page of meetings
+        
+        Paging, sort and fields are passed on to SAVING_SERVER. When it answers without
+        a next_cursor it returned the whole filtered list; that list is then sorted,
+        cached per filters, sort and projection for MEETING_LIST_CACHE_TTL seconds and
+        paged here. Cursors are tagged
+        with the side that pages: SAVING_SERVER cursors are passed back to it as they
+        are, local cursors are cut from the cached listing.
+        
+        Args:
+            user_email: Filter by creator or invited user
+            is_active: Filter by active status
+            limit: Page size (default LIST_DEFAULT_LIMIT, at most LIST_MAX_LIMIT)
+            cursor: next_cursor of the previous page
+            sort: One of LIST_SORT_FIELDS, prefixed with '-' for descending order
+            fields: Attributes to return among LIST_FIELDS, all if None
+            
+        Returns:
+            dict with 'data' (list of meeting dicts) and 'next_cursor' (None on the last
+            page), or None if SAVING_SERVER could not be reached
+            
+        Raises:
+            ValueError: On an invalid limit, cursor, sort or field
+        """
+        limit = min(max(int(limit or MeetHelper.LIST_DEFAULT_LIMIT), 1), MeetHelper.LIST_MAX_LIMIT)
+        sort_field = sort.lstrip('-')
+        if sort_field not in MeetHelper.LIST_SORT_FIELDS:
+            raise ValueError(f"cannot sort by '{sort_field}'")
+        descending = sort.startswith('-')
+        fields = list(fields or MeetHelper.LIST_FIELDS)
+        unknown = [name for name in fields if name not in MeetHelper.LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(unknown)}")
+        upstream_cursor, after = MeetHelper._decodeCursor(cursor, sort) if cursor else (None, None)
+        
+        filters = {}
+        if user_email:
+            filters['user_email'] = user_email
+        if is_active is not None:
+            filters['is_active'] = str(is_active).lower()
+        # The sort field and the UUID tie breaker are always fetched: a listing SAVING_SERVER
+        # does not page is sorted and cut into pages on them here
+        upstream_fields = ['password' if name == 'has_password' else name for name in fields]
+        upstream_fields += [name for name in (sort_field, 'meeting_id') if name not in upstream_fields]
+        listing_key = (tuple(sorted(filters.items())), sort, tuple(sorted(upstream_fields)))
+        
+        # A SAVING_SERVER cursor continues its own paging, never the local listing
+        listing = None if upstream_cursor else MeetHelper.__listings_cache.get(listing_key)
+        if listing is None:
+            try:
+                params = {**filters, 'limit': limit, 'sort': sort, 'fields': ','.join(upstream_fields)}
+                if upstream_cursor:
+                    params['cursor'] = upstream_cursor
+                response = httpClient.get(
+                    f"{MeetHelper.BASE_URL}/meetings/",
+                    headers=MeetHelper.HEADERS,
+                    params=params
+                )
+                if response.status_code != 200:
+                    logger.error(f"Failed to list meetings: {response.status_code}")
+                    return None
+                payload = response.json()
+            except Exception as e:
+                logger.error(f"Error listing meetings: {str(e)}")
+                return None
+            
+            meetings_data = payload.get('data', []) if isinstance(payload, dict) else payload
+            if upstream_cursor or (isinstance(payload, dict) and 'next_cursor' in payload):
+                # SAVING_SERVER paged the query itself
+                next_cursor = payload.get('next_cursor') if isinstance(payload, dict) else None
+                return {
+                    'data': [MeetHelper._listItem(m, fields) for m in meetings_data],
+                    'next_cursor': MeetHelper.UPSTREAM_CURSOR + str(next_cursor) if next_cursor else None
+                }
+            
+            meetings_data = sorted(meetings_data, key=lambda m: MeetHelper._sortKey(m, sort_field))
+            listing = (meetings_data, [MeetHelper._sortKey(m, sort_field) for m in meetings_data])
+            MeetHelper.__listings_cache.set(listing_key, listing)
+        
+        # The listing is kept in ascending order; descending pages walk it backwards
+        meetings_data, keys = listing
+        next_cursor = None
+        if descending:
+            end = bisect.bisect_left(keys, after) if after is not None else len(keys)
+            start = max(end - limit, 0)
+            page = meetings_data[start:end][::-1]
+            if start > 0:
+                next_cursor = MeetHelper._encodeCursor(keys[start], sort)
+        else:
+            start = bisect.bisect_right(keys, after) if after is not None else 0
+            page = meetings_data[start:start + limit]
+            if start + limit < len(keys):
+                next_cursor = MeetHelper._encodeCursor(keys[start + limit - 1], sort)
+        
+        return {
+            'data': [MeetHelper._listItem(m, fields) for m in page],
+            'next_cursor': next_cursor
+        }
+    
+    @staticmethod
+    def _listItem(data: dict, fields: List[str]) -> dict:
+        """Project a SAVING_SERVER meeting onto the requested list attributes"""
+        item = {}
+        for name in fields:
+            if name == 'has_password':
+                item[name] = bool(data.get('password')) or bool(data.get('has_password'))
+            else:
+                item[name] = data.get(name)
+        return item
+    
+    @staticmethod
+    def _sortKey(data: dict, sort_field: str) -> Tuple[str, str]:
+        """Sort value (missing values first) with the meeting UUID as tie breaker"""
+        value = data.get(sort_field)
+        return ('' if value is None else str(value), str(data.get('meeting_id', '')))
+    
+    @staticmethod
+    def _encodeCursor(key: Tuple[str, str], sort: str) -> str:
+        """Cursor into the local listing: the sort order and the last key of the page"""
+        return MeetHelper.LOCAL_CURSOR + base64.urlsafe_b64encode(
+            json.dumps([sort, *key]).encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def _decodeCursor(cursor: str, sort: str) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+        """
+        Returns:
+            (SAVING_SERVER cursor, None) or (None, last key of the previous local page)
+        """
+        if cursor.startswith(MeetHelper.UPSTREAM_CURSOR) and len(cursor) > len(MeetHelper.UPSTREAM_CURSOR):
+            return cursor[len(MeetHelper.UPSTREAM_CURSOR):], None
+        if not cursor.startswith(MeetHelper.LOCAL_CURSOR):
+            raise ValueError("malformed cursor")
+        try:
+            encoded = cursor[len(MeetHelper.LOCAL_CURSOR):]
+            cursor_sort, value, meeting_id = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except Exception:
+            raise ValueError("malformed cursor")
+        if cursor_sort != sort:
+            raise ValueError("cursor was issued for another sort order")
+        return None, (str(value), str(meeting_id))
+    
     @staticmethod
     def updateMeeting(meeting_id: str, updates: dict) -> bool:
         """
@@ -150,16 +362,14 @@ class MeetHelper:
             True if successful, False otherwise
         """
         try:
-            response = requests.put(
+            response = httpClient.put(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}",
                 json=updates,
                 headers=MeetHelper.HEADERS
             )
             
             if response.status_code == 200:
-                # Invalidate cache
-                if meeting_id in MeetHelper.__meetings_cache:
-                    del MeetHelper.__meetings_cache[meeting_id]
+                MeetHelper._cacheFromResponse(meeting_id, response)
                 logger.info(f"Meeting updated: {meeting_id}")
                 return True
             else:
@@ -182,15 +392,13 @@ class MeetHelper:
             True if successful, False otherwise
         """
         try:
-            response = requests.post(
+            response = httpClient.post(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}/start",
                 headers=MeetHelper.HEADERS
             )
             
             if response.status_code == 200:
-                # Invalidate cache
-                if meeting_id in MeetHelper.__meetings_cache:
-                    del MeetHelper.__meetings_cache[meeting_id]
+                MeetHelper._cacheFromResponse(meeting_id, response)
                 logger.info(f"Meeting started: {meeting_id}")
                 return True
             else:
@@ -213,15 +421,13 @@ class MeetHelper:
             True if successful, False otherwise
         """
         try:
-            response = requests.post(
+            response = httpClient.post(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}/end",
                 headers=MeetHelper.HEADERS
             )
             
             if response.status_code == 200:
-                # Invalidate cache
-                if meeting_id in MeetHelper.__meetings_cache:
-                    del MeetHelper.__meetings_cache[meeting_id]
+                MeetHelper._cacheFromResponse(meeting_id, response)
                 logger.info(f"Meeting ended: {meeting_id}")
                 return True
             else:
@@ -245,7 +451,7 @@ class MeetHelper:
             True if successful, False otherwise
         """
         try:
-            response = requests.post(
+            response = httpClient.post(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}/log",
                 json={"log_entry": log_entry},
                 headers=MeetHelper.HEADERS
@@ -261,6 +467,51 @@ class MeetHelper:
             logger.error(f"Error adding log entry: {str(e)}")
             return False
     
+    @staticmethod
+    def _writeLogEntry(meeting_id: str, log_entry: str) -> Optional[bool]:
+        """
+        addLogEntry for the background writer
+        
+        Returns:
+            True if stored, False on a failure worth retrying, None if SAVING_SERVER
+            rejected the entry (4xx other than 408/429, e.g. a deleted meeting)
+        """
+        try:
+            response = httpClient.post(
+                f"{MeetHelper.BASE_URL}/meetings/{meeting_id}/log",
+                json={"log_entry": log_entry},
+                headers=MeetHelper.HEADERS
+            )
+        except Exception as e:
+            logger.error(f"Error adding log entry: {str(e)}")
+            return False
+        
+        if response.status_code == 200:
+            return True
+        logger.error(f"Failed to add log entry: {response.status_code}")
+        if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+            return None
+        return False
+    
+    @staticmethod
+    def queueLogEntry(meeting_id: str, log_entry: str) -> bool:
+        """
+        Queue a log entry for the background writer, without waiting on SAVING_SERVER
+        
+        Args:
+            meeting_id: UUID of the meeting
+            log_entry: Log entry text
+            
+        Returns:
+            True if queued, False if the log buffer is full and the entry was dropped
+        """
+        return MeetHelper.__log_writer.enqueue(meeting_id, log_entry)
+    
+    @staticmethod
+    def getLogWriterStats() -> dict:
+        """Pending/written/dropped counters of the background log writer"""
+        return MeetHelper.__log_writer.stats()
+    
     @staticmethod
     def getMeetingLog(meeting_id: str) -> Optional[str]:
         """
@@ -273,7 +524,7 @@ class MeetHelper:
             Log content as string if successful, None otherwise
         """
         try:
-            response = requests.get(
+            response = httpClient.get(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}/log",
                 headers=MeetHelper.HEADERS
             )
@@ -288,6 +539,123 @@ class MeetHelper:
             logger.error(f"Error getting log: {str(e)}")
             return None
     
+    @staticmethod
+    def readMeetingLog(meeting_id: str, offset: int = 0, max_bytes: Optional[int] = None) -> Optional[dict]:
+        """
+        Read the part of a meeting log written after a byte offset
+        
+        The log file is requested with a Range header, so a tail read only transfers
+        the new bytes; if SAVING_SERVER ignores the range, the bytes before offset
+        are skipped while streaming. A trailing incomplete UTF-8 character is left
+        for the next read; an offset inside a character starts at the next one.
+        
+        Args:
+            meeting_id: UUID of the meeting
+            offset: Byte offset to read from (next_offset of the previous read)
+            max_bytes: Most bytes to return (default and upper bound LOG_READ_MAX_BYTES)
+            
+        Returns:
+            dict with 'log_content', 'offset' (where the content starts) and 'next_offset',
+            or None on failure
+        """
+        offset = max(int(offset), 0)
+        # At least one whole UTF-8 character (4 bytes), so a read always makes progress
+        max_bytes = min(max(int(max_bytes or MeetHelper.LOG_READ_MAX_BYTES), 4), MeetHelper.LOG_READ_MAX_BYTES)
+        try:
+            response = MeetHelper.openMeetingLog(
+                meeting_id,
+                {'Range': f"bytes={offset}-{offset + max_bytes - 1}"}
+            )
+            if response is None:
+                return None
+            
+            try:
+                if response.status_code == 416:
+                    # Nothing past offset yet
+                    data = b''
+                elif response.status_code == 206:
+                    data = MeetHelper._readBody(response, 0, max_bytes)
+                elif response.status_code == 200:
+                    data = MeetHelper._readBody(response, offset, offset + max_bytes)
+                else:
+                    logger.error(f"Failed to read log: {response.status_code}")
+                    return None
+            finally:
+                response.close()
+            
+            # Continuation bytes of a character that started before offset
+            skipped = MeetHelper._utf8Continuation(data)
+            offset += skipped
+            data = data[skipped:]
+            data = data[:MeetHelper._utf8Boundary(data)]
+            return {
+                'log_content': data.decode('utf-8', errors='replace'),
+                'offset': offset,
+                'next_offset': offset + len(data)
+            }
+        
+        except Exception as e:
+            logger.error(f"Error reading log: {str(e)}")
+            return None
+    
+    @staticmethod
+    def openMeetingLog(meeting_id: str, headers: Optional[dict] = None):
+        """
+        Open the meeting log file download as a stream
+        
+        Args:
+            meeting_id: UUID of the meeting
+            headers: Extra request headers (e.g. Range)
+            
+        Returns:
+            Streamed response (the caller closes it), or None if unreachable
+        """
+        try:
+            return httpClient.get(
+                f"{MeetHelper.BASE_URL}/meetings/{meeting_id}/log",
+                headers={**MeetHelper.HEADERS, 'Accept-Encoding': 'identity', **(headers or {})},
+                params={'download': 'true'},
+                stream=True
+            )
+        except Exception as e:
+            logger.error(f"Error opening log: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _readBody(response, start: int, stop: int) -> bytes:
+        """Bytes [start, stop) of a streamed body, without reading past stop"""
+        parts = []
+        position = 0
+        for chunk in response.iter_content(httpClient.STREAM_CHUNK_SIZE):
+            end = position + len(chunk)
+            if end > start:
+                parts.append(chunk[max(0, start - position):stop - position])
+            position = end
+            if position >= stop:
+                break
+        return b''.join(parts)
+    
+    @staticmethod
+    def _utf8Continuation(data: bytes) -> int:
+        """Number of leading UTF-8 continuation bytes (10xxxxxx), at most 3"""
+        count = 0
+        while count < min(3, len(data)) and 0x80 <= data[count] < 0xC0:
+            count += 1
+        return count
+    
+    @staticmethod
+    def _utf8Boundary(data: bytes) -> int:
+        """Length of data without a trailing, incomplete UTF-8 sequence"""
+        for back in range(1, min(4, len(data)) + 1):
+            byte = data[-back]
+            if byte < 0x80:
+                return len(data)
+            if byte >= 0xC0:
+                # Lead byte: 110xxxxx, 1110xxxx or 11110xxx start 2, 3 or 4 byte sequences
+                needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+                return len(data) if back >= needed else len(data) - back
+        return len(data)
+    
     @staticmethod
     def deleteMeeting(meeting_id: str) -> bool:
         """
@@ -300,15 +668,15 @@ class MeetHelper:
             True if successful, False otherwise
         """
         try:
-            response = requests.delete(
+            response = httpClient.delete(
                 f"{MeetHelper.BASE_URL}/meetings/{meeting_id}",
                 headers=MeetHelper.HEADERS
             )
             
             if response.status_code == 200:
                 # Remove from cache
-                if meeting_id in MeetHelper.__meetings_cache:
-                    del MeetHelper.__meetings_cache[meeting_id]
+                MeetHelper.__meetings_cache.delete(meeting_id)
+                MeetHelper.__listings_cache.clear()
                 logger.info(f"Meeting deleted: {meeting_id}")
                 return True
             else:
@@ -347,11 +715,11 @@ class MeetHelper:
         if not meeting:
             return False
         
-        invited = meeting.getInvitedEmployeesList()
-        if user_email in invited:
+        if user_email in meeting.getInvitedEmployeesList():
             return True  # Already invited
         
-        invited.append(user_email)
+        # Copy: the cached meeting must only change once SAVING_SERVER accepted the update
+        invited = meeting.getInvitedEmployeesList() + [user_email]
         return MeetHelper.updateMeeting(meeting_id, {"invited_employees": invited})
     
     @staticmethod
@@ -1,9 +1,19 @@
+# Patch sockets, ssl, time and threading before anything else imports them, so
+# MeetHelper's requests calls and the log writer thread yield to the eventlet hub
+# instead of stalling every socket handler while the SAVING_SERVER answers
+import eventlet
+eventlet.monkey_patch()
+
 from meeting import Meeting
-from flask_socketio import SocketIO, join_room, leave_room, emit
+from flask_socketio import SocketIO
 from flask_cors import CORS
-from flask import Flask, jsonify, render_template, session, send_from_directory, request, redirect
+from flask import Flask, jsonify, render_template, session, send_from_directory, request, redirect, Response, stream_with_context
 from dotenv import load_dotenv
 from Helper import MeetHelper
+from roomStore import create_room_store
+from iceBatcher import IceBatcher
+import httpClient
+import hmac
 import logging
 import os
 
@@ -12,14 +22,39 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure Socket.IO with explicit CORS settings
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
-
-# Keep track of users in rooms
-rooms = {}
+# Configure Socket.IO with explicit CORS settings. With several replicas,
+# SOCKETIO_MESSAGE_QUEUE (e.g. redis://redis:6379/0) carries every emit to the
+# replica holding the target socket; unset, emits are delivered locally.
+# SOCKETIO_SERIALIZER=msgpack sends binary msgpack frames (the gateway's
+# MEET_BACKEND_SERIALIZER must match; browsers need socket.io-msgpack-parser).
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode='eventlet',
+    message_queue=os.getenv("SOCKETIO_MESSAGE_QUEUE") or None,
+    channel=os.getenv("SOCKETIO_CHANNEL", "meeting-signaling"),
+    serializer=os.getenv("SOCKETIO_SERIALIZER", "default")
+)
+
+# Keep track of users in rooms and of relayed participants' routes: in process,
+# or shared between replicas when ROOM_STORE_URL points to Redis
+room_store = create_room_store()
 
 signalingServer = os.getenv("SIGNALING_SERVER")
 
+# Gateway relay sockets authenticate with this shared secret (the gateway's
+# MEET_RELAY_SECRET); unset, too short or a placeholder, no socket may relay participants
+RELAY_SECRET_MIN_LENGTH = 16
+RELAY_SECRET = os.getenv("RELAY_SECRET", "")
+if len(RELAY_SECRET) < RELAY_SECRET_MIN_LENGTH or RELAY_SECRET.lower().startswith("change-me"):
+    if RELAY_SECRET:
+        logger.warning("RELAY_SECRET is too short or a placeholder: ignored")
+    logger.warning("RELAY_SECRET is not set: gateway relay sockets will be refused")
+    RELAY_SECRET = ""
+
+# Headers of the SAVING_SERVER log download passed on to the client
+LOG_DOWNLOAD_HEADERS = ('Content-Type', 'Content-Length', 'Content-Disposition', 'Last-Modified', 'ETag')
+
 @app.route("/create-meet", methods=["POST"])
 def create_meet():
     """
@@ -101,7 +136,7 @@ def join_meet():
 
         # Add user to meeting and log the event
         MeetHelper.addUserToMeeting(meet_id, user_email)
-        MeetHelper.addLogEntry(meet_id, f"User {user_email} joined the meeting")
+        MeetHelper.queueLogEntry(meet_id, f"User {user_email} joined the meeting")
         
         return jsonify({
             "success": True,
@@ -136,33 +171,35 @@ def room(meet_id, user_email):
 @app.route("/meetings", methods=["GET"])
 def get_all_meetings():
     """
-    Get all meetings with optional filters
-    Query params: user_email, is_active
+    Get one page of meetings with optional filters
+    Query params: user_email, is_active, limit, cursor, sort (e.g. -created_at), fields
     """
     try:
         user_email = request.args.get('user_email')
         is_active = request.args.get('is_active')
+        fields = request.args.get('fields')
         
         # Convert is_active to boolean if provided
         is_active_bool = None
         if is_active:
             is_active_bool = is_active.lower() == 'true'
         
-        meetings = MeetHelper.getAllMeetings(user_email, is_active_bool)
+        try:
+            result = MeetHelper.listMeetings(
+                user_email,
+                is_active_bool,
+                limit=request.args.get('limit'),
+                cursor=request.args.get('cursor'),
+                sort=request.args.get('sort', '-created_at'),
+                fields=[name.strip() for name in fields.split(',') if name.strip()] if fields else None
+            )
+        except ValueError as e:
+            return jsonify({"error": f"Invalid listing parameters: {e}"}), 400
         
-        # Format response
-        meetings_data = [{
-            "id": m.getDatabaseID(),
-            "meeting_id": m.getID(),
-            "title": m.getTitle(),
-            "invitation_link": m.getInvitationLink(),
-            "created_by": m.getCreatedBy(),
-            "created_at": m.getCreatedAt(),
-            "is_active": m.getIsActive(),
-            "has_password": bool(m.getPassword())
-        } for m in meetings]
+        if result is None:
+            return jsonify({"error": "Failed to get meetings"}), 502
         
-        return jsonify({"data": meetings_data}), 200
+        return jsonify(result), 200
         
     except Exception as e:
         logger.error(f"Error getting meetings: {str(e)}")
@@ -257,7 +294,7 @@ def start_meeting(meeting_id):
         success = MeetHelper.startMeeting(meeting_id)
         
         if success:
-            MeetHelper.addLogEntry(meeting_id, "Meeting started")
+            MeetHelper.queueLogEntry(meeting_id, "Meeting started")
             return jsonify({
                 "success": True,
                 "meeting_id": meeting_id,
@@ -280,7 +317,7 @@ def end_meeting(meeting_id):
         success = MeetHelper.endMeeting(meeting_id)
         
         if success:
-            MeetHelper.addLogEntry(meeting_id, "Meeting ended")
+            MeetHelper.queueLogEntry(meeting_id, "Meeting ended")
             return jsonify({
                 "success": True,
                 "meeting_id": meeting_id,
@@ -325,8 +362,43 @@ def add_meeting_log(meeting_id):
 def get_meeting_log(meeting_id):
     """
     Get meeting log content
+    Query params:
+        offset: Only return what was written after this byte offset (use next_offset
+                of the previous read to tail a live log)
+        max_bytes: Most bytes returned by an offset read
+        download: 'true' streams the log file instead
     """
     try:
+        if request.args.get('download', '').lower() == 'true':
+            upstream = MeetHelper.openMeetingLog(meeting_id)
+            if upstream is None:
+                return jsonify({"error": "Failed to get log"}), 500
+            if upstream.status_code != 200:
+                upstream.close()
+                return jsonify({"error": "Failed to get log"}), upstream.status_code
+            
+            def relay():
+                try:
+                    for chunk in upstream.iter_content(httpClient.STREAM_CHUNK_SIZE):
+                        yield chunk
+                finally:
+                    upstream.close()
+            
+            headers = {name: upstream.headers[name] for name in LOG_DOWNLOAD_HEADERS if name in upstream.headers}
+            return Response(stream_with_context(relay()), status=200, headers=headers)
+        
+        if 'offset' in request.args:
+            try:
+                offset = int(request.args['offset'])
+                max_bytes = int(request.args['max_bytes']) if request.args.get('max_bytes') else None
+            except ValueError:
+                return jsonify({"error": "offset and max_bytes must be integers"}), 400
+            
+            result = MeetHelper.readMeetingLog(meeting_id, offset, max_bytes)
+            if result is None:
+                return jsonify({"error": "Failed to get log"}), 500
+            return jsonify({"meeting_id": meeting_id, **result}), 200
+        
         log_content = MeetHelper.getMeetingLog(meeting_id)
         
         if log_content is not None:
@@ -342,134 +414,299 @@ def get_meeting_log(meeting_id):
         return jsonify({"error": "Failed to get log"}), 500
 
 
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """
+    Hit/miss/eviction counters of the local meetings cache
+    """
+    return jsonify(MeetHelper.getCacheStats()), 200
+
+
+@app.route("/logs/stats", methods=["GET"])
+def log_writer_stats():
+    """
+    Pending/written/dropped counters of the background meeting log writer
+    """
+    return jsonify(MeetHelper.getLogWriterStats()), 200
+
+
 # =================== SOCKETIO EVENTS ===================
+#
+# Participants either connect directly (peer id = their sid) or arrive through
+# a gateway relay socket that multiplexes many of them ('relay' envelopes
+# {clientSid, event, args}; peer id = the gateway's client sid). Handlers below
+# work on peer ids and deliver through send_to_peer, which handles both.
 
-@socketio.on('connect')
-def handle_connect():
-    user_email = request.args.get("user_email")
-    logger.info(f'Client connected: {request.sid} user_email: {user_email}')
+# The room store also maps peer_id -> sid of the gateway relay socket carrying
+# that participant; room members carry it in their info ('relay').
 
-@socketio.on('disconnect')
-def handle_disconnect():
-    logger.info(f'Client disconnected: {request.sid}')
+# Sids of the authenticated gateway relay sockets connected to this replica;
+# 'relay' envelopes from any other socket are ignored
+relay_sockets = set()
 
-    # Find and remove user from any rooms they were in
-    for room_id in list(rooms.keys()):
-        if request.sid in rooms[room_id]:
-            rooms[room_id].pop(request.sid)
-            emit('peer-disconnected', {'peerId': request.sid}, room=room_id, skip_sid=request.sid)
-            
-            if len(rooms[room_id]) == 0:
-                del rooms[room_id]
 
-@socketio.on('join')
-def handle_join(data):
+def send_to_peer(peer_id, event, payload, relay_sid=None):
+    """
+    Deliver an event to one participant, directly or through its relay socket
+
+    relay_sid: the peer's route if already known ('' for a direct socket), looked up if None
+    """
+    if relay_sid is None:
+        relay_sid = room_store.relay_of(peer_id)
+    if relay_sid:
+        socketio.emit('relay', {'clientSid': peer_id, 'event': event, 'args': [payload]}, to=relay_sid)
+    else:
+        socketio.emit(event, payload, to=peer_id)
+
+
+def send_to_room(room_id, event, payload, skip_peer=None, members=None):
+    """Deliver an event to every participant of a room"""
+    if members is None:
+        members = room_store.members(room_id)
+    for peer_id, info in members.items():
+        if peer_id != skip_peer:
+            send_to_peer(peer_id, event, payload, relay_sid=info.get('relay') or '')
+
+
+def join_peer(peer_id, data):
     room_id = data['room']
-    user_id = request.sid
     user_email = data.get('user_email')
 
-    logger.info(f'User {user_id} (email: {user_email}) joining room: {room_id}')
+    logger.info(f'User {peer_id} (email: {user_email}) joining room: {room_id}')
 
-    # Create room if it doesn't exist
-    if room_id not in rooms:
-        rooms[room_id] = {}
-
-    # Add user to room
-    join_room(room_id)
-    rooms[room_id][user_id] = {'user_email': user_email, 'joined': True}
+    # Add user to room (created if it doesn't exist)
+    relay_sid = room_store.relay_of(peer_id)
+    members = room_store.join(room_id, peer_id, {
+        'user_email': user_email,
+        'joined': True,
+        'relay': relay_sid,
+        # Opted in to 'ice-candidates' batches instead of one 'ice-candidate' each
+        'ice_batch': bool(data.get('ice_batch'))
+    })
 
     # Get peer info with emails (excluding current user)
-    peer_info = [{'id': peer_id, 'user_email': peer_data.get('user_email')} 
-                 for peer_id, peer_data in rooms[room_id].items() if peer_id != user_id]
+    peer_info = [{'id': other_id, 'user_email': peer_data.get('user_email')}
+                 for other_id, peer_data in members.items() if other_id != peer_id]
 
     # Get list of peer IDs (excluding current user)
-    peer_ids = [peer_id for peer_id in rooms[room_id].keys() if peer_id != user_id]
+    peer_ids = [other_id for other_id in members.keys() if other_id != peer_id]
 
     # Confirm room joined
-    emit('room-joined', {
+    send_to_peer(peer_id, 'room-joined', {
         'room': room_id,
         'peers': peer_ids,
         'peerInfo': peer_info
-    })
+    }, relay_sid=relay_sid or '')
 
     # Notify others that a new peer joined
-    emit('new-peer', {
-        'peerId': user_id,
+    send_to_room(room_id, 'new-peer', {
+        'peerId': peer_id,
         'user_email': user_email
-    }, room=room_id, skip_sid=user_id)
-    
+    }, skip_peer=peer_id, members=members)
+
     # Log the join event
     if user_email:
-        MeetHelper.addLogEntry(room_id, f"User {user_email} joined the room")
+        MeetHelper.queueLogEntry(room_id, f"User {user_email} joined the room")
 
-@socketio.on('leave')
-def handle_leave(data):
+
+def leave_peer(peer_id, data):
     room_id = data['room']
-    user_id = request.sid
 
-    logger.info(f'User {user_id} leaving room: {room_id}')
+    logger.info(f'User {peer_id} leaving room: {room_id}')
 
-    # Remove user from room
-    if room_id in rooms and user_id in rooms[room_id]:
-        user_email = rooms[room_id][user_id].get('user_email')
-        
-        leave_room(room_id)
-        del rooms[room_id][user_id]
+    # Remove user from room (deleted once empty)
+    info = room_store.leave(room_id, peer_id)
+    if info is not None:
+        user_email = info.get('user_email')
 
         # Notify others that peer left
-        emit('peer-disconnected', {'peerId': user_id}, room=room_id)
+        send_to_room(room_id, 'peer-disconnected', {'peerId': peer_id})
 
         # Log the leave event
         if user_email:
-            MeetHelper.addLogEntry(room_id, f"User {user_email} left the room")
+            MeetHelper.queueLogEntry(room_id, f"User {user_email} left the room")
 
-        # Delete room if empty
-        if len(rooms[room_id]) == 0:
-            del rooms[room_id]
 
-@socketio.on('offer')
-def handle_offer(data):
-    room_id = data['room']
+def disconnect_peer(peer_id):
+    ice_batcher.discard_sender(peer_id)
+
+    # Remove user from the rooms they were in (the store indexes them by peer)
+    for room_id in room_store.drop_peer(peer_id):
+        send_to_room(room_id, 'peer-disconnected', {'peerId': peer_id}, skip_peer=peer_id)
+
+
+def relay_offer(peer_id, data):
     target_id = data['targetId']
-    offer = data['offer']
     user_email = data.get('user_email')
 
-    logger.info(f'Relaying offer from {request.sid} (email: {user_email}) to {target_id}')
+    logger.info(f'Relaying offer from {peer_id} (email: {user_email}) to {target_id}')
+    ice_batcher.flush_sender(peer_id)
 
     # Send the offer to the target peer
-    emit('offer', {
-        'peerId': request.sid,
-        'offer': offer,
+    send_to_peer(target_id, 'offer', {
+        'peerId': peer_id,
+        'offer': data['offer'],
         'user_email': user_email
-    }, room=target_id)
+    })
 
-@socketio.on('answer')
-def handle_answer(data):
-    room_id = data['room']
+
+def relay_answer(peer_id, data):
     target_id = data['targetId']
-    answer = data['answer']
     user_email = data.get('user_email')
 
-    logger.info(f'Relaying answer from {request.sid} (email: {user_email}) to {target_id}')
+    logger.info(f'Relaying answer from {peer_id} (email: {user_email}) to {target_id}')
+    ice_batcher.flush_sender(peer_id)
 
     # Send the answer to the target peer
-    emit('answer', {
-        'peerId': request.sid,
-        'answer': answer,
+    send_to_peer(target_id, 'answer', {
+        'peerId': peer_id,
+        'answer': data['answer'],
         'user_email': user_email
-    }, room=target_id)
+    })
+
+
+def relay_ice_candidate(peer_id, data):
+    # Coalesced with the sender's other candidates for the target peer
+    ice_batcher.add(peer_id, data['targetId'], data.get('room'), [data['candidate']])
+
+
+def relay_ice_candidates(peer_id, data):
+    ice_batcher.add(peer_id, data['targetId'], data.get('room'), data.get('candidates') or [])
+
+
+def send_ice_candidates(peer_id, target_id, room_id, candidates):
+    """
+    Deliver a batch of candidates: as one 'ice-candidates' event to peers that opted
+    in and to relay sockets (the gateway splits it for its clients), else one by one
+    """
+    relay_sid = room_store.relay_of(target_id) or ''
+    if relay_sid or (room_id and (room_store.member(room_id, target_id) or {}).get('ice_batch')):
+        send_to_peer(target_id, 'ice-candidates', {
+            'peerId': peer_id,
+            'candidates': candidates
+        }, relay_sid=relay_sid)
+        return
+
+    for candidate in candidates:
+        send_to_peer(target_id, 'ice-candidate', {
+            'peerId': peer_id,
+            'candidate': candidate
+        }, relay_sid='')
+
+
+ice_batcher = IceBatcher(send_ice_candidates, socketio.start_background_task, socketio.sleep)
+
+
+def room_store_heartbeat():
+    """Keep this replica alive in the shared room store and clear the peers of dead replicas"""
+    while True:
+        try:
+            for peer_id, room_ids in room_store.heartbeat():
+                logger.info(f'Removed peer {peer_id} of a dead replica from rooms {room_ids}')
+                for room_id in room_ids:
+                    send_to_room(room_id, 'peer-disconnected', {'peerId': peer_id})
+        except Exception as e:
+            logger.error(f"Room store heartbeat failed: {str(e)}")
+        socketio.sleep(room_store.heartbeat_interval)
+
+
+if room_store.heartbeat_interval:
+    socketio.start_background_task(room_store_heartbeat)
+
+
+SIGNALING_HANDLERS = {
+    'join': join_peer,
+    'leave': leave_peer,
+    'offer': relay_offer,
+    'answer': relay_answer,
+    'ice-candidate': relay_ice_candidate,
+    'ice-candidates': relay_ice_candidates
+}
+
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    user_email = request.args.get("user_email")
+    relay_secret = auth.get('relay_secret') if isinstance(auth, dict) else None
+    if relay_secret is not None:
+        # A gateway relay socket: refuse the connection unless the secret matches
+        if not RELAY_SECRET or not hmac.compare_digest(str(relay_secret), RELAY_SECRET):
+            logger.warning(f'Refused relay socket {request.sid}: invalid relay secret')
+            return False
+        relay_sockets.add(request.sid)
+        logger.info(f'Gateway relay socket connected: {request.sid}')
+        return
+    logger.info(f'Client connected: {request.sid} user_email: {user_email}')
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    logger.info(f'Client disconnected: {request.sid}')
+
+    if request.sid not in relay_sockets:
+        disconnect_peer(request.sid)
+        return
+
+    # A relay socket going away takes all of its participants with it
+    relay_sockets.discard(request.sid)
+    for peer_id in room_store.drop_relay_socket(request.sid):
+        disconnect_peer(peer_id)
+
+@socketio.on('relay')
+def handle_relay(envelope):
+    if request.sid not in relay_sockets or not isinstance(envelope, dict):
+        return
+    peer_id = envelope.get('clientSid')
+    event = envelope.get('event')
+    args = envelope.get('args', [])
+    if not peer_id or not event:
+        return
+
+    if event == 'connect':
+        user_email = (args[0] or {}).get('user_email') if args else None
+        # Never take over the id of a directly connected socket or another relay's peer
+        if socketio.server.manager.is_connected(peer_id, '/') or not room_store.set_relay(peer_id, request.sid):
+            logger.warning(f'Refused relayed client {peer_id} via {request.sid}: peer id already in use')
+            return
+        logger.info(f'Relayed client connected: {peer_id} via {request.sid} user_email: {user_email}')
+        return
+
+    # Ignore envelopes for participants this relay socket does not carry
+    if room_store.relay_of(peer_id) != request.sid:
+        return
+
+    if event == 'disconnect':
+        logger.info(f'Relayed client disconnected: {peer_id}')
+        disconnect_peer(peer_id)
+        room_store.drop_relay(peer_id)
+        return
+
+    handler = SIGNALING_HANDLERS.get(event)
+    if handler:
+        handler(peer_id, *args)
+
+@socketio.on('join')
+def handle_join(data):
+    join_peer(request.sid, data)
+
+@socketio.on('leave')
+def handle_leave(data):
+    leave_peer(request.sid, data)
+
+@socketio.on('offer')
+def handle_offer(data):
+    relay_offer(request.sid, data)
+
+@socketio.on('answer')
+def handle_answer(data):
+    relay_answer(request.sid, data)
 
 @socketio.on('ice-candidate')
 def handle_ice_candidate(data):
-    room_id = data['room']
-    target_id = data['targetId']
-    candidate = data['candidate']
+    relay_ice_candidate(request.sid, data)
 
-    # Send the ICE candidate to the target peer
-    emit('ice-candidate', {
-        'peerId': request.sid,
-        'candidate': candidate
-    }, room=target_id)
+@socketio.on('ice-candidates')
+def handle_ice_candidates(data):
+    relay_ice_candidates(request.sid, data)
 
 if __name__ == '__main__':
     socketio.run(
@@ -0,0 +1,85 @@
+import os
+import threading
+
+
+class IceBatcher:
+    """
+    Coalesces trickled ICE candidates per (sender, target) pair.
+
+    Candidates added within window_seconds of each other are delivered together,
+    as one call per pair, instead of one message per candidate. A background task
+    flushes every window_seconds while batches are pending and exits once idle.
+    A pair reaching max_batch candidates is delivered at once. A window of 0
+    disables coalescing: every add is delivered immediately.
+    """
+
+    def __init__(self, deliver, spawn, sleep, window_seconds=None, max_batch=None):
+        """
+        Args:
+            deliver: Callable (sender, target, room, candidates) sending one batch
+            spawn: Starts a background task (socketio start_background_task)
+            sleep: Sleep that cooperates with the server's async mode (socketio sleep)
+            window_seconds: Coalescing window (ICE_BATCH_WINDOW_MS, default 5 ms)
+            max_batch: Candidates of a pair that are delivered without waiting (ICE_BATCH_MAX)
+        """
+        self.deliver = deliver
+        self.spawn = spawn
+        self.sleep = sleep
+        self.window_seconds = float(window_seconds if window_seconds is not None
+                                    else float(os.getenv('ICE_BATCH_WINDOW_MS', 5)) / 1000)
+        self.max_batch = max(1, int(max_batch if max_batch is not None else os.getenv('ICE_BATCH_MAX', 32)))
+
+        self._lock = threading.Lock()
+        self._pending = {}  # sender -> {target: {'room': str, 'candidates': list}}
+        self._flushing = False
+
+    def add(self, sender, target, room, candidates):
+        """Queue candidates from sender to target"""
+        if self.window_seconds <= 0:
+            self.deliver(sender, target, room, list(candidates))
+            return
+
+        with self._lock:
+            pairs = self._pending.setdefault(sender, {})
+            batch = pairs.setdefault(target, {'room': room, 'candidates': []})
+            batch['candidates'].extend(candidates)
+            full = len(batch['candidates']) >= self.max_batch
+            if full:
+                del pairs[target]
+                if not pairs:
+                    del self._pending[sender]
+            start = not full and not self._flushing
+            if start:
+                self._flushing = True
+
+        if full:
+            self.deliver(sender, target, batch['room'], batch['candidates'])
+        elif start:
+            self.spawn(self._run)
+
+    def _run(self):
+        while True:
+            self.sleep(self.window_seconds)
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if not pending:
+                    self._flushing = False
+                    return
+            self._deliver_all(pending)
+
+    def _deliver_all(self, pending):
+        for sender, pairs in pending.items():
+            for target, batch in pairs.items():
+                self.deliver(sender, target, batch['room'], batch['candidates'])
+
+    def flush_sender(self, sender):
+        """Deliver a sender's pending candidates now, e.g. before its next offer/answer"""
+        with self._lock:
+            pairs = self._pending.pop(sender, None)
+        if pairs:
+            self._deliver_all({sender: pairs})
+
+    def discard_sender(self, sender):
+        """Drop a departed sender's pending candidates"""
+        with self._lock:
+            self._pending.pop(sender, None)
@@ -0,0 +1,153 @@
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class LogWriter:
+    """
+    Background, batched writer for meeting log entries.
+
+    enqueue() only appends to a per-meeting queue and returns; a worker thread
+    drains the queues when one reaches batch_size or every flush_interval seconds.
+    SAVING_SERVER stores one log entry (and its timestamp) per POST, so each entry
+    is still posted on its own, in order, over the pooled keep-alive session.
+    The buffer is bounded by max_pending entries: beyond it new entries are dropped
+    and counted. When a post fails, that entry and the ones after it are put back
+    in front of the meeting's queue and retried on the next flush, up to max_retries
+    times in a row; then they are dropped so one broken meeting cannot fill the
+    buffer. An entry SAVING_SERVER rejects is dropped at once.
+    """
+
+    def __init__(self, post, batch_size=None, flush_interval=None, max_pending=None, max_retries=None):
+        """
+        Args:
+            post: Callable (meeting_id, log_entry) that stores one entry and returns True,
+                  False on a transient failure (retried) or None if it was rejected
+            batch_size: Pending entries of one meeting that trigger an immediate flush
+            flush_interval: Seconds between periodic flushes
+            max_pending: Entries buffered across all meetings before new ones are dropped
+            max_retries: Consecutive failed flushes of a meeting before its batch is dropped
+        """
+        self.post = post
+        self.batch_size = max(1, int(batch_size if batch_size is not None else os.getenv('MEETING_LOG_BATCH_SIZE', 50)))
+        self.flush_interval = float(flush_interval if flush_interval is not None
+                                    else os.getenv('MEETING_LOG_FLUSH_INTERVAL', 2))
+        self.max_pending = max(1, int(max_pending if max_pending is not None
+                                      else os.getenv('MEETING_LOG_MAX_PENDING', 10000)))
+        self.max_retries = max(0, int(max_retries if max_retries is not None
+                                      else os.getenv('MEETING_LOG_MAX_RETRIES', 5)))
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._queues = OrderedDict()  # meeting_id -> deque of entries
+        self._pending = 0
+        self._failed_flushes = {}  # meeting_id -> consecutive failed flushes
+        self._worker = None
+        self._closed = False
+
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failures = 0
+
+    def enqueue(self, meeting_id, log_entry):
+        """
+        Queue a log entry without waiting for it to be written
+
+        Returns:
+            bool: False if the entry was dropped because the buffer is full
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return False
+            queue = self._queues.setdefault(meeting_id, deque())
+            queue.append(log_entry)
+            self._pending += 1
+            if self._worker is None and not self._closed:
+                # Started on first use so importing the module spawns nothing
+                self._worker = threading.Thread(target=self._run, name='meeting-log-writer', daemon=True)
+                self._worker.start()
+            if len(queue) >= self.batch_size:
+                self._wakeup.set()
+        return True
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Send every pending entry now, meeting by meeting"""
+        with self._flush_lock:
+            with self._lock:
+                batches = list(self._queues.items())
+                self._queues = OrderedDict()
+
+            for meeting_id, entries in batches:
+                written = rejected = 0
+                ok = True
+                for log_entry in entries:
+                    try:
+                        ok = self.post(meeting_id, log_entry)
+                    except Exception as e:
+                        logger.error(f"Error writing meeting log: {str(e)}")
+                        ok = False
+                    if ok is None:
+                        rejected += 1
+                    elif not ok:
+                        break
+                    else:
+                        written += 1
+                remaining = list(entries)[written + rejected:]
+
+                reason = None
+                with self._lock:
+                    self._pending -= written + rejected
+                    self.written += written
+                    self.dropped += rejected
+                    if not remaining:
+                        self.batches += 1
+                        self._failed_flushes.pop(meeting_id, None)
+                    else:
+                        self.failures += 1
+                        failed = self._failed_flushes.get(meeting_id, 0) + 1
+                        if failed > self.max_retries:
+                            self._pending -= len(remaining)
+                            self.dropped += len(remaining)
+                            self._failed_flushes.pop(meeting_id, None)
+                            reason = f'failed {failed} times'
+                        else:
+                            self._failed_flushes[meeting_id] = failed
+                            # Keep the unwritten entries ahead of anything queued meanwhile
+                            queue = self._queues.setdefault(meeting_id, deque())
+                            queue.extendleft(reversed(remaining))
+                if rejected:
+                    logger.error(f"Dropped {rejected} log entries of meeting {meeting_id}: rejected")
+                if reason:
+                    logger.error(f"Dropped {len(remaining)} log entries of meeting {meeting_id}: {reason}")
+
+    def close(self):
+        """Stop the worker and write what is still pending (called on shutdown)"""
+        self._closed = True
+        self._wakeup.set()
+        if self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'meetings': len(self._queues),
+                'max_pending': self.max_pending,
+                'written': self.written,
+                'batches': self.batches,
+                'dropped': self.dropped,
+                'failures': self.failures
+            }
@@ -0,0 +1,332 @@
+import json
+import os
+import threading
+import uuid
+
+
+class MemoryRoomStore:
+    """
+    Room membership and relay routes of the signaling server, kept in process.
+
+    Rooms map peer ids to the member info given on join. Peers that arrive through
+    a gateway relay socket are also routed: peer id -> relay socket sid. This is
+    the single-replica store, and the stand-in for RedisRoomStore in tests.
+    It dies with its replica, so there is nothing to reap (heartbeat_interval None).
+    """
+
+    heartbeat_interval = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms = {}  # room_id -> {peer_id: info}
+        self._peer_rooms = {}  # peer_id -> set of room ids
+        self._relays = {}  # peer_id -> relay sid
+        self._relay_peers = {}  # relay sid -> set of peer ids
+
+    def join(self, room_id, peer_id, info):
+        """
+        Add a peer to a room
+
+        Returns:
+            dict: Members of the room after the join (peer_id -> info)
+        """
+        with self._lock:
+            members = self._rooms.setdefault(room_id, {})
+            members[peer_id] = info
+            self._peer_rooms.setdefault(peer_id, set()).add(room_id)
+            return dict(members)
+
+    def leave(self, room_id, peer_id):
+        """
+        Remove a peer from a room, dropping the room once empty
+
+        Returns:
+            dict: Member info of the peer, or None if it was not in the room
+        """
+        with self._lock:
+            members = self._rooms.get(room_id)
+            if members is None or peer_id not in members:
+                return None
+            info = members.pop(peer_id)
+            if not members:
+                del self._rooms[room_id]
+            room_ids = self._peer_rooms.get(peer_id)
+            if room_ids is not None:
+                room_ids.discard(room_id)
+                if not room_ids:
+                    del self._peer_rooms[peer_id]
+            return info
+
+    def members(self, room_id):
+        with self._lock:
+            return dict(self._rooms.get(room_id, {}))
+
+    def member(self, room_id, peer_id):
+        """Member info of a peer in a room, None if it is not in it"""
+        with self._lock:
+            return self._rooms.get(room_id, {}).get(peer_id)
+
+    def drop_peer(self, peer_id):
+        """
+        Remove a peer from every room it is in
+
+        Returns:
+            list: Ids of the rooms it was removed from
+        """
+        with self._lock:
+            left = []
+            for room_id in self._peer_rooms.pop(peer_id, ()):
+                members = self._rooms.get(room_id)
+                if members is not None and members.pop(peer_id, None) is not None:
+                    left.append(room_id)
+                    if not members:
+                        del self._rooms[room_id]
+            return left
+
+    def set_relay(self, peer_id, relay_sid):
+        """
+        Route a peer through a relay socket. A route is never re-pointed: a peer
+        already routed elsewhere, or already in a room as a direct peer, is refused.
+
+        Returns:
+            bool: True if the peer is (now) routed through relay_sid
+        """
+        with self._lock:
+            current = self._relays.get(peer_id)
+            if current is not None:
+                return current == relay_sid
+            if peer_id in self._peer_rooms:
+                return False
+            self._relays[peer_id] = relay_sid
+            self._relay_peers.setdefault(relay_sid, set()).add(peer_id)
+            return True
+
+    def relay_of(self, peer_id):
+        """Sid of the relay socket carrying a peer, None for directly connected peers"""
+        with self._lock:
+            return self._relays.get(peer_id)
+
+    def drop_relay(self, peer_id):
+        with self._lock:
+            relay_sid = self._relays.pop(peer_id, None)
+            peers = self._relay_peers.get(relay_sid)
+            if peers is not None:
+                peers.discard(peer_id)
+                if not peers:
+                    del self._relay_peers[relay_sid]
+
+    def drop_relay_socket(self, relay_sid):
+        """
+        Forget every route through a relay socket
+
+        Returns:
+            list: Ids of the peers it carried
+        """
+        with self._lock:
+            peers = list(self._relay_peers.pop(relay_sid, ()))
+            for peer_id in peers:
+                self._relays.pop(peer_id, None)
+            return peers
+
+    def heartbeat(self):
+        """
+        Mark this replica alive and remove the peers of replicas that died
+
+        Returns:
+            list: (peer_id, ids of the rooms it was removed from) per reaped peer
+        """
+        return []
+
+
+class RedisRoomStore:
+    """
+    Room membership and relay routes shared by every signaling replica through Redis.
+
+    Keys (under prefix):
+        room:<room_id>        hash  peer_id -> member info (JSON); Redis drops it once empty
+        peer:<peer_id>:rooms  set   room ids of a peer
+        relay                 hash  peer_id -> relay sid
+        relay:<sid>:peers     set   peer ids carried by a relay socket
+        replicas              set   ids of the replicas that own peers
+        replica:<id>          str   liveness key, expires unless heartbeat() renews it
+        replica:<id>:peers    set   peers that joined through this replica
+        replica:<id>:relays   set   relay sockets connected to this replica
+
+    A relay route never changes during a peer's lifetime, so relay_of() answers
+    from a local cache after the first lookup.
+
+    Every replica calls heartbeat() every heartbeat_interval seconds. A replica
+    that crashes stops renewing its liveness key; once it expires, the next
+    heartbeat of any replica removes that replica's peers and relay routes, so
+    later joiners are not offered ghost peers.
+    """
+
+    def __init__(self, url, prefix=None, replica_ttl=None):
+        """
+        Args:
+            url: Redis URL, e.g. redis://redis:6379/0
+            prefix: Namespace of the keys (ROOM_STORE_PREFIX, default 'meet')
+            replica_ttl: Seconds without heartbeat before a replica counts as dead
+                         (ROOM_STORE_REPLICA_TTL, default 30)
+        """
+        import redis
+        from ttlCache import TTLCache
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix or os.getenv('ROOM_STORE_PREFIX', 'meet')
+        self._routes = TTLCache(maxsize=100000, ttl_seconds=300, name='relay_routes')
+        self.replica_id = uuid.uuid4().hex
+        self.replica_ttl = max(3, int(replica_ttl if replica_ttl is not None
+                                      else os.getenv('ROOM_STORE_REPLICA_TTL', 30)))
+        self.heartbeat_interval = self.replica_ttl / 3
+        # Alive before the first peer joins, so no other replica reaps it meanwhile
+        self._beat()
+
+    def _room(self, room_id):
+        return f"{self.prefix}:room:{room_id}"
+
+    def _peer_rooms(self, peer_id):
+        return f"{self.prefix}:peer:{peer_id}:rooms"
+
+    def _relay_peers(self, relay_sid):
+        return f"{self.prefix}:relay:{relay_sid}:peers"
+
+    def _replica(self, replica_id, kind=None):
+        key = f"{self.prefix}:replica:{replica_id}"
+        return f"{key}:{kind}" if kind else key
+
+    def join(self, room_id, peer_id, info):
+        pipe = self.redis.pipeline()
+        pipe.hset(self._room(room_id), peer_id, json.dumps(info))
+        pipe.sadd(self._peer_rooms(peer_id), room_id)
+        pipe.sadd(self._replica(self.replica_id, 'peers'), peer_id)
+        pipe.hgetall(self._room(room_id))
+        members = pipe.execute()[-1]
+        return {member_id: json.loads(data) for member_id, data in members.items()}
+
+    def leave(self, room_id, peer_id):
+        pipe = self.redis.pipeline()
+        pipe.hget(self._room(room_id), peer_id)
+        pipe.hdel(self._room(room_id), peer_id)
+        pipe.srem(self._peer_rooms(peer_id), room_id)
+        info, removed, _ = pipe.execute()
+        return json.loads(info) if removed and info else None
+
+    def members(self, room_id):
+        members = self.redis.hgetall(self._room(room_id))
+        return {member_id: json.loads(data) for member_id, data in members.items()}
+
+    def member(self, room_id, peer_id):
+        data = self.redis.hget(self._room(room_id), peer_id)
+        return json.loads(data) if data else None
+
+    def drop_peer(self, peer_id, replica_id=None):
+        room_ids = list(self.redis.smembers(self._peer_rooms(peer_id)))
+        pipe = self.redis.pipeline()
+        for room_id in room_ids:
+            pipe.hdel(self._room(room_id), peer_id)
+        pipe.delete(self._peer_rooms(peer_id))
+        pipe.srem(self._replica(replica_id or self.replica_id, 'peers'), peer_id)
+        removed = pipe.execute()[:-2]
+        return [room_id for room_id, count in zip(room_ids, removed) if count]
+
+    def set_relay(self, peer_id, relay_sid):
+        current = self.redis.hget(f"{self.prefix}:relay", peer_id)
+        if current is not None:
+            return current == relay_sid
+        if self.redis.exists(self._peer_rooms(peer_id)):
+            return False
+        # HSETNX: of two relays racing for a peer, the first keeps it
+        if not self.redis.hsetnx(f"{self.prefix}:relay", peer_id, relay_sid):
+            return self.redis.hget(f"{self.prefix}:relay", peer_id) == relay_sid
+        pipe = self.redis.pipeline()
+        pipe.sadd(self._relay_peers(relay_sid), peer_id)
+        pipe.sadd(self._replica(self.replica_id, 'relays'), relay_sid)
+        pipe.execute()
+        self._routes.set(peer_id, relay_sid)
+        return True
+
+    def relay_of(self, peer_id):
+        relay_sid = self._routes.get(peer_id)
+        if relay_sid is None:
+            # '' marks a directly connected peer
+            relay_sid = self.redis.hget(f"{self.prefix}:relay", peer_id) or ''
+            self._routes.set(peer_id, relay_sid)
+        return relay_sid or None
+
+    def drop_relay(self, peer_id):
+        relay_sid = self.redis.hget(f"{self.prefix}:relay", peer_id)
+        pipe = self.redis.pipeline()
+        pipe.hdel(f"{self.prefix}:relay", peer_id)
+        if relay_sid:
+            pipe.srem(self._relay_peers(relay_sid), peer_id)
+        pipe.execute()
+        self._routes.delete(peer_id)
+
+    def drop_relay_socket(self, relay_sid):
+        peers = list(self.redis.smembers(self._relay_peers(relay_sid)))
+        pipe = self.redis.pipeline()
+        if peers:
+            pipe.hdel(f"{self.prefix}:relay", *peers)
+        pipe.delete(self._relay_peers(relay_sid))
+        pipe.srem(self._replica(self.replica_id, 'relays'), relay_sid)
+        pipe.execute()
+        for peer_id in peers:
+            self._routes.delete(peer_id)
+        return peers
+
+    def _beat(self):
+        pipe = self.redis.pipeline()
+        pipe.set(self._replica(self.replica_id), 1, ex=self.replica_ttl)
+        pipe.sadd(f"{self.prefix}:replicas", self.replica_id)
+        pipe.execute()
+
+    def heartbeat(self):
+        self._beat()
+        reaped = []
+        for replica_id in self.redis.smembers(f"{self.prefix}:replicas"):
+            if replica_id == self.replica_id or self.redis.exists(self._replica(replica_id)):
+                continue
+            # One replica reaps a dead one; the claim expires if it dies meanwhile
+            if not self.redis.set(self._replica(replica_id, 'reaping'), self.replica_id,
+                                  nx=True, ex=self.replica_ttl):
+                continue
+            reaped.extend(self._reap(replica_id))
+        return reaped
+
+    def _reap(self, replica_id):
+        """Remove the peers and relay routes of a dead replica"""
+        peers = set(self.redis.smembers(self._replica(replica_id, 'peers')))
+        for relay_sid in self.redis.smembers(self._replica(replica_id, 'relays')):
+            relayed = list(self.redis.smembers(self._relay_peers(relay_sid)))
+            pipe = self.redis.pipeline()
+            if relayed:
+                pipe.hdel(f"{self.prefix}:relay", *relayed)
+            pipe.delete(self._relay_peers(relay_sid))
+            pipe.execute()
+            peers.update(relayed)
+
+        reaped = []
+        for peer_id in peers:
+            left = self.drop_peer(peer_id, replica_id)
+            if left:
+                reaped.append((peer_id, left))
+
+        pipe = self.redis.pipeline()
+        pipe.delete(self._replica(replica_id, 'peers'), self._replica(replica_id, 'relays'))
+        pipe.srem(f"{self.prefix}:replicas", replica_id)
+        pipe.execute()
+        return reaped
+
+
+def create_room_store(url=None):
+    """
+    Room store selected by ROOM_STORE_URL: unset or memory:// keeps rooms in
+    process (single replica), redis://... shares them between replicas.
+    """
+    url = url if url is not None else os.getenv('ROOM_STORE_URL', '')
+    if not url or url.startswith('memory://'):
+        return MemoryRoomStore()
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisRoomStore(url)
+    raise ValueError(f"Unsupported ROOM_STORE_URL: {url}")
@@ -219,6 +219,17 @@ function connectSocket() {
         }
     });
 
+    // Handle batches of ICE candidates (joined with ice_batch)
+    socket.on('ice-candidates', async (data) => {
+        for (const candidate of data.candidates) {
+            try {
+                await handleNewICECandidate(data.peerId, candidate);
+            } catch (error) {
+                console.error("Error handling ICE candidate:", error);
+            }
+        }
+    });
+
     // Handle room full error
     socket.on('room-full', (data) => {
         updateStatus(`Room ${data.room} is full`);
@@ -355,7 +366,8 @@ function joinRoom(roomIdParam, isRejoin = false) {
     // Join the specified room with user email
     socket.emit('join', {
         room: targetRoomId,
-        user_email: user_mail
+        user_email: user_mail,
+        ice_batch: true  // receive trickled candidates as 'ice-candidates' batches
     });
 
     // Set a timeout for join operation
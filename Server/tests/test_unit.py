@@ -42,6 +42,34 @@ class TestAuthServiceUnit(unittest.TestCase):
         
         self.assertTrue(True)  # Don't fail on missing env in CI
 
+    def test_token_helper(self):
+        """Test token claims, role normalization, refresh and the required signing secret"""
+        from unittest import mock
+        import jwt
+        from authService.tokenHelper import tokenHelper
+
+        with mock.patch.dict(os.environ, {"JWT_SECRET_KEY": "test-secret-of-at-least-32-bytes-long"}):
+            os.environ.pop("JWT_ACCESS_TOKEN_EXPIRES", None)
+            # Login passes the ROLE enum value, signup the database value: both give one claim
+            self.assertEqual(tokenHelper.normalizeRole("EMPLOYER"), "employee")
+            self.assertEqual(tokenHelper.normalizeRole("employee"), "employee")
+            self.assertEqual(tokenHelper.normalizeRole("MANAGER"), "manager")
+            self.assertIsNone(tokenHelper.normalizeRole(""))
+
+            token = tokenHelper.issueToken("u1", "a@x", "EMPLOYER")
+            claims = jwt.decode(token, "test-secret-of-at-least-32-bytes-long", algorithms=["HS256"])
+            self.assertEqual((claims["sub"], claims["email"], claims["role"]), ("u1", "a@x", "employee"))
+            self.assertEqual(claims["exp"] - claims["iat"], 3600)
+
+            refreshed = jwt.decode(tokenHelper.refreshToken(token, "MANAGER"), "test-secret-of-at-least-32-bytes-long", algorithms=["HS256"])
+            self.assertEqual((refreshed["sub"], refreshed["role"]), ("u1", "manager"))
+            self.assertIsNone(tokenHelper.refreshToken(jwt.encode(claims, "another-secret-of-at-least-32-bytes", algorithm="HS256"), "hr"))
+
+        with mock.patch.dict(os.environ, {"JWT_SECRET_KEY": ""}):
+            with self.assertRaises(RuntimeError):
+                tokenHelper.issueToken("u1", "a@x", "employee")
+        print("✅ Token helper verified")
+
 
 class TestGatewayUnit(unittest.TestCase):
     """Unit tests for Gateway Service"""
@@ -65,16 +93,852 @@ class TestGatewayUnit(unittest.TestCase):
         print(f"✅ Roles available: {available_roles}")
         self.assertTrue(len(available_roles) > 0)
 
+    def test_ttl_cache_lru_and_tags(self):
+        """Test the response cache bound, expiry and tag invalidation"""
+        from Gateway.ttlCache import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl_seconds=60)
+        cache.set(("/meetings", ()), ["m1"], tags=("meetings",))
+        cache.set(("/meetings/m1", ()), {"id": "m1"}, tags=("meeting:m1",))
+        cache.get(("/meetings", ()))
+        cache.set(("/meetings/m2", ()), {"id": "m2"}, tags=("meeting:m2",))
+
+        # The least recently used entry went first
+        self.assertIsNone(cache.get(("/meetings/m1", ())))
+        self.assertEqual(cache.get(("/meetings", ())), ["m1"])
+
+        self.assertEqual(cache.invalidate_tag("meetings", "meeting:m2"), 2)
+        self.assertEqual(len(cache), 0)
+
+        cache.set("short", 1, ttl_seconds=0)
+        self.assertIsNone(cache.get("short"))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["evictions"], stats["expirations"]), (2, 1, 1))
+        print("✅ TTL cache verified")
+
+    def test_cache_invalidation_bus(self):
+        """Test that invalidations apply locally and from other workers, not twice from this one"""
+        import json
+        from Gateway.ttlCache import TTLCache
+        from Gateway.cacheBus import CacheInvalidationBus
+
+        cache = TTLCache(maxsize=10, ttl_seconds=60)
+        bus = CacheInvalidationBus(cache, url='')
+        for key, tag in (("list", "meetings"), ("m1", "meeting:m1"), ("m2", "meeting:m2")):
+            cache.set(key, key, tags=(tag,))
+
+        bus.invalidate("meetings")
+        self.assertNotIn("list", cache)
+
+        # Tags published by another worker are applied, this worker's own echo is skipped
+        bus._apply(json.dumps({"origin": "other-worker", "tags": ["meeting:m1"]}))
+        bus._apply(json.dumps({"origin": bus.origin, "tags": ["meeting:m2"]}))
+        bus._apply("not json")
+        self.assertNotIn("m1", cache)
+        self.assertIn("m2", cache)
+        self.assertEqual(bus.stats(), {"shared": False, "published": 0, "received": 1})
+        print("✅ Cache invalidation bus verified")
+
+    @staticmethod
+    def _relay_backend():
+        """
+        Backend speaking the relay protocol: echoes events back to their clientSid.
+        Plain werkzeug serves no websockets, so the backend stays on long-polling.
+
+        Returns:
+            (server, url, received): received lists the (clientSid, event) envelopes it got
+        """
+        import threading
+        import socketio
+        from werkzeug.serving import make_server
+
+        backend = socketio.Server(async_mode='threading', transports=['polling'])
+        received = []
+
+        @backend.on('connect')
+        def connect(sid, environ, auth=None):
+            return (auth or {}).get('relay_secret') == 's3cret'
+
+        @backend.on('relay')
+        def relay(sid, envelope):
+            received.append((envelope['clientSid'], envelope['event']))
+            if envelope['event'] not in ('connect', 'disconnect'):
+                backend.emit('relay', envelope, to=sid)
+
+        server = make_server('127.0.0.1', 0, socketio.WSGIApp(backend), threaded=True)
+        server.log = lambda *args: None
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://127.0.0.1:{server.server_port}", received
+
+    def test_backend_multiplexer_relay_protocol(self):
+        """Test relay sessions over a pooled socket against a backend that checks the relay secret"""
+        import threading
+        import time
+        from Gateway.namespace.BackendMultiplexer import BackendMultiplexer
+
+        server, url, received = self._relay_backend()
+
+        class GatewayApp:
+            """The gateway side: records what the multiplexer emits to its clients"""
+            def __init__(self):
+                self.emitted = []
+
+            def emit(self, event, *args, to=None, namespace=None):
+                self.emitted.append((to, event, args))
+
+            def start_background_task(self, target, *args):
+                threading.Thread(target=target, args=args, daemon=True).start()
+
+        def wait_for(condition):
+            deadline = time.time() + 10
+            while not condition() and time.time() < deadline:
+                time.sleep(0.02)
+            return condition()
+
+        try:
+            gateway = GatewayApp()
+            mux = BackendMultiplexer(gateway, '/game', url, pool_size=1, relay_secret='s3cret')
+            # Events sent before the connection is up are buffered and sent after the session opens
+            mux.attach('c1', user_email='a@x')
+            self.assertTrue(mux.forward('c1', 'makeMove', {'index': 4}))
+            self.assertTrue(wait_for(lambda: ('c1', 'makeMove', ({'index': 4},)) in gateway.emitted))
+            self.assertEqual(received[:2], [('c1', 'connect'), ('c1', 'makeMove')])
+            self.assertFalse(mux.forward('unknown', 'makeMove', {}))
+
+            mux.detach('c1')
+            self.assertTrue(wait_for(lambda: ('c1', 'disconnect') in received))
+            mux.close()
+
+            # Without the secret the backend refuses the socket and the client gets an error
+            gateway = GatewayApp()
+            mux = BackendMultiplexer(gateway, '/game', url, pool_size=1)
+            mux.attach('c2')
+            self.assertTrue(wait_for(lambda: ('c2', 'error', ('Failed to connect to backend',)) in gateway.emitted))
+            self.assertNotIn(('c2', 'connect'), received)
+            mux.close()
+        finally:
+            server.shutdown()
+        print("✅ Backend multiplexer relay protocol verified")
+
+    def test_async_backend_multiplexer_relay_protocol(self):
+        """Test the asyncio multiplexer against the same relay backend"""
+        import asyncio
+        from unittest import mock
+        from Gateway.namespace.AsyncBackendMultiplexer import AsyncBackendMultiplexer
+
+        server, url, received = self._relay_backend()
+
+        class GatewayServer:
+            """The async gateway side: records what the multiplexer emits to its clients"""
+            def __init__(self):
+                self.emitted = []
+
+            async def emit(self, event, data=None, to=None, namespace=None):
+                self.emitted.append((to, event, data))
+
+            def start_background_task(self, target, *args):
+                return asyncio.ensure_future(target(*args))
+
+        async def wait_for(condition):
+            for _ in range(500):
+                if condition():
+                    break
+                await asyncio.sleep(0.02)
+            return condition()
+
+        async def scenario():
+            gateway = GatewayServer()
+            mux = AsyncBackendMultiplexer(gateway, '/game', url, pool_size=1, relay_secret='s3cret')
+            # attach() returns before the backend is reached; events sent meanwhile are buffered
+            await mux.attach('c1', user_email='a@x')
+            self.assertTrue(await mux.forward('c1', 'makeMove', {'index': 4}))
+            self.assertEqual(mux.stats()['pending'], 1)
+            self.assertTrue(await wait_for(lambda: ('c1', 'makeMove', {'index': 4}) in gateway.emitted))
+            self.assertEqual(received[:2], [('c1', 'connect'), ('c1', 'makeMove')])
+            self.assertFalse(await mux.forward('unknown', 'makeMove', {}))
+
+            await mux.detach('c1')
+            self.assertTrue(await wait_for(lambda: ('c1', 'disconnect') in received))
+            await mux.close()
+
+            # The pending buffer is bounded (kept small: a long-polling payload takes 16 packets at most)
+            with mock.patch.object(AsyncBackendMultiplexer, 'PENDING_LIMIT', 4):
+                mux = AsyncBackendMultiplexer(GatewayServer(), '/game', url, pool_size=1, relay_secret='s3cret')
+                await mux.attach('c3')
+                for index in range(4):
+                    self.assertTrue(await mux.forward('c3', 'makeMove', {'index': index}))
+                self.assertFalse(await mux.forward('c3', 'makeMove', {'index': -1}))
+            self.assertTrue(await wait_for(lambda: received.count(('c3', 'makeMove')) == 4))
+            await mux.close()
+
+            # Without the secret the backend refuses the socket and the client gets an error
+            gateway = GatewayServer()
+            mux = AsyncBackendMultiplexer(gateway, '/game', url, pool_size=1)
+            await mux.attach('c2')
+            self.assertTrue(await wait_for(lambda: ('c2', 'error', 'Failed to connect to backend') in gateway.emitted))
+            self.assertNotIn(('c2', 'connect'), received)
+            await mux.close()
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            server.shutdown()
+        print("✅ Async backend multiplexer relay protocol verified")
+
 
 class TestDataServiceUnit(unittest.TestCase):
     """Unit tests for Data Service"""
-    
+
+    # Modules dataService imports flat, whose names other services use too
+    FLAT_MODULES = ('app', 'Helper', 'fileCache', 'httpClient', 'ttlCache')
+
+    def _data_service(self):
+        """
+        Load dataService/app.py with its own flat siblings and a throwaway file cache
+
+        Returns:
+            (app module, Helper module)
+        """
+        import importlib.util
+        import tempfile
+        from unittest import mock
+
+        service_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dataService'))
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        saved = {name: sys.modules.pop(name) for name in self.FLAT_MODULES if name in sys.modules}
+        sys.path.insert(0, service_path)
+        try:
+            with mock.patch.dict(os.environ, {"FILE_CACHE_DIR": cache_dir.name}):
+                spec = importlib.util.spec_from_file_location('dataServiceApp', os.path.join(service_path, 'app.py'))
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            helper = sys.modules['Helper']
+        finally:
+            sys.path.remove(service_path)
+            for name in self.FLAT_MODULES:
+                sys.modules.pop(name, None)
+            sys.modules.update(saved)
+        return module, helper
+
+    @staticmethod
+    def _upstream(status_code=200, body=b'', headers=None, chunk_size=4):
+        """Streamed Saving Server response: body in chunk_size pieces, headers as given"""
+        from unittest import mock
+
+        response = mock.Mock(status_code=status_code, headers=dict(headers or {}), text='')
+        response.iter_content = lambda size: (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+        return response
+
     def test_data_service_structure(self):
         """Test that data service directory exists"""
         data_service_path = os.path.join(os.path.dirname(__file__), '..', 'dataService')
         self.assertTrue(os.path.exists(data_service_path), "Data service directory should exist")
         print("✅ Data service structure verified")
 
+    def test_file_cache_dedup_and_eviction(self):
+        """Test the content-addressed file cache"""
+        import tempfile
+        from dataService.fileCache import FileCache
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileCache(directory, max_bytes=10, max_entry_bytes=8, ttl_seconds=60)
+            headers = {"Content-Type": "text/plain", "ETag": '"v1"'}
+
+            # The body passes through unchanged while it is cached
+            self.assertEqual(b"".join(cache.tee("a.txt", [b"hel", b"lo"], headers)), b"hello")
+            list(cache.tee("b.txt", [b"hello"], headers))
+            entry = cache.lookup("a.txt")
+            self.assertTrue(entry["fresh"])
+            self.assertEqual(entry["path"], cache.lookup("b.txt")["path"])
+            self.assertEqual(cache.stats()["blobs"], 1)
+            self.assertEqual(FileCache.validators(entry), {"If-None-Match": '"v1"'})
+
+            # Oversized and aborted transfers are not cached
+            list(cache.tee("big.txt", [b"123456789"], headers))
+            aborted = cache.tee("c.txt", [b"12", b"34"], headers)
+            next(aborted)
+            aborted.close()
+            self.assertIsNone(cache.lookup("big.txt"))
+            self.assertIsNone(cache.lookup("c.txt"))
+
+            # A new blob beyond max_bytes evicts the least recently used entries
+            list(cache.tee("d.txt", [b"world!"], headers))
+            self.assertIsNone(cache.lookup("a.txt"))
+            self.assertIsNotNone(cache.lookup("d.txt"))
+            self.assertEqual(sorted(os.listdir(directory)), [cache.lookup("d.txt")["digest"]])
+
+            cache.clear()
+            self.assertEqual((cache.stats()["entries"], os.listdir(directory)), (0, []))
+        print("✅ File cache verified")
+
+    def test_get_file_ranges(self):
+        """Test Range and If-Range on /file/get against a Saving Server that ignores Range"""
+        from unittest import mock
+
+        app, helper = self._data_service()
+        client = app.app.test_client()
+        body = b'0123456789'
+        sent = []
+
+        def get(url, headers=None, stream=False):
+            sent.append(headers)
+            return self._upstream(200, body, {'Content-Type': 'text/plain', 'Content-Length': str(len(body)),
+                                              'ETag': '"v2"'})
+
+        internal = {'X-Internal-Key': app.INTERNAL_API_KEY}
+        with mock.patch.object(helper.httpClient, 'get', side_effect=get):
+            # Suffix range cut locally out of the full body
+            response = client.get('/file/get/a.txt', headers={**internal, 'Range': 'bytes=-3'})
+            self.assertEqual((response.status_code, response.data), (206, b'789'))
+            self.assertEqual(response.headers['Content-Range'], 'bytes 7-9/10')
+            self.assertEqual(sent[-1]['Range'], 'bytes=-3')
+
+            # A range past the end of the file
+            response = client.get('/file/get/b.txt', headers={**internal, 'Range': 'bytes=20-'})
+            self.assertEqual(response.status_code, 416)
+            self.assertEqual(response.headers['Content-Range'], 'bytes */10')
+
+            # If-Range naming another version: the whole current file instead of a part of it
+            response = client.get('/file/get/c.txt', headers={**internal, 'Range': 'bytes=0-3', 'If-Range': '"v1"'})
+            self.assertEqual((response.status_code, response.data), (200, body))
+            self.assertEqual(response.headers['ETag'], '"v2"')
+
+        # A 416 from the Saving Server keeps its Content-Range
+        refused = self._upstream(416, headers={'Content-Range': 'bytes */10'})
+        with mock.patch.object(helper.httpClient, 'get', return_value=refused):
+            response = client.get('/file/get/d.txt', headers={**internal, 'Range': 'bytes=20-'})
+            self.assertEqual((response.status_code, response.headers['Content-Range']), (416, 'bytes */10'))
+        print("✅ File download ranges verified")
+
+    def test_get_file_revalidates_stale_cache(self):
+        """Test that a stale cached file is revalidated and served from cache on 304"""
+        from unittest import mock
+
+        app, helper = self._data_service()
+        client = app.app.test_client()
+        internal = {'X-Internal-Key': app.INTERNAL_API_KEY}
+        full = self._upstream(200, b'cached body', {'Content-Type': 'text/plain', 'Content-Length': '11',
+                                                    'ETag': '"v1"'})
+        with mock.patch.object(helper.httpClient, 'get', return_value=full):
+            self.assertEqual(client.get('/file/get/e.txt', headers=internal).data, b'cached body')
+
+        app.file_cache.ttl_seconds = 0
+        with mock.patch.object(helper.httpClient, 'get', return_value=self._upstream(304)) as get:
+            response = client.get('/file/get/e.txt', headers={**internal, 'Range': 'bytes=-4'})
+        # The whole file is revalidated with the cached validator, the range is cut from the copy
+        self.assertEqual(get.call_args.kwargs['headers'].get('If-None-Match'), '"v1"')
+        self.assertNotIn('Range', get.call_args.kwargs['headers'])
+        self.assertEqual((response.status_code, response.data), (206, b'body'))
+        self.assertEqual((response.headers['X-Cache'], response.headers['ETag']), ('HIT', '"v1"'))
+        print("✅ Stale file cache revalidation verified")
+
+    def test_upload_stream_forwards_multipart_body(self):
+        """Test that /upload relays the client's multipart body unchanged behind the user_email part"""
+        from unittest import mock
+
+        app, helper = self._data_service()
+        client = app.app.test_client()
+        body = (
+            b'--XyZ\r\n'
+            b'Content-Disposition: form-data; name="file"; filename="a.txt"\r\n'
+            b'Content-Type: text/plain\r\n\r\n'
+            b'hello\r\nworld\r\n'
+            b'--XyZ--\r\n'
+        )
+        forwarded = {}
+
+        def post(url, data=None, headers=None):
+            # Read the way the upstream socket would, a few bytes at a time
+            chunks = iter(lambda: data.read(7), b'')
+            forwarded.update(url=url, headers=headers, length=data.len, body=b''.join(chunks))
+            return mock.Mock(status_code=200, json=lambda: {'data': {'filename': 'a.txt'}})
+
+        with mock.patch.object(helper.httpClient, 'post', side_effect=post):
+            response = client.post('/upload', data=body, content_type='multipart/form-data; boundary=XyZ')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(forwarded['url'].endswith('/file/upload'))
+        self.assertEqual(forwarded['headers']['Content-Type'], 'multipart/form-data; boundary=XyZ')
+        self.assertEqual(forwarded['body'], (
+            b'--XyZ\r\n'
+            b'Content-Disposition: form-data; name="user_email"\r\n\r\n'
+            b'manager@mas3oud.tcom\r\n'
+        ) + body)
+        self.assertEqual(forwarded['length'], len(forwarded['body']))
+
+        # Without a boundary the body cannot be extended: refused before reaching the Saving Server
+        with mock.patch.object(helper.httpClient, 'post') as saving_post:
+            response = client.post('/upload', data=body, content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['details'], 'Missing multipart boundary')
+        saving_post.assert_not_called()
+        print("✅ Streamed upload body verified")
+
+    def test_list_files_paging(self):
+        """Test /getAllfiles paging, filters and the unpaged default"""
+        from unittest import mock
+
+        app, helper = self._data_service()
+        client = app.app.test_client()
+        # Three uploads share a timestamp: the file id orders them
+        files = [
+            {'file_id': 'f1', 'filename': 'notes.txt', 'uploaded_at': '2025-01-03T10:00:00'},
+            {'file_id': 'f4', 'filename': 'report-b.pdf', 'uploaded_at': '2025-01-02T10:00:00'},
+            {'file_id': 'f2', 'filename': 'report-a.pdf', 'uploaded_at': '2025-01-02T10:00:00'},
+            {'file_id': 'f3', 'filename': 'notes-old.txt', 'uploaded_at': '2025-01-02T10:00:00'},
+            {'file_id': 'f5', 'filename': 'report-old.pdf', 'uploaded_at': '2025-01-01T10:00:00'},
+        ]
+        upstream = mock.Mock(status_code=200, json=lambda: {'data': files})
+
+        def pages(query):
+            ids, cursor = [], None
+            while True:
+                response = client.get('/getAllfiles', query_string={**query, **({'cursor': cursor} if cursor else {})})
+                self.assertEqual(response.status_code, 200)
+                ids.append([file['file_id'] for file in response.json['files']])
+                cursor = response.json['next_cursor']
+                if cursor is None:
+                    return ids
+
+        with mock.patch.object(helper.httpClient, 'get', return_value=upstream) as get, \
+                mock.patch.object(helper.FileHelper, 'LIST_DEFAULT_LIMIT', 2):
+            # No paging parameters: every file at once, as before paging
+            response = client.get('/getAllfiles')
+            self.assertEqual([file['file_id'] for file in response.json['files']], ['f1', 'f2', 'f3', 'f4', 'f5'])
+            self.assertIsNone(response.json['next_cursor'])
+
+            # Pages split the tie without losing or repeating a file
+            self.assertEqual(pages({'limit': 2}), [['f1', 'f2'], ['f3', 'f4'], ['f5']])
+            self.assertEqual(get.call_count, 1)
+
+            # prefix and until skip files, since stops at the first older one
+            self.assertEqual(pages({'limit': 1, 'prefix': 'report'}), [['f2'], ['f4'], ['f5']])
+            self.assertEqual(pages({'limit': 2, 'until': '2025-01-03T00:00:00'}), [['f2', 'f3'], ['f4', 'f5']])
+            self.assertEqual(pages({'limit': 10, 'since': '2025-01-02T10:00:00'}), [['f1', 'f2', 'f3', 'f4']])
+
+            # A cursor outliving the cached listing continues from the refetched one
+            first = client.get('/getAllfiles', query_string={'limit': 2}).json
+            app.file_helper._listings.clear()
+            files.insert(0, {'file_id': 'f0', 'filename': 'new.txt', 'uploaded_at': '2025-01-04T10:00:00'})
+            rest = client.get('/getAllfiles', query_string={'limit': 10, 'cursor': first['next_cursor']}).json
+            self.assertEqual([file['file_id'] for file in rest['files']], ['f3', 'f4', 'f5'])
+            self.assertEqual(get.call_count, 2)
+
+            self.assertEqual(client.get('/getAllfiles', query_string={'cursor': 'not-a-cursor'}).status_code, 400)
+        print("✅ File listing paging verified")
+
+    def test_file_cache_worker_directories(self):
+        """Test that workers sharing FILE_CACHE_DIR keep their blobs apart"""
+        import subprocess
+        import tempfile
+        from unittest import mock
+        from dataService.fileCache import FileCache
+
+        with tempfile.TemporaryDirectory() as shared:
+            exited = subprocess.Popen([sys.executable, "-c", "pass"])
+            exited.wait()
+            dead = os.path.join(shared, f"worker-{exited.pid}")
+            alive = os.path.join(shared, f"worker-{os.getppid()}")
+            for directory in (dead, alive):
+                os.makedirs(directory)
+                open(os.path.join(directory, "0" * 64), "wb").close()
+
+            with mock.patch.dict(os.environ, {"FILE_CACHE_DIR": shared}):
+                cache = FileCache()
+            self.assertEqual(cache.directory, os.path.join(shared, f"worker-{os.getpid()}"))
+            # Only the directory of the exited worker is removed
+            self.assertFalse(os.path.exists(dead))
+            self.assertEqual(os.listdir(alive), ["0" * 64])
+        print("✅ File cache worker directories verified")
+
+
+class TestMeetingServiceUnit(unittest.TestCase):
+    """Unit tests for Meeting Service"""
+
+    @staticmethod
+    def _meet_helper():
+        """Load meetingService/Helper.py under its own name (it imports its siblings flat)"""
+        import importlib.util
+        service_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'meetingService'))
+        sys.path.insert(0, service_path)
+        try:
+            spec = importlib.util.spec_from_file_location('meetingServiceHelper',
+                                                          os.path.join(service_path, 'Helper.py'))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(service_path)
+        return module
+
+    def test_list_meetings_upstream_paging(self):
+        """Test that Saving Server cursors are passed back to it untouched"""
+        from unittest import mock
+
+        helper = self._meet_helper()
+        pages = {None: {'data': [{'meeting_id': 'm1'}], 'next_cursor': 'opaque-upstream-cursor'},
+                 'opaque-upstream-cursor': {'data': [{'meeting_id': 'm2'}], 'next_cursor': None}}
+        sent = []
+
+        def get(url, headers=None, params=None):
+            sent.append(params.get('cursor'))
+            return mock.Mock(status_code=200, json=lambda: pages[params.get('cursor')])
+
+        with mock.patch.object(helper.httpClient, 'get', side_effect=get):
+            first = helper.MeetHelper.listMeetings(user_email='up@x', limit=1, fields=['meeting_id'])
+            self.assertEqual(first['next_cursor'], 'u.opaque-upstream-cursor')
+            second = helper.MeetHelper.listMeetings(user_email='up@x', limit=1, fields=['meeting_id'],
+                                                    cursor=first['next_cursor'])
+        self.assertEqual(sent, [None, 'opaque-upstream-cursor'])
+        self.assertEqual(second, {'data': [{'meeting_id': 'm2'}], 'next_cursor': None})
+        print("✅ Upstream meeting paging verified")
+
+    def test_list_meetings_local_paging(self):
+        """Test local pages of an unpaged Saving Server listing, both sort directions"""
+        from unittest import mock
+
+        helper = self._meet_helper()
+        meetings = [{'meeting_id': f'm{i}', 'created_at': f'2025-01-0{i}'} for i in (3, 1, 5, 2, 4)]
+        calls = []
+
+        def get(url, headers=None, params=None):
+            calls.append(params)
+            return mock.Mock(status_code=200, json=lambda: {'data': meetings})
+
+        def walk(sort):
+            pages, cursor = [], None
+            while True:
+                page = helper.MeetHelper.listMeetings(user_email='local@x', limit=2, sort=sort,
+                                                      fields=['meeting_id'], cursor=cursor)
+                pages.append([m['meeting_id'] for m in page['data']])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    return pages
+                self.assertTrue(cursor.startswith('l.'))
+
+        with mock.patch.object(helper.httpClient, 'get', side_effect=get):
+            self.assertEqual(walk('created_at'), [['m1', 'm2'], ['m3', 'm4'], ['m5']])
+            self.assertEqual(walk('-created_at'), [['m5', 'm4'], ['m3', 'm2'], ['m1']])
+            # One fetch per sort order; local cursors are never sent upstream
+            self.assertEqual(len(calls), 2)
+            self.assertTrue(all('cursor' not in params for params in calls))
+
+            # Exactly one page: no next cursor
+            page = helper.MeetHelper.listMeetings(user_email='local@x', limit=5, sort='created_at')
+            self.assertEqual((len(page['data']), page['next_cursor']), (5, None))
+
+            cursor = helper.MeetHelper.listMeetings(user_email='local@x', limit=2, sort='created_at')['next_cursor']
+            with self.assertRaises(ValueError):
+                helper.MeetHelper.listMeetings(user_email='local@x', sort='-created_at', cursor=cursor)
+            with self.assertRaises(ValueError):
+                helper.MeetHelper.listMeetings(user_email='local@x', cursor='not-a-cursor')
+        print("✅ Local meeting paging verified")
+
+    def test_list_meetings_projection(self):
+        """Test that a projection fetches the sort key and gets its own cached listing"""
+        from unittest import mock
+
+        helper = self._meet_helper()
+        meetings = [{'meeting_id': f'm{i}', 'created_at': f'2025-02-0{i}', 'title': f'T{i}'} for i in (2, 3, 1)]
+        calls = []
+
+        def get(url, headers=None, params=None):
+            # A Saving Server that honours the projection and does not page
+            calls.append(params)
+            fields = params['fields'].split(',')
+            return mock.Mock(status_code=200, json=lambda: {'data': [
+                {name: m[name] for name in fields if name in m} for m in meetings]})
+
+        with mock.patch.object(helper.httpClient, 'get', side_effect=get):
+            page = helper.MeetHelper.listMeetings(user_email='proj@x', sort='created_at', fields=['title'])
+            self.assertEqual(page['data'], [{'title': 'T1'}, {'title': 'T2'}, {'title': 'T3'}])
+            self.assertEqual(set(calls[0]['fields'].split(',')), {'title', 'created_at', 'meeting_id'})
+
+            page = helper.MeetHelper.listMeetings(user_email='proj@x', sort='created_at',
+                                                  fields=['meeting_id', 'created_at'])
+            self.assertEqual([m['created_at'] for m in page['data']], ['2025-02-01', '2025-02-02', '2025-02-03'])
+            self.assertEqual(len(calls), 2)
+        print("✅ Meeting list projection verified")
+
+    def test_log_writer_batches_and_bounds(self):
+        """Test that log entries are batched per meeting, retried and bounded"""
+        from meetingService.logWriter import LogWriter
+
+        posted = []
+        fail = {"m2"}
+
+        def post(meeting_id, log_entry):
+            if meeting_id in fail:
+                return False
+            posted.append((meeting_id, log_entry))
+            return True
+
+        writer = LogWriter(post, batch_size=100, flush_interval=60, max_pending=4)
+        for entry in ("a joined", "b joined", "a left"):
+            self.assertTrue(writer.enqueue("m1", entry))
+        self.assertTrue(writer.enqueue("m2", "c joined"))
+        # The buffer is full: the entry is dropped instead of blocking
+        self.assertFalse(writer.enqueue("m2", "c left"))
+
+        writer.flush()
+        self.assertEqual(posted, [("m1", "a joined"), ("m1", "b joined"), ("m1", "a left")])
+        self.assertEqual(writer.stats()["pending"], 1)
+
+        # The failed entry is kept ahead of newer entries and sent on close
+        fail.clear()
+        writer.enqueue("m2", "d joined")
+        writer.close()
+        self.assertEqual(posted[-2:], [("m2", "c joined"), ("m2", "d joined")])
+        stats = writer.stats()
+        self.assertEqual((stats["pending"], stats["written"], stats["dropped"], stats["failures"]), (0, 5, 1, 1))
+        print("✅ Meeting log writer verified")
+
+    def test_log_writer_gives_up_on_failing_meetings(self):
+        """Test that batches failing past max_retries, or rejected, are dropped and counted"""
+        from meetingService.logWriter import LogWriter
+
+        results = {"m1": False, "m2": None}
+        attempts = []
+
+        def post(meeting_id, log_entry):
+            attempts.append(meeting_id)
+            return results.get(meeting_id, True)
+
+        writer = LogWriter(post, batch_size=100, flush_interval=60, max_pending=10, max_retries=2)
+        writer.enqueue("m1", "a joined")
+        writer.enqueue("m2", "b joined")
+        writer.enqueue("m3", "c joined")
+
+        # m2 is rejected at once; m1 is retried twice more, then dropped
+        writer.flush()
+        self.assertEqual(writer.stats()["pending"], 1)
+        writer.flush()
+        writer.flush()
+        self.assertEqual(attempts.count("m1"), 3)
+        self.assertEqual(attempts.count("m2"), 1)
+        stats = writer.stats()
+        self.assertEqual((stats["pending"], stats["written"], stats["dropped"]), (0, 1, 2))
+
+        # The buffer is free again, and a meeting that recovers starts a fresh retry budget
+        results["m1"] = True
+        self.assertTrue(writer.enqueue("m1", "a left"))
+        writer.flush()
+        self.assertEqual(writer.stats()["written"], 2)
+        print("✅ Meeting log writer retry limit verified")
+
+    def test_log_writer_stores_one_entry_per_post(self):
+        """Test that queued entries reach the Saving Server as separate log entries, in order"""
+        from unittest import mock
+        from meetingService.logWriter import LogWriter
+
+        helper = self._meet_helper()
+        stored = []
+
+        def post(url, json=None, headers=None):
+            if json["log_entry"] == "bad":
+                return mock.Mock(status_code=422)
+            stored.append((url.rsplit("/", 2)[-2], json))
+            return mock.Mock(status_code=200)
+
+        writer = LogWriter(helper.MeetHelper._writeLogEntry, batch_size=100, flush_interval=60)
+        for entry in ("a joined", "bad", "b said: hi\nthere", "a left"):
+            writer.enqueue("m1", entry)
+        with mock.patch.object(helper.httpClient, "post", side_effect=post):
+            writer.flush()
+
+        # One POST per entry with the entry unchanged; only the rejected one is lost
+        self.assertEqual(stored, [("m1", {"log_entry": "a joined"}), ("m1", {"log_entry": "b said: hi\nthere"}),
+                                  ("m1", {"log_entry": "a left"})])
+        stats = writer.stats()
+        self.assertEqual((stats["pending"], stats["written"], stats["dropped"]), (0, 3, 1))
+        print("✅ Meeting log entry format verified")
+
+    def test_read_meeting_log_utf8(self):
+        """Test offset reads of the meeting log around multi-byte characters, with and without Range support"""
+        from unittest import mock
+
+        helper = self._meet_helper()
+        MeetHelper = helper.MeetHelper
+        log = 'aé€b'.encode('utf-8')  # a | c3 a9 | e2 82 ac | b
+        sent = []
+
+        def upstream(honours_range):
+            def get(url, headers=None, params=None, stream=False):
+                sent.append(headers['Range'])
+                start, stop = (int(n) for n in headers['Range'][len('bytes='):].split('-'))
+                if honours_range and start >= len(log):
+                    return mock.Mock(status_code=416)
+                body = log[start:stop + 1] if honours_range else log
+                response = mock.Mock(status_code=206 if honours_range else 200)
+                # One byte per chunk, so characters arrive split
+                response.iter_content = lambda size: (body[i:i + 1] for i in range(len(body)))
+                return response
+            return get
+
+        # A trailing incomplete character is left for the next read
+        self.assertEqual(MeetHelper._utf8Boundary(b'a\xc3'), 1)
+        self.assertEqual(MeetHelper._utf8Boundary(b'a\xc3\xa9'), 3)
+        self.assertEqual(MeetHelper._utf8Boundary(b'\xe2\x82'), 0)
+        self.assertEqual(MeetHelper._utf8Boundary('😀'.encode('utf-8')), 4)
+
+        for honours_range in (True, False):
+            with mock.patch.object(helper.httpClient, 'get', side_effect=upstream(honours_range)):
+                # 4 bytes from 1 end inside '€'
+                first = MeetHelper.readMeetingLog('m1', offset=1, max_bytes=4)
+                self.assertEqual(first, {'log_content': 'é', 'offset': 1, 'next_offset': 3})
+                self.assertEqual(sent[-1], 'bytes=1-4')
+                second = MeetHelper.readMeetingLog('m1', offset=first['next_offset'], max_bytes=4)
+                self.assertEqual(second, {'log_content': '€b', 'offset': 3, 'next_offset': 7})
+
+                # An offset inside 'é' starts at the next character
+                self.assertEqual(MeetHelper.readMeetingLog('m1', offset=2, max_bytes=4),
+                                 {'log_content': '€', 'offset': 3, 'next_offset': 6})
+
+                # Nothing new past the end
+                self.assertEqual(MeetHelper.readMeetingLog('m1', offset=7),
+                                 {'log_content': '', 'offset': 7, 'next_offset': 7})
+        print("✅ Meeting log offset reads verified")
+
+    def test_meeting_cache_follows_mutations(self):
+        """Test that reads after updateMeeting/deleteMeeting return the new state, not the cached one"""
+        from unittest import mock
+
+        helper = self._meet_helper()
+        MeetHelper = helper.MeetHelper
+        stored = {'meeting_id': 'm1', 'title': 'Old title', 'is_active': True}
+
+        def get(url, headers=None):
+            if stored is None:
+                return mock.Mock(status_code=404, json=lambda: {'error': 'not found'})
+            return mock.Mock(status_code=200, json=lambda: dict(stored))
+
+        def put(url, json=None, headers=None):
+            stored.update(json)
+            return mock.Mock(status_code=200, json=lambda: {'data': dict(stored)})
+
+        with mock.patch.object(helper.httpClient, 'get', side_effect=get) as saving_get, \
+                mock.patch.object(helper.httpClient, 'put', side_effect=put):
+            self.assertEqual(MeetHelper.getMeetingByID('m1').getTitle(), 'Old title')
+
+            # The update response is written through: served from cache, but new
+            self.assertTrue(MeetHelper.updateMeeting('m1', {'title': 'New title'}))
+            self.assertEqual(MeetHelper.getMeetingByID('m1').getTitle(), 'New title')
+            self.assertEqual(saving_get.call_count, 1)
+
+            # A response without the meeting drops the entry: the next read refetches
+            with mock.patch.object(helper.httpClient, 'put',
+                                   return_value=mock.Mock(status_code=200, json=lambda: {'success': True})):
+                stored['title'] = 'Renamed elsewhere'
+                self.assertTrue(MeetHelper.updateMeeting('m1', {'is_active': False}))
+            meeting = MeetHelper.getMeetingByID('m1')
+            self.assertEqual((meeting.getTitle(), saving_get.call_count), ('Renamed elsewhere', 2))
+
+            with mock.patch.object(helper.httpClient, 'delete', return_value=mock.Mock(status_code=200)):
+                self.assertTrue(MeetHelper.deleteMeeting('m1'))
+            stored = None
+            self.assertIsNone(MeetHelper.getMeetingByID('m1'))
+            self.assertEqual(saving_get.call_count, 3)
+        print("✅ Meeting cache after mutations verified")
+
+    def test_memory_room_store(self):
+        """Test room membership, the peer index and relay routes"""
+        from meetingService.roomStore import MemoryRoomStore, create_room_store
+
+        store = MemoryRoomStore()
+        store.join("r1", "a", {"user_email": "a@x"})
+        store.join("r2", "a", {"user_email": "a@x"})
+        members = store.join("r1", "b", {"user_email": "b@x"})
+        self.assertEqual(sorted(members), ["a", "b"])
+
+        self.assertEqual(store.leave("r2", "a"), {"user_email": "a@x"})
+        self.assertIsNone(store.leave("r2", "a"))
+        self.assertEqual(store.drop_peer("a"), ["r1"])
+        self.assertEqual(list(store.members("r1")), ["b"])
+
+        self.assertTrue(store.set_relay("c", "relay-1"))
+        self.assertTrue(store.set_relay("d", "relay-1"))
+        # Routes are never re-pointed, and direct room members cannot be claimed
+        self.assertTrue(store.set_relay("c", "relay-1"))
+        self.assertFalse(store.set_relay("c", "relay-2"))
+        self.assertFalse(store.set_relay("b", "relay-2"))
+        self.assertEqual(store.relay_of("c"), "relay-1")
+        self.assertIsNone(store.relay_of("b"))
+        self.assertEqual(sorted(store.drop_relay_socket("relay-1")), ["c", "d"])
+        self.assertIsNone(store.relay_of("d"))
+
+        self.assertIsInstance(create_room_store("memory://"), MemoryRoomStore)
+        with self.assertRaises(ValueError):
+            create_room_store("mongodb://db")
+        self.assertEqual(store.heartbeat(), [])
+        print("✅ Room store verified")
+
+    def test_redis_room_store_reaps_dead_replicas(self):
+        """Test that a replica's peers leave the shared rooms once its heartbeat expires"""
+        url = os.getenv('ROOM_STORE_TEST_URL')
+        if not url:
+            self.skipTest("ROOM_STORE_TEST_URL not set (e.g. redis://localhost:6379/15)")
+        import uuid
+        service_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'meetingService'))
+        sys.path.insert(0, service_path)
+        try:
+            from meetingService.roomStore import RedisRoomStore
+            prefix = f"test-{uuid.uuid4().hex}"
+            crashed = RedisRoomStore(url, prefix=prefix, replica_ttl=3)
+            survivor = RedisRoomStore(url, prefix=prefix, replica_ttl=3)
+        finally:
+            sys.path.remove(service_path)
+
+        crashed.join("r1", "ghost", {"user_email": "g@x"})
+        self.assertTrue(crashed.set_relay("relayed", "relay-1"))
+        survivor.join("r1", "alive", {"user_email": "a@x"})
+        self.assertEqual(survivor.heartbeat(), [])
+
+        # The crashed replica stops beating; its liveness key expires
+        survivor.redis.delete(crashed._replica(crashed.replica_id))
+        self.assertEqual(survivor.heartbeat(), [("ghost", ["r1"])])
+        self.assertEqual(list(survivor.members("r1")), ["alive"])
+        self.assertIsNone(survivor.relay_of("relayed"))
+        self.assertEqual(survivor.heartbeat(), [])
+        for key in survivor.redis.scan_iter(f"{prefix}:*"):
+            survivor.redis.delete(key)
+        print("✅ Redis room store reaping verified")
+
+    def test_ice_batcher_coalesces_per_pair(self):
+        """Test that candidates are delivered in one batch per (sender, target)"""
+        from meetingService.iceBatcher import IceBatcher
+
+        delivered = []
+        tasks = []
+        batcher = IceBatcher(lambda *batch: delivered.append(batch), tasks.append, lambda seconds: None,
+                             window_seconds=0.005, max_batch=3)
+        batcher.add("a", "b", "r", ["c1"])
+        batcher.add("a", "b", "r", ["c2"])
+        batcher.add("a", "c", "r", ["c3"])
+        self.assertEqual(len(tasks), 1)
+        self.assertEqual(delivered, [])
+
+        # A full batch does not wait for the window
+        batcher.add("x", "y", "r", ["c4", "c5", "c6"])
+        self.assertEqual(delivered, [("x", "y", "r", ["c4", "c5", "c6"])])
+
+        tasks[0]()
+        self.assertIn(("a", "b", "r", ["c1", "c2"]), delivered)
+        self.assertIn(("a", "c", "r", ["c3"]), delivered)
+
+        # flush_sender delivers ahead of the window; discard_sender drops
+        batcher.add("a", "b", "r", ["c7"])
+        batcher.flush_sender("a")
+        batcher.add("d", "b", "r", ["c8"])
+        batcher.discard_sender("d")
+        self.assertEqual(delivered[-1], ("a", "b", "r", ["c7"]))
+        self.assertEqual(len(delivered), 4)
+
+        # A zero window delivers at once
+        IceBatcher(lambda *batch: delivered.append(batch), tasks.append, lambda seconds: None,
+                   window_seconds=0).add("a", "b", "r", ["c9"])
+        self.assertEqual(delivered[-1], ("a", "b", "r", ["c9"]))
+        print("✅ ICE batcher verified")
+
 
 class TestUserServiceUnit(unittest.TestCase):
     """Unit tests for User Service"""
@@ -85,6 +949,116 @@ class TestUserServiceUnit(unittest.TestCase):
         self.assertTrue(os.path.exists(user_service_path), "User service directory should exist")
         print("✅ User service structure verified")
 
+    def test_user_directory_lookups(self):
+        """Test that the user directory indexes users by email and ID"""
+        from userServices.userDirectory import UserDirectory
+
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [
+                {"id": 1, "userID": "auth0_a", "email": "Alice@Example.com"},
+                {"id": 2, "userID": "auth0_b", "email": "bob@example.com"}
+            ]
+
+        directory = UserDirectory(loader, ttl_seconds=300, miss_refresh_seconds=300)
+
+        self.assertEqual(directory.get_by_email("alice@example.com")["userID"], "auth0_a")
+        self.assertEqual(directory.get_by_id("auth0_b")["email"], "bob@example.com")
+        self.assertEqual(directory.get_by_id(2)["email"], "bob@example.com")
+        self.assertIsNone(directory.get_by_email("nobody@example.com"))
+        self.assertEqual(len(calls), 1, "Lookups should reuse a single bulk load")
+        print("✅ User directory lookups verified")
+
+    def test_user_directory_single_flight_refresh(self):
+        """Test that concurrent cold-start and miss lookups share one reload"""
+        import threading
+        import time
+        from userServices.userDirectory import UserDirectory
+
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return [{"id": 1, "userID": "auth0_a", "email": "alice@example.com"}]
+
+        directory = UserDirectory(loader, ttl_seconds=300, miss_refresh_seconds=0)
+
+        def lookup_all(email):
+            threads = [threading.Thread(target=directory.get_by_email, args=(email,)) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        lookup_all("alice@example.com")
+        self.assertEqual(len(calls), 1, "A cold start should load the table once")
+
+        time.sleep(0.01)
+        lookup_all("nobody@example.com")
+        self.assertEqual(len(calls), 2, "Concurrent misses should share one reload")
+        print("✅ User directory single-flight refresh verified")
+
+    def test_user_directory_incremental_updates(self):
+        """Test that upserts and updates are visible without a reload"""
+        from userServices.userDirectory import UserDirectory
+
+        directory = UserDirectory(lambda: [], ttl_seconds=300, miss_refresh_seconds=300)
+        directory.refresh()
+        directory.upsert({"userID": "auth0_c", "email": "carol@example.com", "password": "secret"})
+        directory.update("CAROL@example.com", {"role": "manager"})
+
+        user_data = directory.get_by_id("auth0_c")
+        self.assertEqual(user_data["role"], "manager")
+        self.assertNotIn("password", user_data)
+        print("✅ User directory incremental updates verified")
+
+    def test_user_directory_manager_index(self):
+        """Test the employee -> manager reverse index"""
+        from userServices.userDirectory import UserDirectory
+
+        directory = UserDirectory(lambda: [
+            {"userID": "m1", "email": "boss@example.com", "employeesList": ["Dev@Example.com"]},
+            {"userID": "e1", "email": "dev@example.com", "employeesList": []}
+        ], ttl_seconds=300, miss_refresh_seconds=300)
+
+        self.assertEqual(directory.get_manager_of("dev@example.com")["userID"], "m1")
+        self.assertIsNone(directory.get_manager_of("new@example.com"))
+
+        directory.update("boss@example.com", {"employeesList": ["dev@example.com", "new@example.com"]})
+        self.assertEqual(directory.get_manager_of("NEW@example.com")["userID"], "m1")
+
+        directory.update("boss@example.com", {"employeesList": []})
+        self.assertIsNone(directory.get_manager_of("dev@example.com"))
+
+        # An employee listed by two managers keeps the other one when the first drops them
+        directory.upsert({"userID": "m2", "email": "lead@example.com", "employeesList": ["new@example.com"]})
+        directory.upsert({"userID": "m3", "email": "head@example.com", "employeesList": ["new@example.com"]})
+        directory.update("head@example.com", {"employeesList": []})
+        self.assertEqual(directory.get_manager_of("new@example.com")["userID"], "m2")
+        directory.remove("lead@example.com")
+        self.assertIsNone(directory.get_manager_of("new@example.com"))
+        print("✅ User directory manager index verified")
+
+    def test_user_directory_bulk_resolution(self):
+        """Test resolving a whole team with a single bulk load"""
+        from userServices.userDirectory import UserDirectory
+
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [{"userID": f"u{i}", "email": f"user{i}@example.com"} for i in range(30)]
+
+        directory = UserDirectory(loader, ttl_seconds=300, miss_refresh_seconds=300)
+        team = directory.get_many_by_email(["USER3@example.com", "ghost@example.com", "user7@example.com"])
+
+        self.assertEqual([u["userID"] for u in team], ["u3", "u7"])
+        self.assertEqual(len(calls), 1)
+        print("✅ User directory bulk resolution verified")
+
 
 if __name__ == '__main__':
     print("🧪 Running Unit Tests for Server Components")
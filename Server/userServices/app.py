@@ -6,6 +6,7 @@ import os
 import json
 from flask_jwt_extended import jwt_required
 import requests
+import httpClient
 from userHelper import userHelper
 from modeles.role import ROLE
 
@@ -69,7 +70,7 @@ def register_user():
         
         # Save user to Saving Server
         try:
-            response = requests.post(
+            response = httpClient.post(
                 f"{SAVING_server}/users/",
                 json=user_data,
                 headers=HEADERS,
@@ -78,6 +79,8 @@ def register_user():
             
             if response.status_code not in [200, 201]:
                 return jsonify({"error": "Failed to save user to database", "details": response.text}), 500
+
+            userHelper.DIRECTORY.upsert(user_data)
                 
         except requests.exceptions.RequestException as e:
             return jsonify({"error": f"Database communication error: {str(e)}"}), 503
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class UserDirectory:
+    """
+    In-process index of the Saving Server user table.
+
+    Users are loaded in bulk (one GET /users/) and indexed by lowercase email
+    and by userID / server id, so single lookups are dictionary hits instead of
+    a full-table download. A reverse employee -> manager index is kept next to
+    them so team lookups are one dictionary hit. Records written by this
+    service are upserted incrementally; a full reload only happens when the
+    data is older than the TTL, or on a miss once the miss-refresh interval
+    has elapsed (to pick up users created by other replicas).
+    """
+
+    def __init__(self, loader: Callable[[], Optional[List[Dict[str, Any]]]],
+                 ttl_seconds: float = None, miss_refresh_seconds: float = None):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('USER_DIRECTORY_TTL', 300))
+        self.miss_refresh_seconds = miss_refresh_seconds if miss_refresh_seconds is not None else float(os.getenv('USER_DIRECTORY_MISS_REFRESH', 5))
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._by_email: Dict[str, Dict[str, Any]] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._manager_of: Dict[str, str] = {}  # lowercase employee email -> lowercase manager email
+        self._loaded_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None  # end of the last reload attempt
+        self._refresh_ok = False
+
+    # ---------- bulk / incremental population ----------
+
+    def load(self, users: List[Dict[str, Any]]) -> None:
+        """Replace the whole index with a freshly fetched user list"""
+        by_email = {}
+        by_id = {}
+        manager_of = {}
+        for user_data in users:
+            email = (user_data.get("email") or "").lower()
+            if email:
+                by_email[email] = user_data
+                for employee in UserDirectory._team_keys(user_data):
+                    # Keep the first manager in table order, like the old linear scan
+                    manager_of.setdefault(employee, email)
+            for key in UserDirectory._id_keys(user_data):
+                by_id[key] = user_data
+
+        with self._lock:
+            self._by_email = by_email
+            self._by_id = by_id
+            self._manager_of = manager_of
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, requested_at: float = None) -> bool:
+        """
+        Reload every user from the Saving Server. Returns False if the fetch failed.
+
+        Single-flight: callers that queued up behind a reload finishing after
+        requested_at (time.monotonic() when they decided to reload, default now)
+        share its result instead of downloading the table again.
+        """
+        if requested_at is None:
+            requested_at = time.monotonic()
+        with self._refresh_lock:
+            if self._refreshed_at is not None and self._refreshed_at >= requested_at:
+                return self._refresh_ok
+            users = self._loader()
+            self._refresh_ok = users is not None
+            if self._refresh_ok:
+                self.load(users)
+                logger.info(f"✅ User directory loaded: {len(users)} users")
+            self._refreshed_at = time.monotonic()
+            return self._refresh_ok
+
+    def upsert(self, user_data: Dict[str, Any]) -> None:
+        """Insert or replace a single user record"""
+        email = (user_data.get("email") or "").lower()
+        if not email:
+            return
+        user_data = {k: v for k, v in user_data.items() if k != "password"}
+
+        with self._lock:
+            previous = self._by_email.get(email)
+            if previous is not None:
+                self._unindex(email, previous)
+            self._by_email[email] = user_data
+            for key in UserDirectory._id_keys(user_data):
+                self._by_id[key] = user_data
+            for employee in UserDirectory._team_keys(user_data):
+                self._manager_of[employee] = email
+
+    def update(self, email: str, fields: Dict[str, Any]) -> None:
+        """Merge updated fields into a known user record (no-op for unknown users)"""
+        with self._lock:
+            current = self._by_email.get((email or "").lower())
+            if current is None:
+                return
+            merged = dict(current)
+            merged.update(fields)
+            self.upsert(merged)
+
+    def remove(self, email: str) -> None:
+        with self._lock:
+            email = (email or "").lower()
+            user_data = self._by_email.pop(email, None)
+            if user_data is not None:
+                self._unindex(email, user_data)
+
+    def _unindex(self, email: str, user_data: Dict[str, Any]) -> None:
+        """Drop the ID and team entries that belong to a record (caller holds the lock)"""
+        for key in UserDirectory._id_keys(user_data):
+            self._by_id.pop(key, None)
+        for employee in UserDirectory._team_keys(user_data):
+            if self._manager_of.get(employee) != email:
+                continue
+            # Another manager may list the employee too: fall back to the first one
+            other = next((manager for manager, record in self._by_email.items()
+                          if manager != email and employee in UserDirectory._team_keys(record)), None)
+            if other:
+                self._manager_of[employee] = other
+            else:
+                del self._manager_of[employee]
+
+    # ---------- lookups ----------
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return self._lookup("_by_email", (email or "").lower())
+
+    def get_by_id(self, user_id) -> Optional[Dict[str, Any]]:
+        return self._lookup("_by_id", str(user_id))
+
+    def get_many_by_email(self, emails: List[str]) -> List[Dict[str, Any]]:
+        """
+        Resolve a batch of emails in one index pass (at most one reload for misses).
+        Unknown emails are skipped; the input order is kept.
+        """
+        keys = [(email or "").lower() for email in emails]
+        requested_at = time.monotonic()
+        self._ensure_fresh()
+        if any(key and key not in self._by_email for key in keys) and self._miss_refresh_allowed():
+            self.refresh(requested_at)
+        by_email = self._by_email
+        return [by_email[key] for key in keys if key in by_email]
+
+    def get_manager_of(self, employee_email: str) -> Optional[Dict[str, Any]]:
+        """Return the record of the manager whose employeesList contains this email"""
+        key = (employee_email or "").lower()
+        if not key:
+            return None
+        self._ensure_fresh()
+        with self._lock:
+            manager_email = self._manager_of.get(key)
+            return self._by_email.get(manager_email) if manager_email else None
+
+    def all_users(self) -> List[Dict[str, Any]]:
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._by_email.values())
+
+    def _lookup(self, index_name: str, key: str) -> Optional[Dict[str, Any]]:
+        if not key:
+            return None
+        requested_at = time.monotonic()
+        self._ensure_fresh()
+        user_data = getattr(self, index_name).get(key)
+        if user_data is None and self._miss_refresh_allowed() and self.refresh(requested_at):
+            # load() swaps the index dicts, so read the attribute again
+            user_data = getattr(self, index_name).get(key)
+        return user_data
+
+    def _ensure_fresh(self) -> None:
+        now = time.monotonic()
+        loaded_at = self._loaded_at
+        if loaded_at is None or now - loaded_at > self.ttl_seconds:
+            self.refresh(now)
+
+    def _miss_refresh_allowed(self) -> bool:
+        # _ensure_fresh() already retried a failed initial load
+        loaded_at = self._loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at > self.miss_refresh_seconds
+
+    @staticmethod
+    def _team_keys(user_data: Dict[str, Any]) -> List[str]:
+        return [e.lower() for e in (user_data.get("employeesList") or []) if e]
+
+    @staticmethod
+    def _id_keys(user_data: Dict[str, Any]) -> List[str]:
+        keys = []
+        if user_data.get("userID"):
+            keys.append(str(user_data["userID"]))
+        if user_data.get("id") is not None:
+            keys.append(str(user_data["id"]))
+        return keys
@@ -2,16 +2,18 @@ import secrets
 import string
 from flask import jsonify
 import requests
+import httpClient
 import logging
 import os
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 
 # Import models
 from modeles.user import User
 from modeles.role import ROLE
 from modeles.department import Department
+from userDirectory import UserDirectory
 
 load_dotenv()
 
@@ -21,6 +23,9 @@ logger = logging.getLogger(__name__)
 class userHelper:
     SAVING_SERVER_URL = os.getenv('SAVING_server')
     HEADERS = {"X-Internal-Key": "nexus-internal-secret-key-123"}
+
+    # Email / userID indexed view of the Saving Server user table
+    DIRECTORY = UserDirectory(loader=lambda: userHelper._fetch_all_users_from_SavingServer())
     
     @staticmethod
     def getUserByEmail(email: str) -> Optional[User]:
@@ -39,36 +44,23 @@ class userHelper:
     @staticmethod
     def get_user_by_email_from_SavingServer(email: str) -> Optional[User]:
         """
-        Retrieve user from Saving Server by email
+        Retrieve user from the user directory by email (case-insensitive)
         Returns User object or None if not found
         """
-        try:
-            # Get all users from Saving Server
-            
-            response = requests.get(
-                f"{userHelper.SAVING_SERVER_URL}/users/",
-                headers=userHelper.HEADERS,
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to get users from Saving Server: {response.status_code}")
-                return None
-            
-            data = response.json()
-            users = data.get("data", [])
-            
-            # Find user by email
-            for user_data in users:
-                if user_data.get("email", "").lower() == email.lower():
-                    return userHelper._convert_server_user_to_internal(user_data)
-            
+        user_data = userHelper.DIRECTORY.get_by_email(email)
+        if user_data is None:
             logger.info(f"User not found in Saving Server: {email}")
             return None
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Network error getting user from Saving Server: {e}")
-            return None
+        return userHelper._convert_server_user_to_internal(user_data)
+    
+    @staticmethod
+    def get_users_by_emails(emails: List[str]) -> List[User]:
+        """
+        Resolve several users at once from the user directory
+        Returns the User objects found, in the order of the given emails
+        """
+        return [userHelper._convert_server_user_to_internal(user_data)
+                for user_data in userHelper.DIRECTORY.get_many_by_email(emails)]
     
     @staticmethod
     def _convert_role_from_server(server_role: str) -> ROLE:
@@ -113,7 +105,8 @@ class userHelper:
         user.Department = userHelper._convert_department_from_server(user_data.get("department"))
         
         # Set employees list (if manager)
-        user.EmployeesList = user_data.get("employeesList", [])
+        # Copy so callers can't mutate the directory's record in place
+        user.EmployeesList = list(user_data.get("employeesList") or [])
         
         return user
     
@@ -159,7 +152,7 @@ class userHelper:
             }
             
             # Send request to Saving Server
-            response = requests.post(
+            response = httpClient.post(
                 f"{userHelper.SAVING_SERVER_URL}/invites/",
                 json=payload,
                 headers=userHelper.HEADERS,
@@ -194,7 +187,7 @@ class userHelper:
             }
             
             # Send request to Saving Server
-            response = requests.post(
+            response = httpClient.post(
                 f"{userHelper.SAVING_SERVER_URL}/manager_codes/becameManagerCode",
                 json=payload,
                 headers=userHelper.HEADERS,
@@ -253,6 +246,7 @@ class userHelper:
             # Convert to proper database format
             user_data = userHelper._convert_user_to_database_format(employee)
             
+            # update_user writes through to DIRECTORY, which re-indexes the team
             userHelper.update_user(employee.getEmail(), user_data)
             return "done"
         else :
@@ -263,7 +257,7 @@ class userHelper:
     @staticmethod
     def update_user(user_id, user_data):
         try:
-            response = requests.put(
+            response = httpClient.put(
                 f"{userHelper.SAVING_SERVER_URL}/users/{user_id}",
                 json=user_data,
                 headers=userHelper.HEADERS,
@@ -271,6 +265,7 @@ class userHelper:
             )
             
             if response.status_code in [200, 204]:
+                userHelper.DIRECTORY.update(user_id, user_data)
                 return True
             return False
                 
@@ -280,7 +275,7 @@ class userHelper:
     @staticmethod
     def verify_became_manager_code(code):
         try:
-            response = requests.get(
+            response = httpClient.get(
                 f"{userHelper.SAVING_SERVER_URL}/manager_codes/becameManagerCode/{code}",
                 headers=userHelper.HEADERS,
                 timeout=10
@@ -303,7 +298,7 @@ class userHelper:
         """
         try:
             # First, get the invite code details from Saving Server
-            response = requests.get(
+            response = httpClient.get(
                 f"{userHelper.SAVING_SERVER_URL}/invites/{code}",
                 headers=userHelper.HEADERS,
                 timeout=10
@@ -353,34 +348,14 @@ class userHelper:
     @staticmethod
     def get_user_by_id_from_SavingServer(user_id: str) -> Optional[User]:
         """
-        Retrieve user from Saving Server by user ID
+        Retrieve user from the user directory by userID (or Saving Server id)
         Returns User object or None if not found
         """
-        try:
-            response = requests.get(
-                f"{userHelper.SAVING_SERVER_URL}/users/",
-                headers=userHelper.HEADERS,
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to get users from Saving Server: {response.status_code}")
-                return None
-            
-            data = response.json()
-            users = data.get("data", [])
-            
-            # Find user by userID
-            for user_data in users:
-                if user_data.get("userID") == user_id or str(user_data.get("id")) == str(user_id):
-                    return userHelper._convert_server_user_to_internal(user_data)
-            
+        user_data = userHelper.DIRECTORY.get_by_id(user_id)
+        if user_data is None:
             logger.info(f"User not found in Saving Server with ID: {user_id}")
             return None
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Network error getting user from Saving Server: {e}")
-            return None
+        return userHelper._convert_server_user_to_internal(user_data)
 
     @staticmethod
     def add_employee_to_manager(manager_email: str, employee_email: str) -> bool:
@@ -411,7 +386,7 @@ class userHelper:
                 "employeesList": current_employees
             }
             
-            response = requests.put(
+            response = httpClient.put(
                 f"{userHelper.SAVING_SERVER_URL}/users/{manager_email}",
                 json=update_data,
                 headers=userHelper.HEADERS,
@@ -419,6 +394,7 @@ class userHelper:
             )
             
             if response.status_code in [200, 204]:
+                userHelper.DIRECTORY.update(manager_email, update_data)
                 logger.info(f"✅ Added {employee_email} to {manager_email}'s employees list")
                 return True
             else:
@@ -435,7 +411,7 @@ class userHelper:
         Mark an invite code as used by incrementing its used_count.
         """
         try:
-            response = requests.put(
+            response = httpClient.put(
                 f"{userHelper.SAVING_SERVER_URL}/invites/{code}/use",
                 json={"used_by_email": used_by_email},
                 headers=userHelper.HEADERS,
@@ -459,8 +435,18 @@ class userHelper:
         Retrieve all users from Saving Server
         Returns list of user data dictionaries
         """
+        users = userHelper._fetch_all_users_from_SavingServer()
+        return users if users is not None else []
+
+    @staticmethod
+    def _fetch_all_users_from_SavingServer() -> Optional[list]:
+        """
+        Bulk loader for the user directory.
+        Returns None (instead of an empty list) when the fetch fails,
+        so the directory keeps its last good snapshot.
+        """
         try:
-            response = requests.get(
+            response = httpClient.get(
                 f"{userHelper.SAVING_SERVER_URL}/users/",
                 headers=userHelper.HEADERS,
                 timeout=10
@@ -468,14 +454,14 @@ class userHelper:
             
             if response.status_code != 200:
                 logger.error(f"❌ Failed to get users from Saving Server: {response.status_code}")
-                return []
+                return None
             
             data = response.json()
             return data.get("data", [])
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Network error getting users from Saving Server: {e}")
-            return []
+            return None
 
     @staticmethod
     def find_manager_for_employee(employee_email: str) -> Optional[Dict[str, Any]]:
@@ -484,16 +470,10 @@ class userHelper:
         Returns manager data dict or None if not found.
         """
         try:
-            all_users = userHelper.get_all_users_from_SavingServer()
-            
-            for user_data in all_users:
-                # Check if this user is a manager and has employees
-                employees_list = user_data.get("employeesList", [])
-                if employees_list and employee_email.lower() in [e.lower() for e in employees_list]:
-                    return user_data
-            
-            logger.info(f"No manager found for employee: {employee_email}")
-            return None
+            manager_data = userHelper.DIRECTORY.get_manager_of(employee_email)
+            if manager_data is None:
+                logger.info(f"No manager found for employee: {employee_email}")
+            return manager_data
             
         except Exception as e:
             logger.error(f"❌ Error finding manager for employee: {e}")
@@ -562,20 +542,18 @@ class userHelper:
             # Include full details or just emails
             if include_details:
                 teammates_details = []
-                for teammate_email in teammates_emails:
-                    teammate = userHelper.get_user_by_email_from_SavingServer(teammate_email)
-                    if teammate:
-                        teammates_details.append({
-                            "id": teammate.ID,
-                            "email": teammate.Email,
-                            "first_name": teammate.FirstName,
-                            "last_name": teammate.LastName,
-                            "role": teammate.Role.value if hasattr(teammate.Role, 'value') else teammate.Role,
-                            "department": teammate.Department.value if teammate.Department and hasattr(teammate.Department, 'value') else teammate.Department,
-                            "address": teammate.Address,
-                            "date_of_birth": teammate.DateOfBirth,
-                            "employeesList": teammate.EmployeesList
-                        })
+                for teammate in userHelper.get_users_by_emails(teammates_emails):
+                    teammates_details.append({
+                        "id": teammate.ID,
+                        "email": teammate.Email,
+                        "first_name": teammate.FirstName,
+                        "last_name": teammate.LastName,
+                        "role": teammate.Role.value if hasattr(teammate.Role, 'value') else teammate.Role,
+                        "department": teammate.Department.value if teammate.Department and hasattr(teammate.Department, 'value') else teammate.Department,
+                        "address": teammate.Address,
+                        "date_of_birth": teammate.DateOfBirth,
+                        "employeesList": teammate.EmployeesList
+                    })
                 result["teammates"] = teammates_details
             else:
                 result["teammates"] = teammates_emails
@@ -642,18 +620,16 @@ class userHelper:
             
             # Get full details for all teammates
             teammates_details = []
-            for teammate_email in teammates_emails:
-                teammate = userHelper.get_user_by_email_from_SavingServer(teammate_email)
-                if teammate:
-                    teammates_details.append({
-                        "id": teammate.ID,
-                        "email": teammate.Email,
-                        "userID": teammate.ID,
-                        "first_name": teammate.FirstName,
-                        "last_name": teammate.LastName,
-                        "role": teammate.Role.value if hasattr(teammate.Role, 'value') else teammate.Role,
-                        "department": teammate.Department.value if teammate.Department and hasattr(teammate.Department, 'value') else teammate.Department
-                    })
+            for teammate in userHelper.get_users_by_emails(teammates_emails):
+                teammates_details.append({
+                    "id": teammate.ID,
+                    "email": teammate.Email,
+                    "userID": teammate.ID,
+                    "first_name": teammate.FirstName,
+                    "last_name": teammate.LastName,
+                    "role": teammate.Role.value if hasattr(teammate.Role, 'value') else teammate.Role,
+                    "department": teammate.Department.value if teammate.Department and hasattr(teammate.Department, 'value') else teammate.Department
+                })
             
             # Build response
             result = {